@@ -1844,6 +1844,41 @@ JSON format: { "follow_ups": ["Question 1?", "Question 2?", "Question 3?"] }
 {{MESSAGES:END:6}}
 </chat_history>"""
 
+DEFAULT_BACKGROUND_TASKS_GENERATION_PROMPT_TEMPLATE = """### Task:
+Analyze the chat history and complete every task listed below in a single response.
+### Tasks:
+{{TASKS}}
+### Guidelines:
+- Use the chat's primary language; default to English if multilingual.
+- Prioritize accuracy over excessive creativity; keep it clear and simple.
+- Your entire response must consist solely of one raw JSON object containing every requested key, without any markdown code fences or other encapsulating text.
+### Output:
+JSON format: {{OUTPUT}}
+### Chat History:
+<chat_history>
+{{MESSAGES:END:6}}
+</chat_history>"""
+
+DEFAULT_BACKGROUND_TASKS_GENERATION_INSTRUCTIONS = {
+    "title": (
+        "- title: a concise, 3-5 word title with an emoji summarizing the chat "
+        "history, without quotation marks or special formatting.",
+        '"title": "your concise title here"',
+    ),
+    "tags": (
+        "- tags: 1-3 broad tags categorizing the main themes of the chat history "
+        "(e.g. Science, Technology, Business, Health), along with 1-3 more specific "
+        'subtopic tags. If the chat is too short or too diverse, use only ["General"].',
+        '"tags": ["tag1", "tag2", "tag3"]',
+    ),
+    "follow_ups": (
+        "- follow_ups: 3-5 concise follow-up questions the user might naturally ask "
+        "next, written from the user's point of view and directly related to the "
+        "discussed topic(s).",
+        '"follow_ups": ["Question 1?", "Question 2?", "Question 3?"]',
+    ),
+}
+
 ENABLE_FOLLOW_UP_GENERATION = PersistentConfig(
     "ENABLE_FOLLOW_UP_GENERATION",
     "task.follow_up.enable",
@@ -361,6 +361,12 @@ ENABLE_REALTIME_CHAT_SAVE = (
 
 ENABLE_QUERIES_CACHE = os.environ.get("ENABLE_QUERIES_CACHE", "False").lower() == "true"
 
+# Generate title, tags and follow-ups with a single task model call when the
+# default prompt templates are in use
+ENABLE_BACKGROUND_TASKS_BATCHING = (
+    os.environ.get("ENABLE_BACKGROUND_TASKS_BATCHING", "True").lower() == "true"
+)
+
 RAG_SYSTEM_CONTEXT = os.environ.get("RAG_SYSTEM_CONTEXT", "False").lower() == "true"
 
 ####################################
@@ -657,6 +663,102 @@ else:
         CHAT_RESPONSE_MAX_TOOL_CALL_RETRIES = 30
 
 
+CHAT_RESPONSE_TOOL_CALL_CONCURRENCY = os.environ.get(
+    "CHAT_RESPONSE_TOOL_CALL_CONCURRENCY", "8"
+)
+
+try:
+    CHAT_RESPONSE_TOOL_CALL_CONCURRENCY = max(
+        1, int(CHAT_RESPONSE_TOOL_CALL_CONCURRENCY)
+    )
+except Exception:
+    CHAT_RESPONSE_TOOL_CALL_CONCURRENCY = 8
+
+
+CHAT_RESPONSE_TOOL_CALL_TIMEOUT = os.environ.get("CHAT_RESPONSE_TOOL_CALL_TIMEOUT", "")
+
+if CHAT_RESPONSE_TOOL_CALL_TIMEOUT == "":
+    CHAT_RESPONSE_TOOL_CALL_TIMEOUT = None
+else:
+    try:
+        CHAT_RESPONSE_TOOL_CALL_TIMEOUT = float(CHAT_RESPONSE_TOOL_CALL_TIMEOUT)
+    except Exception:
+        CHAT_RESPONSE_TOOL_CALL_TIMEOUT = None
+
+
+MCP_CLIENT_POOL_IDLE_TIMEOUT = os.environ.get("MCP_CLIENT_POOL_IDLE_TIMEOUT", "300")
+
+try:
+    MCP_CLIENT_POOL_IDLE_TIMEOUT = float(MCP_CLIENT_POOL_IDLE_TIMEOUT)
+except Exception:
+    MCP_CLIENT_POOL_IDLE_TIMEOUT = 300
+
+
+MCP_CLIENT_POOL_HEALTH_CHECK_INTERVAL = os.environ.get(
+    "MCP_CLIENT_POOL_HEALTH_CHECK_INTERVAL", "30"
+)
+
+try:
+    MCP_CLIENT_POOL_HEALTH_CHECK_INTERVAL = float(MCP_CLIENT_POOL_HEALTH_CHECK_INTERVAL)
+except Exception:
+    MCP_CLIENT_POOL_HEALTH_CHECK_INTERVAL = 30
+
+
+CODE_INTERPRETER_JUPYTER_KERNEL_IDLE_TIMEOUT = os.environ.get(
+    "CODE_INTERPRETER_JUPYTER_KERNEL_IDLE_TIMEOUT", "600"
+)
+
+try:
+    CODE_INTERPRETER_JUPYTER_KERNEL_IDLE_TIMEOUT = float(
+        CODE_INTERPRETER_JUPYTER_KERNEL_IDLE_TIMEOUT
+    )
+except Exception:
+    CODE_INTERPRETER_JUPYTER_KERNEL_IDLE_TIMEOUT = 600
+
+# Kernels kept per user across chats, 0 starts a new kernel for every execution
+CODE_INTERPRETER_JUPYTER_MAX_KERNELS_PER_USER = os.environ.get(
+    "CODE_INTERPRETER_JUPYTER_MAX_KERNELS_PER_USER", "3"
+)
+
+try:
+    CODE_INTERPRETER_JUPYTER_MAX_KERNELS_PER_USER = int(
+        CODE_INTERPRETER_JUPYTER_MAX_KERNELS_PER_USER
+    )
+except Exception:
+    CODE_INTERPRETER_JUPYTER_MAX_KERNELS_PER_USER = 3
+
+CODE_INTERPRETER_JUPYTER_WARM_KERNELS = os.environ.get(
+    "CODE_INTERPRETER_JUPYTER_WARM_KERNELS", "1"
+)
+
+try:
+    CODE_INTERPRETER_JUPYTER_WARM_KERNELS = int(CODE_INTERPRETER_JUPYTER_WARM_KERNELS)
+except Exception:
+    CODE_INTERPRETER_JUPYTER_WARM_KERNELS = 1
+
+
+# "thread" runs synchronous function and tool handlers in a dedicated thread
+# pool so they can't block the event loop, "inline" runs them on the loop
+PLUGIN_EXECUTION_MODE = os.environ.get("PLUGIN_EXECUTION_MODE", "thread").lower()
+
+PLUGIN_EXECUTION_THREADS = os.environ.get("PLUGIN_EXECUTION_THREADS", "")
+
+try:
+    PLUGIN_EXECUTION_THREADS = int(PLUGIN_EXECUTION_THREADS)
+except Exception:
+    PLUGIN_EXECUTION_THREADS = None
+
+PLUGIN_EXECUTION_TIMEOUT = os.environ.get("PLUGIN_EXECUTION_TIMEOUT", "")
+
+if PLUGIN_EXECUTION_TIMEOUT == "":
+    PLUGIN_EXECUTION_TIMEOUT = None
+else:
+    try:
+        PLUGIN_EXECUTION_TIMEOUT = float(PLUGIN_EXECUTION_TIMEOUT)
+    except Exception:
+        PLUGIN_EXECUTION_TIMEOUT = None
+
+
 CHAT_STREAM_RESPONSE_CHUNK_MAX_BUFFER_SIZE = os.environ.get(
     "CHAT_STREAM_RESPONSE_CHUNK_MAX_BUFFER_SIZE", ""
 )
@@ -672,6 +774,70 @@ else:
         CHAT_STREAM_RESPONSE_CHUNK_MAX_BUFFER_SIZE = None
 
 
+CHAT_COMPLETION_MAX_CONCURRENCY_PER_MODEL = os.environ.get(
+    "CHAT_COMPLETION_MAX_CONCURRENCY_PER_MODEL", ""
+)
+
+if CHAT_COMPLETION_MAX_CONCURRENCY_PER_MODEL == "":
+    CHAT_COMPLETION_MAX_CONCURRENCY_PER_MODEL = None
+else:
+    try:
+        CHAT_COMPLETION_MAX_CONCURRENCY_PER_MODEL = int(
+            CHAT_COMPLETION_MAX_CONCURRENCY_PER_MODEL
+        )
+    except Exception:
+        CHAT_COMPLETION_MAX_CONCURRENCY_PER_MODEL = None
+
+
+CHAT_COMPLETION_MAX_CONCURRENCY_PER_USER = os.environ.get(
+    "CHAT_COMPLETION_MAX_CONCURRENCY_PER_USER", ""
+)
+
+if CHAT_COMPLETION_MAX_CONCURRENCY_PER_USER == "":
+    CHAT_COMPLETION_MAX_CONCURRENCY_PER_USER = None
+else:
+    try:
+        CHAT_COMPLETION_MAX_CONCURRENCY_PER_USER = int(
+            CHAT_COMPLETION_MAX_CONCURRENCY_PER_USER
+        )
+    except Exception:
+        CHAT_COMPLETION_MAX_CONCURRENCY_PER_USER = None
+
+
+CHAT_COMPLETION_QUEUE_TIMEOUT = os.environ.get("CHAT_COMPLETION_QUEUE_TIMEOUT", "30")
+
+try:
+    CHAT_COMPLETION_QUEUE_TIMEOUT = float(CHAT_COMPLETION_QUEUE_TIMEOUT)
+except Exception:
+    CHAT_COMPLETION_QUEUE_TIMEOUT = 30.0
+
+
+# Seconds between recounts of the channel member unread counters, 0 disables
+CHANNEL_UNREAD_COUNT_RECONCILE_INTERVAL = os.environ.get(
+    "CHANNEL_UNREAD_COUNT_RECONCILE_INTERVAL", "3600"
+)
+
+try:
+    CHANNEL_UNREAD_COUNT_RECONCILE_INTERVAL = int(
+        CHANNEL_UNREAD_COUNT_RECONCILE_INTERVAL
+    )
+except ValueError:
+    CHANNEL_UNREAD_COUNT_RECONCILE_INTERVAL = 3600
+
+# Seconds between recounts covering every channel, not only the ones with new
+# messages, to repair drift in quiet channels
+CHANNEL_UNREAD_COUNT_FULL_RECONCILE_INTERVAL = os.environ.get(
+    "CHANNEL_UNREAD_COUNT_FULL_RECONCILE_INTERVAL", "86400"
+)
+
+try:
+    CHANNEL_UNREAD_COUNT_FULL_RECONCILE_INTERVAL = int(
+        CHANNEL_UNREAD_COUNT_FULL_RECONCILE_INTERVAL
+    )
+except ValueError:
+    CHANNEL_UNREAD_COUNT_FULL_RECONCILE_INTERVAL = 86400
+
+
 ####################################
 # WEBSOCKET SUPPORT
 ####################################
@@ -733,6 +899,24 @@ try:
 except ValueError:
     WEBSOCKET_SERVER_PING_INTERVAL = 25
 
+WEBSOCKET_SESSION_POOL_TTL = os.environ.get("WEBSOCKET_SESSION_POOL_TTL", "120")
+try:
+    WEBSOCKET_SESSION_POOL_TTL = int(WEBSOCKET_SESSION_POOL_TTL)
+except ValueError:
+    WEBSOCKET_SESSION_POOL_TTL = 120
+
+YDOC_COMPACTION_MAX_UPDATES = os.environ.get("YDOC_COMPACTION_MAX_UPDATES", "500")
+try:
+    YDOC_COMPACTION_MAX_UPDATES = int(YDOC_COMPACTION_MAX_UPDATES)
+except ValueError:
+    YDOC_COMPACTION_MAX_UPDATES = 500
+
+YDOC_COMPACTION_MAX_BYTES = os.environ.get("YDOC_COMPACTION_MAX_BYTES", "1048576")
+try:
+    YDOC_COMPACTION_MAX_BYTES = int(YDOC_COMPACTION_MAX_BYTES)
+except ValueError:
+    YDOC_COMPACTION_MAX_BYTES = 1048576
+
 
 REQUESTS_VERIFY = os.environ.get("REQUESTS_VERIFY", "True").lower() == "true"
 
@@ -747,6 +931,50 @@ else:
         AIOHTTP_CLIENT_TIMEOUT = 300
 
 
+# Background webhook notification delivery
+WEBHOOK_DISPATCH_CONCURRENCY = os.environ.get("WEBHOOK_DISPATCH_CONCURRENCY", "10")
+
+try:
+    WEBHOOK_DISPATCH_CONCURRENCY = int(WEBHOOK_DISPATCH_CONCURRENCY)
+except ValueError:
+    WEBHOOK_DISPATCH_CONCURRENCY = 10
+
+# Requests per second per destination host, 0 disables the limit
+WEBHOOK_DISPATCH_RATE_LIMIT_PER_HOST = os.environ.get(
+    "WEBHOOK_DISPATCH_RATE_LIMIT_PER_HOST", "10"
+)
+
+try:
+    WEBHOOK_DISPATCH_RATE_LIMIT_PER_HOST = float(WEBHOOK_DISPATCH_RATE_LIMIT_PER_HOST)
+except ValueError:
+    WEBHOOK_DISPATCH_RATE_LIMIT_PER_HOST = 10.0
+
+WEBHOOK_DISPATCH_MAX_RETRIES = os.environ.get("WEBHOOK_DISPATCH_MAX_RETRIES", "3")
+
+try:
+    WEBHOOK_DISPATCH_MAX_RETRIES = int(WEBHOOK_DISPATCH_MAX_RETRIES)
+except ValueError:
+    WEBHOOK_DISPATCH_MAX_RETRIES = 3
+
+# Deliveries waiting for a worker, further ones are dropped
+WEBHOOK_DISPATCH_QUEUE_SIZE = os.environ.get("WEBHOOK_DISPATCH_QUEUE_SIZE", "10000")
+
+try:
+    WEBHOOK_DISPATCH_QUEUE_SIZE = int(WEBHOOK_DISPATCH_QUEUE_SIZE)
+except ValueError:
+    WEBHOOK_DISPATCH_QUEUE_SIZE = 10000
+
+# Seconds to wait for queued deliveries on shutdown before dropping them
+WEBHOOK_DISPATCH_SHUTDOWN_TIMEOUT = os.environ.get(
+    "WEBHOOK_DISPATCH_SHUTDOWN_TIMEOUT", "10"
+)
+
+try:
+    WEBHOOK_DISPATCH_SHUTDOWN_TIMEOUT = float(WEBHOOK_DISPATCH_SHUTDOWN_TIMEOUT)
+except ValueError:
+    WEBHOOK_DISPATCH_SHUTDOWN_TIMEOUT = 10.0
+
+
 AIOHTTP_CLIENT_SESSION_SSL = (
     os.environ.get("AIOHTTP_CLIENT_SESSION_SSL", "True").lower() == "true"
 )
@@ -31,6 +31,7 @@ from open_webui.models.functions import Functions
 from open_webui.models.models import Models
 
 from open_webui.utils.plugin import (
+    call_plugin_function,
     load_function_module_by_id,
     get_function_module_from_cache,
 )
@@ -159,10 +160,9 @@ async def generate_function_chat_completion(
     request, form_data, user, models: dict = {}
 ):
     async def execute_pipe(pipe, params):
-        if inspect.iscoroutinefunction(pipe):
-            return await pipe(**params)
-        else:
-            return pipe(**params)
+        return await call_plugin_function(
+            "function", get_pipe_id(form_data), pipe, **params
+        )
 
     async def get_message_content(res: str | Generator | AsyncGenerator) -> str:
         if isinstance(res, str):
@@ -64,6 +64,7 @@ from open_webui.socket.main import (
     MODELS,
     app as socket_app,
     periodic_usage_pool_cleanup,
+    periodic_session_pool_refresh,
     get_event_emitter,
     get_models_in_use,
 )
@@ -451,6 +452,16 @@ from open_webui.config import (
 )
 from open_webui.env import (
     ENABLE_CUSTOM_MODEL_FALLBACK,
+    CHAT_COMPLETION_MAX_CONCURRENCY_PER_MODEL,
+    CHAT_COMPLETION_MAX_CONCURRENCY_PER_USER,
+    CHAT_COMPLETION_QUEUE_TIMEOUT,
+    CHANNEL_UNREAD_COUNT_RECONCILE_INTERVAL,
+    CHANNEL_UNREAD_COUNT_FULL_RECONCILE_INTERVAL,
+    MCP_CLIENT_POOL_IDLE_TIMEOUT,
+    MCP_CLIENT_POOL_HEALTH_CHECK_INTERVAL,
+    CODE_INTERPRETER_JUPYTER_KERNEL_IDLE_TIMEOUT,
+    CODE_INTERPRETER_JUPYTER_MAX_KERNELS_PER_USER,
+    CODE_INTERPRETER_JUPYTER_WARM_KERNELS,
     LICENSE_KEY,
     AUDIT_EXCLUDED_PATHS,
     AUDIT_LOG_LEVEL,
@@ -507,6 +518,17 @@ from open_webui.utils.chat import (
     chat_action as chat_action_handler,
 )
 from open_webui.utils.embeddings import generate_embeddings
+from open_webui.utils.channels import periodic_unread_count_reconciliation
+from open_webui.utils.webhook import WEBHOOK_DISPATCHER
+from open_webui.utils.mcp.pool import MCPClientPool
+from open_webui.utils.code_interpreter import JupyterKernelPool
+from open_webui.utils.tools import TOOL_SERVER_REGISTRY
+from open_webui.utils.admission import (
+    AdmissionController,
+    AdmissionTimeoutError,
+    get_request_priority,
+    release_on_close,
+)
 from open_webui.utils.middleware import process_chat_payload, process_chat_response
 from open_webui.utils.access_control import has_access
 
@@ -518,7 +540,10 @@ from open_webui.utils.auth import (
     get_verified_user,
     create_admin_user,
 )
-from open_webui.utils.plugin import install_tool_and_function_dependencies
+from open_webui.utils.plugin import (
+    install_tool_and_function_dependencies,
+    redis_plugin_invalidation_listener,
+)
 from open_webui.utils.oauth import (
     get_oauth_client_info_with_dynamic_client_registration,
     encrypt_data,
@@ -619,12 +644,23 @@ async def lifespan(app: FastAPI):
         app.state.redis_task_command_listener = asyncio.create_task(
             redis_task_command_listener(app)
         )
+        app.state.redis_plugin_invalidation_listener = asyncio.create_task(
+            redis_plugin_invalidation_listener(app)
+        )
 
     if THREAD_POOL_SIZE and THREAD_POOL_SIZE > 0:
         limiter = anyio.to_thread.current_default_thread_limiter()
         limiter.total_tokens = THREAD_POOL_SIZE
 
     asyncio.create_task(periodic_usage_pool_cleanup())
+    asyncio.create_task(periodic_session_pool_refresh())
+    asyncio.create_task(
+        periodic_unread_count_reconciliation(
+            CHANNEL_UNREAD_COUNT_RECONCILE_INTERVAL,
+            app.state.redis,
+            full_interval=CHANNEL_UNREAD_COUNT_FULL_RECONCILE_INTERVAL,
+        )
+    )
 
     if app.state.config.ENABLE_BASE_MODELS_CACHE:
         await get_all_models(
@@ -652,6 +688,14 @@ async def lifespan(app: FastAPI):
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
 
+    if hasattr(app.state, "redis_plugin_invalidation_listener"):
+        app.state.redis_plugin_invalidation_listener.cancel()
+
+    await WEBHOOK_DISPATCHER.close()
+    await app.state.mcp_client_pool.close()
+    await app.state.jupyter_kernel_pool.close()
+    await TOOL_SERVER_REGISTRY.close()
+
 
 app = FastAPI(
     title="Open WebUI",
@@ -669,6 +713,19 @@ app.state.oauth_manager = oauth_manager
 oauth_client_manager = OAuthClientManager(app)
 app.state.oauth_client_manager = oauth_client_manager
 
+# MCP client sessions shared across chat requests
+app.state.mcp_client_pool = MCPClientPool(
+    idle_timeout=MCP_CLIENT_POOL_IDLE_TIMEOUT,
+    health_check_interval=MCP_CLIENT_POOL_HEALTH_CHECK_INTERVAL,
+)
+
+# Code interpreter kernels kept per chat
+app.state.jupyter_kernel_pool = JupyterKernelPool(
+    idle_timeout=CODE_INTERPRETER_JUPYTER_KERNEL_IDLE_TIMEOUT,
+    max_kernels_per_user=CODE_INTERPRETER_JUPYTER_MAX_KERNELS_PER_USER,
+    warm_kernels=CODE_INTERPRETER_JUPYTER_WARM_KERNELS,
+)
+
 app.state.instance_id = None
 app.state.config = AppConfig(
     redis_url=REDIS_URL,
@@ -728,6 +785,7 @@ app.state.OPENAI_MODELS = {}
 
 app.state.config.TOOL_SERVER_CONNECTIONS = TOOL_SERVER_CONNECTIONS
 app.state.TOOL_SERVERS = []
+app.state.TOOL_SERVERS_VERSION = None
 
 ########################################
 #
@@ -755,6 +813,12 @@ app.state.SCIM_TOKEN = SCIM_TOKEN
 app.state.config.ENABLE_BASE_MODELS_CACHE = ENABLE_BASE_MODELS_CACHE
 app.state.BASE_MODELS = []
 
+app.state.CHAT_COMPLETION_ADMISSION = AdmissionController(
+    max_per_model=CHAT_COMPLETION_MAX_CONCURRENCY_PER_MODEL,
+    max_per_user=CHAT_COMPLETION_MAX_CONCURRENCY_PER_USER,
+    max_wait=CHAT_COMPLETION_QUEUE_TIMEOUT,
+)
+
 ########################################
 #
 # WEBUI
@@ -846,10 +910,10 @@ app.state.EXTERNAL_PWA_MANIFEST_URL = EXTERNAL_PWA_MANIFEST_URL
 app.state.USER_COUNT = None
 
 app.state.TOOLS = {}
-app.state.TOOL_CONTENTS = {}
+app.state.TOOL_VERSIONS = {}
 
 app.state.FUNCTIONS = {}
-app.state.FUNCTION_CONTENTS = {}
+app.state.FUNCTION_VERSIONS = {}
 
 ########################################
 #
@@ -1400,6 +1464,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -1573,6 +1638,12 @@ async def chat_completion(
     model_item = form_data.pop("model_item", {})
     tasks = form_data.pop("background_tasks", None)
 
+    # Conversation as sent by the client, kept for the background tasks before
+    # the payload is augmented with system prompts, files and retrieved context
+    task_messages = (
+        [{**message} for message in form_data.get("messages", [])] if tasks else None
+    )
+
     metadata = {}
     try:
         model_info = None
@@ -1730,7 +1801,15 @@ async def chat_completion(
                     pass
 
             return await process_chat_response(
-                request, response, form_data, user, metadata, model, events, tasks
+                request,
+                response,
+                form_data,
+                user,
+                metadata,
+                model,
+                events,
+                tasks,
+                task_messages,
             )
         except asyncio.CancelledError:
             log.info("Chat processing was cancelled")
@@ -1776,26 +1855,67 @@ async def chat_completion(
         finally:
             try:
                 if mcp_clients := metadata.get("mcp_clients"):
-                    for client in reversed(mcp_clients.values()):
-                        await client.disconnect()
+                    for session in mcp_clients.values():
+                        app.state.mcp_client_pool.release(session)
             except Exception as e:
                 log.debug(f"Error cleaning up: {e}")
                 pass
 
+    # Admission control: bound in-flight generations per model and per user
+    async def on_queued(position: int):
+        if metadata.get("session_id") and metadata.get("chat_id"):
+            event_emitter = get_event_emitter(metadata, update_db=False)
+            await event_emitter(
+                {"type": "chat:queue", "data": {"position": position}},
+            )
+
+    try:
+        release = await request.app.state.CHAT_COMPLETION_ADMISSION.acquire(
+            model_id,
+            user.id,
+            priority=get_request_priority(request, user),
+            on_queued=on_queued,
+        )
+    except AdmissionTimeoutError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=ERROR_MESSAGES.RATE_LIMIT_EXCEEDED,
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
     if (
         metadata.get("session_id")
         and metadata.get("chat_id")
         and metadata.get("message_id")
     ):
         # Asynchronous Chat Processing
-        task_id, _ = await create_task(
-            request.app.state.redis,
-            process_chat(request, form_data, user, metadata, model),
-            id=metadata["chat_id"],
-        )
+        try:
+            task_id, task = await create_task(
+                request.app.state.redis,
+                process_chat(request, form_data, user, metadata, model),
+                id=metadata["chat_id"],
+            )
+        except Exception:
+            release()
+            raise
+
+        # Released from a done callback so a task cancelled before it first
+        # runs (e.g. stopped right away) still frees its slot
+        task.add_done_callback(lambda _: release())
         return {"status": True, "task_id": task_id}
     else:
-        return await process_chat(request, form_data, user, metadata, model)
+        try:
+            response = await process_chat(request, form_data, user, metadata, model)
+        except BaseException:
+            release()
+            raise
+
+        if isinstance(response, StreamingResponse):
+            # Hold the slot until the stream has been fully consumed or closed
+            response.body_iterator = release_on_close(response.body_iterator, release)
+        else:
+            release()
+        return response
 
 
 # Alias for chat_completion (Legacy)
@@ -2121,7 +2241,7 @@ async def get_current_usage(user=Depends(get_verified_user)):
             )
 
         return {
-            "model_ids": get_models_in_use(),
+            "model_ids": await get_models_in_use(),
             "user_count": Users.get_active_user_count(),
         }
     except HTTPException:
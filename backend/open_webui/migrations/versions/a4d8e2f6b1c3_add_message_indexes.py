@@ -0,0 +1,53 @@
+"""Add message thread and reaction indexes
+
+Revision ID: a4d8e2f6b1c3
+Revises: f3a9d1c5e7b2
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4d8e2f6b1c3"
+down_revision: Union[str, None] = "f3a9d1c5e7b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    (
+        "message",
+        "message_channel_id_parent_id_created_at_idx",
+        ["channel_id", "parent_id", "created_at"],
+    ),
+    ("message", "message_parent_id_created_at_idx", ["parent_id", "created_at"]),
+    ("message_reaction", "message_reaction_message_id_idx", ["message_id"]),
+]
+
+
+def _get_index_names(inspector, table_name: str) -> set[str]:
+    return {
+        index["name"]
+        for index in inspector.get_indexes(table_name)
+        if index.get("name")
+    }
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    for table_name, index_name, columns in INDEXES:
+        if index_name not in _get_index_names(inspector, table_name):
+            op.create_index(index_name, table_name, columns)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    for table_name, index_name, _ in INDEXES:
+        if index_name in _get_index_names(inspector, table_name):
+            op.drop_index(index_name, table_name=table_name)
@@ -0,0 +1,52 @@
+"""Add channel summary indexes
+
+Revision ID: b7e1f4a9c2d6
+Revises: a4d8e2f6b1c3
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e1f4a9c2d6"
+down_revision: Union[str, None] = "a4d8e2f6b1c3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("message", "message_channel_id_created_at_idx", ["channel_id", "created_at"]),
+    (
+        "channel_member",
+        "channel_member_user_id_channel_id_idx",
+        ["user_id", "channel_id"],
+    ),
+]
+
+
+def _get_index_names(inspector, table_name: str) -> set[str]:
+    return {
+        index["name"]
+        for index in inspector.get_indexes(table_name)
+        if index.get("name")
+    }
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    for table_name, index_name, columns in INDEXES:
+        if index_name not in _get_index_names(inspector, table_name):
+            op.create_index(index_name, table_name, columns)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    for table_name, index_name, _ in INDEXES:
+        if index_name in _get_index_names(inspector, table_name):
+            op.drop_index(index_name, table_name=table_name)
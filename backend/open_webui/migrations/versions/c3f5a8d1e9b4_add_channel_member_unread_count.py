@@ -0,0 +1,46 @@
+"""Add unread_count to channel_member
+
+Revision ID: c3f5a8d1e9b4
+Revises: b7e1f4a9c2d6
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f5a8d1e9b4"
+down_revision: Union[str, None] = "b7e1f4a9c2d6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    columns = {column["name"] for column in inspector.get_columns("channel_member")}
+
+    if "unread_count" not in columns:
+        op.add_column(
+            "channel_member",
+            sa.Column("unread_count", sa.Integer(), nullable=False, server_default="0"),
+        )
+
+    # Backfill the counters from the messages table
+    op.execute(
+        "UPDATE channel_member SET unread_count = ("
+        "SELECT COUNT(message.id) FROM message "
+        "WHERE message.channel_id = channel_member.channel_id "
+        "AND message.parent_id IS NULL "
+        "AND message.created_at > COALESCE(channel_member.last_read_at, 0) "
+        "AND message.user_id != channel_member.user_id"
+        ")"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("channel_member") as batch_op:
+        batch_op.drop_column("unread_count")
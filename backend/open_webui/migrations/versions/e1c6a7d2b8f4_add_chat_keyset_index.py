@@ -0,0 +1,45 @@
+"""Add chat keyset pagination index
+
+Revision ID: e1c6a7d2b8f4
+Revises: c440947495f3, c9f0c2b1d5a7
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e1c6a7d2b8f4"
+down_revision: Union[str, Sequence[str], None] = ("c440947495f3", "c9f0c2b1d5a7")
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    index_names = {
+        index["name"] for index in inspector.get_indexes("chat") if index.get("name")
+    }
+    if "user_id_archived_updated_at_id_idx" not in index_names:
+        op.create_index(
+            "user_id_archived_updated_at_id_idx",
+            "chat",
+            ["user_id", "archived", "updated_at", "id"],
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    index_names = {
+        index["name"] for index in inspector.get_indexes("chat") if index.get("name")
+    }
+    if "user_id_archived_updated_at_id_idx" in index_names:
+        op.drop_index("user_id_archived_updated_at_id_idx", table_name="chat")
@@ -0,0 +1,179 @@
+"""Add chat_search table and full-text index
+
+Revision ID: f3a9d1c5e7b2
+Revises: e1c6a7d2b8f4
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+import json
+import logging
+import time
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+log = logging.getLogger(__name__)
+
+# revision identifiers, used by Alembic.
+revision: str = "f3a9d1c5e7b2"
+down_revision: Union[str, None] = "e1c6a7d2b8f4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+
+def _get_entries(chat) -> list[tuple]:
+    if isinstance(chat, str):
+        try:
+            chat = json.loads(chat)
+        except Exception:
+            return []
+    if not isinstance(chat, dict):
+        return []
+
+    entries = [(None, chat.get("title", "New Chat") or "")]
+
+    messages = (chat.get("history") or {}).get("messages") or {}
+    if not messages:
+        messages = {
+            message.get("id"): message
+            for message in chat.get("messages") or []
+            if isinstance(message, dict) and message.get("id")
+        }
+
+    for message_id, message in messages.items():
+        content = message.get("content") if isinstance(message, dict) else None
+        if isinstance(content, str) and content:
+            entries.append((message_id, content.replace("\x00", "")))
+
+    return entries
+
+
+def upgrade() -> None:
+    op.create_table(
+        "chat_search",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column(
+            "chat_id",
+            sa.Text(),
+            sa.ForeignKey("chat.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("user_id", sa.Text(), nullable=False),
+        sa.Column("message_id", sa.Text(), nullable=True),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("updated_at", sa.BigInteger(), nullable=False),
+    )
+    op.create_index(
+        "chat_search_chat_id_message_id_idx", "chat_search", ["chat_id", "message_id"]
+    )
+    op.create_index("chat_search_user_id_idx", "chat_search", ["user_id"])
+
+    bind = op.get_bind()
+    dialect_name = bind.dialect.name
+
+    if dialect_name == "sqlite":
+        try:
+            # user_id is indexed too, so matches are scoped to one user's rows
+            # inside the index rather than filtered afterwards
+            op.execute(
+                "CREATE VIRTUAL TABLE chat_search_fts USING fts5("
+                "content, user_id, content='chat_search', content_rowid='id', "
+                "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+            )
+            op.execute(
+                "CREATE TRIGGER chat_search_ai AFTER INSERT ON chat_search BEGIN "
+                "INSERT INTO chat_search_fts(rowid, content, user_id) "
+                "VALUES (new.id, new.content, new.user_id); END"
+            )
+            op.execute(
+                "CREATE TRIGGER chat_search_ad AFTER DELETE ON chat_search BEGIN "
+                "INSERT INTO chat_search_fts(chat_search_fts, rowid, content, user_id) "
+                "VALUES ('delete', old.id, old.content, old.user_id); END"
+            )
+            op.execute(
+                "CREATE TRIGGER chat_search_au AFTER UPDATE ON chat_search BEGIN "
+                "INSERT INTO chat_search_fts(chat_search_fts, rowid, content, user_id) "
+                "VALUES ('delete', old.id, old.content, old.user_id); "
+                "INSERT INTO chat_search_fts(rowid, content, user_id) "
+                "VALUES (new.id, new.content, new.user_id); END"
+            )
+        except Exception as e:
+            # SQLite builds without FTS5 fall back to LIKE over chat_search
+            log.warning(f"FTS5 unavailable, chat search will use LIKE: {e}")
+    elif dialect_name == "postgresql":
+        # With btree_gin the index covers user_id as well, so matches are
+        # scoped to one user's rows inside the index
+        columns = "user_id, to_tsvector('simple', content)"
+        try:
+            with bind.begin_nested():
+                bind.execute(sa.text("CREATE EXTENSION IF NOT EXISTS btree_gin"))
+        except Exception as e:
+            log.warning(f"btree_gin unavailable, indexing chat search by content: {e}")
+            columns = "to_tsvector('simple', content)"
+
+        op.execute(
+            "CREATE INDEX chat_search_content_tsv_idx ON chat_search "
+            f"USING GIN ({columns})"
+        )
+
+    # Backfill the index from existing chats
+    chat_table = sa.table(
+        "chat",
+        sa.column("id", sa.String()),
+        sa.column("user_id", sa.String()),
+        sa.column("chat", sa.JSON()),
+    )
+    chat_search_table = sa.table(
+        "chat_search",
+        sa.column("chat_id", sa.Text()),
+        sa.column("user_id", sa.Text()),
+        sa.column("message_id", sa.Text()),
+        sa.column("content", sa.Text()),
+        sa.column("updated_at", sa.BigInteger()),
+    )
+
+    now = int(time.time())
+    last_id = None
+    while True:
+        query = sa.select(chat_table.c.id, chat_table.c.user_id, chat_table.c.chat)
+        if last_id is not None:
+            query = query.where(chat_table.c.id > last_id)
+        rows = bind.execute(query.order_by(chat_table.c.id).limit(BATCH_SIZE)).all()
+        if not rows:
+            break
+
+        values = [
+            {
+                "chat_id": chat_id,
+                "user_id": user_id,
+                "message_id": message_id,
+                "content": content,
+                "updated_at": now,
+            }
+            for chat_id, user_id, chat in rows
+            if user_id and not user_id.startswith("shared-")
+            for message_id, content in _get_entries(chat)
+        ]
+        if values:
+            bind.execute(chat_search_table.insert(), values)
+
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS chat_search_ai")
+        op.execute("DROP TRIGGER IF EXISTS chat_search_ad")
+        op.execute("DROP TRIGGER IF EXISTS chat_search_au")
+        op.execute("DROP TABLE IF EXISTS chat_search_fts")
+    elif bind.dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS chat_search_content_tsv_idx")
+
+    op.drop_index("chat_search_user_id_idx", table_name="chat_search")
+    op.drop_index("chat_search_chat_id_message_id_idx", table_name="chat_search")
+    op.drop_table("chat_search")
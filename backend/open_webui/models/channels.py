@@ -17,10 +17,12 @@ from sqlalchemy import (
     Boolean,
     Column,
     ForeignKey,
+    Integer,
     String,
     Text,
     JSON,
     UniqueConstraint,
+    Index,
     case,
     cast,
 )
@@ -115,10 +117,16 @@ class ChannelMember(Base):
     left_at = Column(BigInteger, nullable=True)
 
     last_read_at = Column(BigInteger, nullable=True)
+    # Top-level messages from others since last_read_at, maintained on write
+    unread_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     created_at = Column(BigInteger)
     updated_at = Column(BigInteger)
 
+    __table_args__ = (
+        Index("channel_member_user_id_channel_id_idx", "user_id", "channel_id"),
+    )
+
 
 class ChannelMemberModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -145,6 +153,7 @@ class ChannelMemberModel(BaseModel):
     left_at: Optional[int] = None  # timestamp in epoch (time_ns)
 
     last_read_at: Optional[int] = None  # timestamp in epoch (time_ns)
+    unread_count: int = 0
 
     created_at: Optional[int] = None  # timestamp in epoch (time_ns)
     updated_at: Optional[int] = None  # timestamp in epoch (time_ns)
@@ -631,6 +640,50 @@ class ChannelTable:
                 for membership in memberships
             ]
 
+    def get_member_user_ids_by_channel_id(
+        self, channel_id: str, db: Optional[Session] = None
+    ) -> set[str]:
+        with get_db_context(db) as db:
+            return {
+                user_id
+                for (user_id,) in db.query(ChannelMember.user_id)
+                .filter(ChannelMember.channel_id == channel_id)
+                .all()
+            }
+
+    def get_members_by_channel_ids(
+        self, channel_ids: list[str], db: Optional[Session] = None
+    ) -> dict[str, list[ChannelMemberModel]]:
+        if not channel_ids:
+            return {}
+
+        with get_db_context(db) as db:
+            memberships = (
+                db.query(ChannelMember)
+                .filter(ChannelMember.channel_id.in_(channel_ids))
+                .all()
+            )
+
+            members = {}
+            for membership in memberships:
+                members.setdefault(membership.channel_id, []).append(
+                    ChannelMemberModel.model_validate(membership)
+                )
+            return members
+
+    def get_member_unread_counts_by_channel_id(
+        self, channel_id: str, db: Optional[Session] = None
+    ) -> dict[str, int]:
+        with get_db_context(db) as db:
+            return {
+                user_id: unread_count
+                for user_id, unread_count in db.query(
+                    ChannelMember.user_id, ChannelMember.unread_count
+                )
+                .filter(ChannelMember.channel_id == channel_id)
+                .all()
+            }
+
     def pin_channel(
         self,
         channel_id: str,
@@ -672,6 +725,7 @@ class ChannelTable:
                 return False
 
             membership.last_read_at = int(time.time_ns())
+            membership.unread_count = 0
             membership.updated_at = int(time.time_ns())
 
             db.commit()
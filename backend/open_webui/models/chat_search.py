@@ -0,0 +1,453 @@
+import logging
+import re
+import time
+from typing import Optional
+
+from sqlalchemy.orm import Session
+from open_webui.internal.db import Base, get_db_context
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Float,
+    ForeignKey,
+    Integer,
+    Text,
+    Index,
+    and_,
+    insert,
+    literal,
+    or_,
+    select,
+    text,
+)
+from sqlalchemy.sql.expression import bindparam
+
+log = logging.getLogger(__name__)
+
+####################
+# ChatSearch DB Schema
+####################
+
+# One row per chat title (message_id IS NULL) and per message. The rows are
+# kept in sync with the chat JSON by ChatTable and indexed per dialect:
+#   - sqlite:     external-content FTS5 table `chat_search_fts` over content
+#                 and user_id (see migration)
+#   - postgresql: GIN index on (user_id, to_tsvector('simple', content)), or
+#                 on the tsvector alone without the btree_gin extension
+#   - otherwise:  plain LIKE over this table (still avoids parsing chat JSON)
+# Every backend matches terms as word prefixes: "deploy" finds "deployment"
+# but not "redeploy".
+
+
+class ChatSearch(Base):
+    __tablename__ = "chat_search"
+
+    # INTEGER PRIMARY KEY aliases the SQLite rowid used by the FTS5 index
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    chat_id = Column(Text, ForeignKey("chat.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Text, nullable=False)
+    message_id = Column(Text, nullable=True)
+    content = Column(Text, nullable=False)
+    updated_at = Column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        Index("chat_search_chat_id_message_id_idx", "chat_id", "message_id"),
+        Index("chat_search_user_id_idx", "user_id"),
+    )
+
+
+SNIPPET_START = "**"
+SNIPPET_STOP = "**"
+
+# Characters a word may follow in the LIKE fallback, approximating the
+# word boundaries of the FTS5 and tsvector tokenizers
+WORD_SEPARATORS = (
+    " ",
+    "\n",
+    "\t",
+    "(",
+    "[",
+    '"',
+    "'",
+    "`",
+    "*",
+    "#",
+    "-",
+    "_",
+    "/",
+    ".",
+    ",",
+    ":",
+    ";",
+)
+
+
+def get_search_terms(search_text: str) -> list[str]:
+    """Split free text into the word tokens understood by every search backend."""
+    return [term for term in re.findall(r"\w+", search_text.lower()) if term]
+
+
+def get_chat_search_entries(chat: dict) -> dict[Optional[str], str]:
+    """
+    Extract the indexable text of a chat, keyed by message id (None for the title).
+    """
+    entries = {None: chat.get("title", "New Chat") or ""}
+
+    messages = chat.get("history", {}).get("messages", {}) or {}
+    if not messages:
+        messages = {
+            message.get("id"): message
+            for message in chat.get("messages", []) or []
+            if isinstance(message, dict) and message.get("id")
+        }
+
+    for message_id, message in messages.items():
+        content = message.get("content") if isinstance(message, dict) else None
+        if isinstance(content, str) and content:
+            entries[message_id] = content
+
+    return entries
+
+
+def _get_word_prefix_clause(term: str):
+    return or_(
+        ChatSearch.content.istartswith(term, autoescape=True),
+        *[
+            ChatSearch.content.icontains(separator + term, autoescape=True)
+            for separator in WORD_SEPARATORS
+        ],
+    )
+
+
+def _make_snippet(content: str, terms: list[str], width: int = 60) -> str:
+    matches = [
+        re.search(rf"\b{re.escape(term)}", content, flags=re.IGNORECASE)
+        for term in terms
+    ]
+    positions = [match.start() for match in matches if match]
+    if not positions:
+        return content[: width * 2]
+
+    index = min(positions)
+    start = max(0, index - width)
+    end = min(len(content), index + width)
+    snippet = content[start:end]
+    for term in terms:
+        snippet = re.sub(
+            rf"\b({re.escape(term)})",
+            f"{SNIPPET_START}\\1{SNIPPET_STOP}",
+            snippet,
+            flags=re.IGNORECASE,
+        )
+
+    return (
+        ("..." if start > 0 else "") + snippet + ("..." if end < len(content) else "")
+    )
+
+
+class ChatSearchTable:
+    _backends: dict[str, str] = {}
+
+    def _get_backend(self, db: Session) -> str:
+        dialect_name = db.bind.dialect.name
+        if dialect_name not in self._backends:
+            backend = "like"
+            if dialect_name == "postgresql":
+                backend = "postgresql"
+            elif dialect_name == "sqlite":
+                try:
+                    exists = db.execute(
+                        text(
+                            "SELECT 1 FROM sqlite_master "
+                            "WHERE type = 'table' AND name = 'chat_search_fts'"
+                        )
+                    ).first()
+                    if exists:
+                        backend = "sqlite"
+                except Exception as e:
+                    log.debug(f"FTS5 index not available: {e}")
+
+            self._backends[dialect_name] = backend
+        return self._backends[dialect_name]
+
+    def sync_chat(
+        self,
+        chat_id: str,
+        user_id: str,
+        chat: dict,
+        db: Optional[Session] = None,
+    ) -> None:
+        """
+        Bring the index rows of a chat in line with its JSON, only writing
+        rows whose content actually changed.
+        """
+        try:
+            with get_db_context(db) as db:
+                entries = get_chat_search_entries(chat)
+                existing = {
+                    row.message_id: row
+                    for row in db.query(ChatSearch).filter_by(chat_id=chat_id).all()
+                }
+
+                now = int(time.time())
+                for message_id, content in entries.items():
+                    row = existing.pop(message_id, None)
+                    if row is None:
+                        db.add(
+                            ChatSearch(
+                                chat_id=chat_id,
+                                user_id=user_id,
+                                message_id=message_id,
+                                content=content,
+                                updated_at=now,
+                            )
+                        )
+                    elif row.content != content:
+                        row.content = content
+                        row.updated_at = now
+
+                for row in existing.values():
+                    db.delete(row)
+
+                db.commit()
+        except Exception as e:
+            log.exception(f"Error indexing chat {chat_id}: {e}")
+
+    def sync_chats(
+        self, chats: list[tuple[str, str, dict]], db: Optional[Session] = None
+    ) -> None:
+        """Index freshly inserted chats given as (chat_id, user_id, chat) tuples."""
+        try:
+            with get_db_context(db) as db:
+                now = int(time.time())
+                values = [
+                    {
+                        "chat_id": chat_id,
+                        "user_id": user_id,
+                        "message_id": message_id,
+                        "content": content,
+                        "updated_at": now,
+                    }
+                    for chat_id, user_id, chat in chats
+                    for message_id, content in get_chat_search_entries(chat).items()
+                ]
+                if values:
+                    db.execute(insert(ChatSearch), values)
+                    db.commit()
+        except Exception as e:
+            log.exception(f"Error indexing chats: {e}")
+
+    def upsert_message(
+        self,
+        chat_id: str,
+        user_id: str,
+        message_id: str,
+        content: Optional[str],
+        db: Optional[Session] = None,
+    ) -> None:
+        if not isinstance(content, str):
+            return
+
+        try:
+            with get_db_context(db) as db:
+                row = (
+                    db.query(ChatSearch)
+                    .filter_by(chat_id=chat_id, message_id=message_id)
+                    .first()
+                )
+                now = int(time.time())
+                if row is None:
+                    if content:
+                        db.add(
+                            ChatSearch(
+                                chat_id=chat_id,
+                                user_id=user_id,
+                                message_id=message_id,
+                                content=content,
+                                updated_at=now,
+                            )
+                        )
+                elif not content:
+                    db.delete(row)
+                elif row.content != content:
+                    row.content = content
+                    row.updated_at = now
+                db.commit()
+        except Exception as e:
+            log.exception(f"Error indexing message {chat_id}/{message_id}: {e}")
+
+    def delete_by_chat_ids(
+        self, chat_ids: list[str], db: Optional[Session] = None
+    ) -> bool:
+        try:
+            with get_db_context(db) as db:
+                db.query(ChatSearch).filter(ChatSearch.chat_id.in_(chat_ids)).delete(
+                    synchronize_session=False
+                )
+                db.commit()
+                return True
+        except Exception:
+            return False
+
+    def delete_by_user_id(self, user_id: str, db: Optional[Session] = None) -> bool:
+        try:
+            with get_db_context(db) as db:
+                db.query(ChatSearch).filter_by(user_id=user_id).delete()
+                db.commit()
+                return True
+        except Exception:
+            return False
+
+    def get_match_subquery(self, db: Session, user_id: str, terms: list[str]):
+        """
+        Selectable of (chat_id, rank) for chats of `user_id` with at least one
+        entry containing all terms. Lower rank is a better match.
+        """
+        backend = self._get_backend(db)
+
+        if backend == "sqlite":
+            return (
+                text(
+                    # OFFSET 0 keeps SQLite from flattening the FTS subquery,
+                    # bm25() is only valid directly inside a MATCH query
+                    "SELECT chat_search.chat_id AS chat_id, MIN(fts.score) AS rank "
+                    "FROM ("
+                    "SELECT rowid AS rowid, bm25(chat_search_fts, 1.0, 0.0) AS score "
+                    "FROM chat_search_fts "
+                    "WHERE chat_search_fts MATCH :match_query "
+                    "LIMIT -1 OFFSET 0"
+                    ") AS fts "
+                    "JOIN chat_search ON chat_search.id = fts.rowid "
+                    "WHERE chat_search.user_id = :search_user_id "
+                    "GROUP BY chat_search.chat_id"
+                )
+                .bindparams(
+                    match_query=self._get_fts5_query(user_id, terms),
+                    search_user_id=user_id,
+                )
+                .columns(chat_id=Text, rank=Float)
+                .subquery("chat_search_match")
+            )
+        elif backend == "postgresql":
+            return (
+                text(
+                    "SELECT chat_id, "
+                    "MIN(-ts_rank(to_tsvector('simple', content), "
+                    "to_tsquery('simple', :match_query))) AS rank "
+                    "FROM chat_search "
+                    "WHERE user_id = :search_user_id "
+                    "AND to_tsvector('simple', content) "
+                    "@@ to_tsquery('simple', :match_query) "
+                    "GROUP BY chat_id"
+                )
+                .bindparams(
+                    match_query=self._get_tsquery(terms), search_user_id=user_id
+                )
+                .columns(chat_id=Text, rank=Float)
+                .subquery("chat_search_match")
+            )
+        else:
+            return (
+                select(
+                    ChatSearch.chat_id.label("chat_id"),
+                    literal(0.0).label("rank"),
+                )
+                .where(
+                    ChatSearch.user_id == user_id,
+                    and_(*[_get_word_prefix_clause(term) for term in terms]),
+                )
+                .group_by(ChatSearch.chat_id)
+                .subquery("chat_search_match")
+            )
+
+    def get_snippets(
+        self,
+        user_id: str,
+        chat_ids: list[str],
+        terms: list[str],
+        db: Optional[Session] = None,
+    ) -> dict[str, str]:
+        """Best matching, highlighted snippet for each of the given chats."""
+        if not chat_ids or not terms:
+            return {}
+
+        with get_db_context(db) as db:
+            backend = self._get_backend(db)
+
+            if backend == "sqlite":
+                rows = db.execute(
+                    text(
+                        "SELECT chat_search.chat_id, "
+                        "snippet(chat_search_fts, 0, :start, :stop, '...', 24) "
+                        "FROM chat_search_fts "
+                        "JOIN chat_search ON chat_search.id = chat_search_fts.rowid "
+                        "WHERE chat_search_fts MATCH :match_query "
+                        "AND chat_search.user_id = :search_user_id "
+                        "AND chat_search.chat_id IN :chat_ids "
+                        "ORDER BY bm25(chat_search_fts, 1.0, 0.0)"
+                    ).bindparams(
+                        bindparam("chat_ids", expanding=True),
+                        match_query=self._get_fts5_query(user_id, terms),
+                        search_user_id=user_id,
+                        chat_ids=chat_ids,
+                        start=SNIPPET_START,
+                        stop=SNIPPET_STOP,
+                    )
+                ).all()
+            elif backend == "postgresql":
+                rows = db.execute(
+                    text(
+                        "SELECT DISTINCT ON (chat_id) chat_id, "
+                        "ts_headline('simple', content, "
+                        "to_tsquery('simple', :match_query), :options) "
+                        "FROM chat_search "
+                        "WHERE user_id = :search_user_id "
+                        "AND chat_id IN :chat_ids "
+                        "AND to_tsvector('simple', content) "
+                        "@@ to_tsquery('simple', :match_query) "
+                        "ORDER BY chat_id, ts_rank(to_tsvector('simple', content), "
+                        "to_tsquery('simple', :match_query)) DESC"
+                    ).bindparams(
+                        bindparam("chat_ids", expanding=True),
+                        match_query=self._get_tsquery(terms),
+                        search_user_id=user_id,
+                        chat_ids=chat_ids,
+                        options=(
+                            f"StartSel={SNIPPET_START}, StopSel={SNIPPET_STOP}, "
+                            "MaxFragments=1, MaxWords=24, MinWords=8"
+                        ),
+                    )
+                ).all()
+            else:
+                rows = [
+                    (row.chat_id, _make_snippet(row.content, terms))
+                    for row in db.query(ChatSearch)
+                    .filter(
+                        ChatSearch.user_id == user_id,
+                        ChatSearch.chat_id.in_(chat_ids),
+                        and_(*[_get_word_prefix_clause(term) for term in terms]),
+                    )
+                    .all()
+                ]
+
+            snippets = {}
+            for chat_id, snippet in rows:
+                snippets.setdefault(chat_id, snippet)
+            return snippets
+
+    def _get_fts5_query(self, user_id: str, terms: list[str]) -> str:
+        # The user's rows, AND-ed with quoted prefix queries on the content:
+        # user_id : "<id>" AND content : ("foo"* "bar"*)
+        user_id = user_id.replace('"', '""')
+        return (
+            f'user_id : "{user_id}" AND content : ('
+            + " ".join(f'"{term}"*' for term in terms)
+            + ")"
+        )
+
+    def _get_tsquery(self, terms: list[str]) -> str:
+        return " & ".join(f"{term}:*" for term in terms)
+
+
+ChatSearches = ChatSearchTable()
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from open_webui.models.tags import TagModel, Tag, Tags
 from open_webui.models.folders import Folders
+from open_webui.models.chat_search import ChatSearches, get_search_terms
 from open_webui.utils.misc import sanitize_data_for_db, sanitize_text_for_db
 
 from pydantic import BaseModel, ConfigDict
@@ -22,7 +23,7 @@ from sqlalchemy import (
     Index,
     UniqueConstraint,
 )
-from sqlalchemy import or_, func, select, and_, text
+from sqlalchemy import or_, func, select, and_, text, insert
 from sqlalchemy.sql import exists
 from sqlalchemy.sql.expression import bindparam
 
@@ -63,6 +64,17 @@ class Chat(Base):
         Index("updated_at_user_id_idx", "updated_at", "user_id"),
         # WHERE folder_id = ... AND user_id = ...
         Index("folder_id_user_id_idx", "folder_id", "user_id"),
+        # WHERE user_id = ... AND archived = ...
+        # ORDER BY updated_at DESC, id DESC (keyset pagination)
+        # pinned is left out: "pinned = false OR pinned IS NULL" would stop
+        # the index from providing the order
+        Index(
+            "user_id_archived_updated_at_id_idx",
+            "user_id",
+            "archived",
+            "updated_at",
+            "id",
+        ),
     )
 
 
@@ -168,6 +180,22 @@ class ChatTitleIdResponse(BaseModel):
     created_at: int
 
 
+def encode_chat_cursor(updated_at: int, id: str) -> str:
+    """Build an opaque keyset cursor pointing at a chat in an updated_at listing."""
+    return f"{updated_at}:{id}"
+
+
+def decode_chat_cursor(cursor: str) -> tuple[int, str]:
+    updated_at, sep, id = cursor.partition(":")
+    if not sep or not id:
+        raise ValueError("Invalid cursor")
+    return int(updated_at), id
+
+
+class ChatSearchResponse(ChatTitleIdResponse):
+    snippet: Optional[str] = None  # highlighted best match, if any
+
+
 class ChatListResponse(BaseModel):
     items: list[ChatModel]
     total: int
@@ -306,6 +334,8 @@ class ChatTable:
             db.add(chat_item)
             db.commit()
             db.refresh(chat_item)
+
+            ChatSearches.sync_chat(chat.id, user_id, chat.chat, db=db)
             return ChatModel.model_validate(chat_item) if chat_item else None
 
     def _chat_import_form_to_chat_model(
@@ -348,10 +378,45 @@ class ChatTable:
 
             db.add_all(chats)
             db.commit()
+
+            ChatSearches.sync_chats(
+                [(chat.id, chat.user_id, chat.chat) for chat in chats], db=db
+            )
             return [ChatModel.model_validate(chat) for chat in chats]
 
+    def insert_chats_batch(
+        self,
+        user_id: str,
+        chat_import_forms: list[ChatImportForm],
+        db: Optional[Session] = None,
+    ) -> int:
+        """
+        Bulk insert imported chats with a single executemany and no ORM
+        objects, for streaming imports. Returns the number of inserted chats.
+        """
+        if not chat_import_forms:
+            return 0
+
+        with get_db_context(db) as db:
+            values = [
+                self._chat_import_form_to_chat_model(user_id, form_data).model_dump()
+                for form_data in chat_import_forms
+            ]
+
+            db.execute(insert(Chat), values)
+            db.commit()
+
+            ChatSearches.sync_chats(
+                [(chat["id"], user_id, chat["chat"]) for chat in values], db=db
+            )
+            return len(values)
+
     def update_chat_by_id(
-        self, id: str, chat: dict, db: Optional[Session] = None
+        self,
+        id: str,
+        chat: dict,
+        db: Optional[Session] = None,
+        reindex: bool = True,
     ) -> Optional[ChatModel]:
         try:
             with get_db_context(db) as db:
@@ -368,6 +433,11 @@ class ChatTable:
                 db.commit()
                 db.refresh(chat_item)
 
+                if reindex:
+                    ChatSearches.sync_chat(
+                        chat_item.id, chat_item.user_id, chat_item.chat, db=db
+                    )
+
                 return ChatModel.model_validate(chat_item)
         except Exception:
             return None
@@ -450,7 +520,17 @@ class ChatTable:
         history["currentId"] = message_id
 
         chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+        result = self.update_chat_by_id(id, chat, reindex=False)
+
+        # Incremental index update: only the upserted message can have changed
+        if result is not None and "content" in message:
+            ChatSearches.upsert_message(
+                id,
+                result.user_id,
+                message_id,
+                result.chat["history"]["messages"][message_id].get("content"),
+            )
+        return result
 
     def add_message_status_to_chat_by_id_and_message_id(
         self, id: str, message_id: str, status: dict
@@ -468,7 +548,7 @@ class ChatTable:
             history["messages"][message_id]["statusHistory"] = status_history
 
         chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+        return self.update_chat_by_id(id, chat, reindex=False)
 
     def add_message_files_by_id_and_message_id(
         self, id: str, message_id: str, files: list[dict]
@@ -489,7 +569,7 @@ class ChatTable:
                 history["messages"][message_id]["files"] = message_files
 
             chat["history"] = history
-            self.update_chat_by_id(id, chat, db=db)
+            self.update_chat_by_id(id, chat, db=db, reindex=False)
             return message_files
 
     def insert_shared_chat_by_chat_id(
@@ -634,47 +714,76 @@ class ChatTable:
         except Exception:
             return False
 
-    def get_archived_chat_list_by_user_id(
+    def _get_archived_chat_list_query(
         self,
+        db: Session,
         user_id: str,
         filter: Optional[dict] = None,
         skip: int = 0,
         limit: int = 50,
-        db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    ):
+        query = db.query(Chat).filter_by(user_id=user_id, archived=True)
 
-        with get_db_context(db) as db:
-            query = db.query(Chat).filter_by(user_id=user_id, archived=True)
+        if filter:
+            query_key = filter.get("query")
+            if query_key:
+                query = query.filter(Chat.title.ilike(f"%{query_key}%"))
 
-            if filter:
-                query_key = filter.get("query")
-                if query_key:
-                    query = query.filter(Chat.title.ilike(f"%{query_key}%"))
+            order_by = filter.get("order_by")
+            direction = filter.get("direction")
 
-                order_by = filter.get("order_by")
-                direction = filter.get("direction")
+            if order_by and direction:
+                if not getattr(Chat, order_by, None):
+                    raise ValueError("Invalid order_by field")
 
-                if order_by and direction:
-                    if not getattr(Chat, order_by, None):
-                        raise ValueError("Invalid order_by field")
+                if direction.lower() == "asc":
+                    query = query.order_by(getattr(Chat, order_by).asc())
+                elif direction.lower() == "desc":
+                    query = query.order_by(getattr(Chat, order_by).desc())
+                else:
+                    raise ValueError("Invalid direction for ordering")
+        else:
+            query = query.order_by(Chat.updated_at.desc())
 
-                    if direction.lower() == "asc":
-                        query = query.order_by(getattr(Chat, order_by).asc())
-                    elif direction.lower() == "desc":
-                        query = query.order_by(getattr(Chat, order_by).desc())
-                    else:
-                        raise ValueError("Invalid direction for ordering")
-            else:
-                query = query.order_by(Chat.updated_at.desc())
+        if skip:
+            query = query.offset(skip)
+        if limit:
+            query = query.limit(limit)
 
-            if skip:
-                query = query.offset(skip)
-            if limit:
-                query = query.limit(limit)
+        return query
+
+    def get_archived_chat_list_by_user_id(
+        self,
+        user_id: str,
+        filter: Optional[dict] = None,
+        skip: int = 0,
+        limit: int = 50,
+        db: Optional[Session] = None,
+    ) -> list[ChatModel]:
+
+        with get_db_context(db) as db:
+            query = self._get_archived_chat_list_query(
+                db, user_id, filter=filter, skip=skip, limit=limit
+            )
 
             all_chats = query.all()
             return [ChatModel.model_validate(chat) for chat in all_chats]
 
+    def get_archived_chat_title_id_list_by_user_id(
+        self,
+        user_id: str,
+        filter: Optional[dict] = None,
+        skip: int = 0,
+        limit: int = 50,
+        db: Optional[Session] = None,
+    ) -> list[ChatTitleIdResponse]:
+        with get_db_context(db) as db:
+            query = self._get_archived_chat_list_query(
+                db, user_id, filter=filter, skip=skip, limit=limit
+            ).with_entities(Chat.id, Chat.title, Chat.updated_at, Chat.created_at)
+
+            return self._to_chat_title_id_list(query.all())
+
     def get_chat_list_by_user_id(
         self,
         user_id: str,
@@ -715,6 +824,39 @@ class ChatTable:
             all_chats = query.all()
             return [ChatModel.model_validate(chat) for chat in all_chats]
 
+    def _apply_updated_at_cursor(self, query, cursor: Optional[str]):
+        """
+        Order by (updated_at, id) descending and, if a cursor is given, seek
+        past it instead of using OFFSET so deep pages cost the same as the first.
+        """
+        if cursor:
+            updated_at, id = decode_chat_cursor(cursor)
+            # The plain upper bound lets the index seek; the OR alone is
+            # evaluated row by row on SQLite
+            query = query.filter(
+                Chat.updated_at <= updated_at,
+                or_(
+                    Chat.updated_at < updated_at,
+                    and_(Chat.updated_at == updated_at, Chat.id < id),
+                ),
+            )
+
+        return query.order_by(Chat.updated_at.desc(), Chat.id.desc())
+
+    def _to_chat_title_id_list(self, rows) -> list[ChatTitleIdResponse]:
+        # result has to be destructured from sqlalchemy `row` and mapped to a dict since the `ChatModel`is not the returned dataclass.
+        return [
+            ChatTitleIdResponse.model_validate(
+                {
+                    "id": row[0],
+                    "title": row[1],
+                    "updated_at": row[2],
+                    "created_at": row[3],
+                }
+            )
+            for row in rows
+        ]
+
     def get_chat_title_id_list_by_user_id(
         self,
         user_id: str,
@@ -723,6 +865,7 @@ class ChatTable:
         include_pinned: bool = False,
         skip: Optional[int] = None,
         limit: Optional[int] = None,
+        cursor: Optional[str] = None,
         db: Optional[Session] = None,
     ) -> list[ChatTitleIdResponse]:
         with get_db_context(db) as db:
@@ -737,29 +880,53 @@ class ChatTable:
             if not include_archived:
                 query = query.filter_by(archived=False)
 
-            query = query.order_by(Chat.updated_at.desc()).with_entities(
+            query = self._apply_updated_at_cursor(query, cursor).with_entities(
                 Chat.id, Chat.title, Chat.updated_at, Chat.created_at
             )
 
-            if skip:
+            if skip and not cursor:
                 query = query.offset(skip)
             if limit:
                 query = query.limit(limit)
 
-            all_chats = query.all()
+            return self._to_chat_title_id_list(query.all())
 
-            # result has to be destructured from sqlalchemy `row` and mapped to a dict since the `ChatModel`is not the returned dataclass.
-            return [
-                ChatTitleIdResponse.model_validate(
-                    {
-                        "id": chat[0],
-                        "title": chat[1],
-                        "updated_at": chat[2],
-                        "created_at": chat[3],
-                    }
-                )
-                for chat in all_chats
-            ]
+    def get_pinned_chat_title_id_list_by_user_id(
+        self, user_id: str, db: Optional[Session] = None
+    ) -> list[ChatTitleIdResponse]:
+        with get_db_context(db) as db:
+            query = (
+                db.query(Chat)
+                .filter_by(user_id=user_id, pinned=True, archived=False)
+                .order_by(Chat.updated_at.desc(), Chat.id.desc())
+                .with_entities(Chat.id, Chat.title, Chat.updated_at, Chat.created_at)
+            )
+            return self._to_chat_title_id_list(query.all())
+
+    def get_chat_title_id_list_by_folder_id_and_user_id(
+        self,
+        folder_id: str,
+        user_id: str,
+        skip: int = 0,
+        limit: int = 60,
+        cursor: Optional[str] = None,
+        db: Optional[Session] = None,
+    ) -> list[ChatTitleIdResponse]:
+        with get_db_context(db) as db:
+            query = db.query(Chat).filter_by(folder_id=folder_id, user_id=user_id)
+            query = query.filter(or_(Chat.pinned == False, Chat.pinned == None))
+            query = query.filter_by(archived=False)
+
+            query = self._apply_updated_at_cursor(query, cursor).with_entities(
+                Chat.id, Chat.title, Chat.updated_at, Chat.created_at
+            )
+
+            if skip and not cursor:
+                query = query.offset(skip)
+            if limit:
+                query = query.limit(limit)
+
+            return self._to_chat_title_id_list(query.all())
 
     def get_chat_list_by_chat_ids(
         self,
@@ -900,25 +1067,11 @@ class ChatTable:
             )
             return [ChatModel.model_validate(chat) for chat in all_chats]
 
-    def get_chats_by_user_id_and_search_text(
-        self,
-        user_id: str,
-        search_text: str,
-        include_archived: bool = False,
-        skip: int = 0,
-        limit: int = 60,
-        db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    def _parse_search_text(self, user_id: str, search_text: str) -> dict:
         """
-        Filters chats based on a search query using Python, allowing pagination using skip and limit.
+        Split a search string into free-text terms and the `tag:`, `folder:`,
+        `pinned:`, `archived:` and `shared:` filters.
         """
-        search_text = sanitize_text_for_db(search_text).lower().strip()
-
-        if not search_text:
-            return self.get_chat_list_by_user_id(
-                user_id, include_archived, filter={}, skip=skip, limit=limit, db=db
-            )
-
         search_text_words = search_text.split(" ")
 
         # search_text might contain 'tag:tag_name' format so we need to extract the tag_name, split the search_text and remove the tags
@@ -929,15 +1082,15 @@ class ChatTable:
         ]
 
         # Extract folder names - handle spaces and case insensitivity
-        folders = Folders.search_folders_by_names(
-            user_id,
-            [
-                word.replace("folder:", "")
-                for word in search_text_words
-                if word.startswith("folder:")
-            ],
-        )
-        folder_ids = [folder.id for folder in folders]
+        folder_names = [
+            word.replace("folder:", "")
+            for word in search_text_words
+            if word.startswith("folder:")
+        ]
+        folder_ids = []
+        if folder_names:
+            folders = Folders.search_folders_by_names(user_id, folder_names)
+            folder_ids = [folder.id for folder in folders]
 
         is_pinned = None
         if "pinned:true" in search_text_words:
@@ -969,139 +1122,150 @@ class ChatTable:
             )
         ]
 
-        search_text = " ".join(search_text_words)
+        return {
+            "terms": get_search_terms(" ".join(search_text_words)),
+            "tag_ids": tag_ids,
+            "folder_ids": folder_ids,
+            "is_pinned": is_pinned,
+            "is_archived": is_archived,
+            "is_shared": is_shared,
+        }
 
-        with get_db_context(db) as db:
-            query = db.query(Chat).filter(Chat.user_id == user_id)
+    def _get_search_query(
+        self,
+        db: Session,
+        user_id: str,
+        search_text: str,
+        include_archived: bool = False,
+    ):
+        """
+        Build the chat search query. Free text is matched through the
+        `chat_search` index (see models/chat_search.py) and ranked by relevance;
+        the chat JSON itself is never scanned.
+        """
+        options = self._parse_search_text(user_id, search_text)
 
-            if is_archived is not None:
-                query = query.filter(Chat.archived == is_archived)
-            elif not include_archived:
-                query = query.filter(Chat.archived == False)
+        query = db.query(Chat).filter(Chat.user_id == user_id)
 
-            if is_pinned is not None:
-                query = query.filter(Chat.pinned == is_pinned)
+        if options["is_archived"] is not None:
+            query = query.filter(Chat.archived == options["is_archived"])
+        elif not include_archived:
+            query = query.filter(Chat.archived == False)
 
-            if is_shared is not None:
-                if is_shared:
-                    query = query.filter(Chat.share_id.isnot(None))
-                else:
-                    query = query.filter(Chat.share_id.is_(None))
+        if options["is_pinned"] is not None:
+            query = query.filter(Chat.pinned == options["is_pinned"])
 
-            if folder_ids:
-                query = query.filter(Chat.folder_id.in_(folder_ids))
+        if options["is_shared"] is not None:
+            if options["is_shared"]:
+                query = query.filter(Chat.share_id.isnot(None))
+            else:
+                query = query.filter(Chat.share_id.is_(None))
 
-            query = query.order_by(Chat.updated_at.desc())
+        if options["folder_ids"]:
+            query = query.filter(Chat.folder_id.in_(options["folder_ids"]))
 
-            # Check if the database dialect is either 'sqlite' or 'postgresql'
-            dialect_name = db.bind.dialect.name
-            if dialect_name == "sqlite":
-                # SQLite case: using JSON1 extension for JSON searching
-                sqlite_content_sql = (
-                    "EXISTS ("
-                    "    SELECT 1 "
-                    "    FROM json_each(Chat.chat, '$.messages') AS message "
-                    "    WHERE LOWER(message.value->>'content') LIKE '%' || :content_key || '%'"
-                    ")"
-                )
-                sqlite_content_clause = text(sqlite_content_sql)
-                query = query.filter(
-                    or_(
-                        Chat.title.ilike(bindparam("title_key")), sqlite_content_clause
-                    ).params(title_key=f"%{search_text}%", content_key=search_text)
-                )
+        tag_ids = options["tag_ids"]
 
-                # Check if there are any tags to filter, it should have all the tags
-                if "none" in tag_ids:
-                    query = query.filter(
-                        text(
-                            """
-                            NOT EXISTS (
-                                SELECT 1
-                                FROM json_each(Chat.meta, '$.tags') AS tag
-                            )
-                            """
+        # Check if the database dialect is either 'sqlite' or 'postgresql'
+        dialect_name = db.bind.dialect.name
+        if dialect_name == "sqlite":
+            # Check if there are any tags to filter, it should have all the tags
+            if "none" in tag_ids:
+                query = query.filter(
+                    text(
+                        """
+                        NOT EXISTS (
+                            SELECT 1
+                            FROM json_each(Chat.meta, '$.tags') AS tag
                         )
+                        """
                     )
-                elif tag_ids:
-                    query = query.filter(
-                        and_(
-                            *[
-                                text(
-                                    f"""
-                                    EXISTS (
-                                        SELECT 1
-                                        FROM json_each(Chat.meta, '$.tags') AS tag
-                                        WHERE tag.value = :tag_id_{tag_idx}
-                                    )
-                                    """
-                                ).params(**{f"tag_id_{tag_idx}": tag_id})
-                                for tag_idx, tag_id in enumerate(tag_ids)
-                            ]
-                        )
+                )
+            elif tag_ids:
+                query = query.filter(
+                    and_(
+                        *[
+                            text(
+                                f"""
+                                EXISTS (
+                                    SELECT 1
+                                    FROM json_each(Chat.meta, '$.tags') AS tag
+                                    WHERE tag.value = :tag_id_{tag_idx}
+                                )
+                                """
+                            ).params(**{f"tag_id_{tag_idx}": tag_id})
+                            for tag_idx, tag_id in enumerate(tag_ids)
+                        ]
                     )
-
-            elif dialect_name == "postgresql":
-                # PostgreSQL doesn't allow null bytes in text. We filter those out by checking
-                # the JSON representation for \u0000 before attempting text extraction
-
-                # Safety filter: JSON field must not contain \u0000
-                query = query.filter(text("Chat.chat::text NOT LIKE '%\\\\u0000%'"))
-
-                # Safety filter: title must not contain actual null bytes
-                query = query.filter(text("Chat.title::text NOT LIKE '%\\x00%'"))
-
-                postgres_content_sql = """
-                EXISTS (
-                    SELECT 1
-                    FROM json_array_elements(Chat.chat->'messages') AS message
-                    WHERE json_typeof(message->'content') = 'string'
-                    AND LOWER(message->>'content') LIKE '%' || :content_key || '%'
                 )
-                """
-
-                postgres_content_clause = text(postgres_content_sql)
 
+        elif dialect_name == "postgresql":
+            # Check if there are any tags to filter, it should have all the tags
+            if "none" in tag_ids:
                 query = query.filter(
-                    or_(
-                        Chat.title.ilike(bindparam("title_key")),
-                        postgres_content_clause,
-                    )
-                ).params(title_key=f"%{search_text}%", content_key=search_text.lower())
-
-                # Check if there are any tags to filter, it should have all the tags
-                if "none" in tag_ids:
-                    query = query.filter(
-                        text(
-                            """
-                            NOT EXISTS (
-                                SELECT 1
-                                FROM json_array_elements_text(Chat.meta->'tags') AS tag
-                            )
-                            """
+                    text(
+                        """
+                        NOT EXISTS (
+                            SELECT 1
+                            FROM json_array_elements_text(Chat.meta->'tags') AS tag
                         )
+                        """
                     )
-                elif tag_ids:
-                    query = query.filter(
-                        and_(
-                            *[
-                                text(
-                                    f"""
-                                    EXISTS (
-                                        SELECT 1
-                                        FROM json_array_elements_text(Chat.meta->'tags') AS tag
-                                        WHERE tag = :tag_id_{tag_idx}
-                                    )
-                                    """
-                                ).params(**{f"tag_id_{tag_idx}": tag_id})
-                                for tag_idx, tag_id in enumerate(tag_ids)
-                            ]
-                        )
+                )
+            elif tag_ids:
+                query = query.filter(
+                    and_(
+                        *[
+                            text(
+                                f"""
+                                EXISTS (
+                                    SELECT 1
+                                    FROM json_array_elements_text(Chat.meta->'tags') AS tag
+                                    WHERE tag = :tag_id_{tag_idx}
+                                )
+                                """
+                            ).params(**{f"tag_id_{tag_idx}": tag_id})
+                            for tag_idx, tag_id in enumerate(tag_ids)
+                        ]
                     )
-            else:
-                raise NotImplementedError(
-                    f"Unsupported dialect: {db.bind.dialect.name}"
                 )
+        elif tag_ids:
+            raise NotImplementedError(f"Unsupported dialect: {db.bind.dialect.name}")
+
+        terms = options["terms"]
+        if terms:
+            match = ChatSearches.get_match_subquery(db, user_id, terms)
+            query = query.join(match, match.c.chat_id == Chat.id).order_by(
+                match.c.rank.asc(), Chat.updated_at.desc()
+            )
+        else:
+            query = query.order_by(Chat.updated_at.desc())
+
+        return query, terms
+
+    def get_chats_by_user_id_and_search_text(
+        self,
+        user_id: str,
+        search_text: str,
+        include_archived: bool = False,
+        skip: int = 0,
+        limit: int = 60,
+        db: Optional[Session] = None,
+    ) -> list[ChatModel]:
+        """
+        Filters chats based on a search query, allowing pagination using skip and limit.
+        """
+        search_text = sanitize_text_for_db(search_text).lower().strip()
+
+        if not search_text:
+            return self.get_chat_list_by_user_id(
+                user_id, include_archived, filter={}, skip=skip, limit=limit, db=db
+            )
+
+        with get_db_context(db) as db:
+            query, _ = self._get_search_query(
+                db, user_id, search_text, include_archived
+            )
 
             # Perform pagination at the SQL level
             all_chats = query.offset(skip).limit(limit).all()
@@ -1111,6 +1275,56 @@ class ChatTable:
             # Validate and return chats
             return [ChatModel.model_validate(chat) for chat in all_chats]
 
+    def search_chat_list_by_user_id(
+        self,
+        user_id: str,
+        search_text: str,
+        include_archived: bool = False,
+        skip: int = 0,
+        limit: int = 60,
+        db: Optional[Session] = None,
+    ) -> list[ChatSearchResponse]:
+        """
+        Ranked search returning only chat metadata plus a highlighted snippet of
+        the best matching title or message.
+        """
+        search_text = sanitize_text_for_db(search_text).lower().strip()
+
+        with get_db_context(db) as db:
+            if not search_text:
+                query, terms = db.query(Chat).filter_by(user_id=user_id), []
+                if not include_archived:
+                    query = query.filter_by(archived=False)
+                query = query.order_by(Chat.updated_at.desc())
+            else:
+                query, terms = self._get_search_query(
+                    db, user_id, search_text, include_archived
+                )
+
+            rows = (
+                query.with_entities(
+                    Chat.id, Chat.title, Chat.updated_at, Chat.created_at
+                )
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+
+            snippets = ChatSearches.get_snippets(
+                user_id, [row[0] for row in rows], terms, db=db
+            )
+
+            return [
+                ChatSearchResponse(
+                    id=row[0],
+                    title=row[1],
+                    updated_at=row[2],
+                    created_at=row[3],
+                    snippet=snippets.get(row[0]),
+                )
+                for row in rows
+            ]
+
     def get_chats_by_folder_id_and_user_id(
         self,
         folder_id: str,
@@ -1319,6 +1533,7 @@ class ChatTable:
     def delete_chat_by_id(self, id: str, db: Optional[Session] = None) -> bool:
         try:
             with get_db_context(db) as db:
+                ChatSearches.delete_by_chat_ids([id], db=db)
                 db.query(Chat).filter_by(id=id).delete()
                 db.commit()
 
@@ -1331,6 +1546,7 @@ class ChatTable:
     ) -> bool:
         try:
             with get_db_context(db) as db:
+                ChatSearches.delete_by_chat_ids([id], db=db)
                 db.query(Chat).filter_by(id=id, user_id=user_id).delete()
                 db.commit()
 
@@ -1345,6 +1561,7 @@ class ChatTable:
             with get_db_context(db) as db:
                 self.delete_shared_chats_by_user_id(user_id, db=db)
 
+                ChatSearches.delete_by_user_id(user_id, db=db)
                 db.query(Chat).filter_by(user_id=user_id).delete()
                 db.commit()
 
@@ -1357,6 +1574,13 @@ class ChatTable:
     ) -> bool:
         try:
             with get_db_context(db) as db:
+                chat_ids = [
+                    row[0]
+                    for row in db.query(Chat.id)
+                    .filter_by(user_id=user_id, folder_id=folder_id)
+                    .all()
+                ]
+                ChatSearches.delete_by_chat_ids(chat_ids, db=db)
                 db.query(Chat).filter_by(user_id=user_id, folder_id=folder_id).delete()
                 db.commit()
 
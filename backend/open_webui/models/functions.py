@@ -6,7 +6,7 @@ from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from open_webui.models.users import Users, UserModel
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, Index
+from sqlalchemy import BigInteger, Boolean, Column, String, Text, Index, func
 
 log = logging.getLogger(__name__)
 
@@ -195,6 +195,31 @@ class FunctionsTable:
         except Exception:
             return None
 
+    def get_function_updated_at_by_id(
+        self, id: str, db: Optional[Session] = None
+    ) -> Optional[int]:
+        """Version of a function's content, without loading the content."""
+        try:
+            with get_db_context(db) as db:
+                return db.query(Function.updated_at).filter_by(id=id).scalar()
+        except Exception:
+            return None
+
+    def get_functions_version(self, db: Optional[Session] = None) -> Optional[tuple]:
+        """
+        (count, latest updated_at) of all functions, which changes whenever a
+        function is added, updated or deleted.
+        """
+        try:
+            with get_db_context(db) as db:
+                return tuple(
+                    db.query(
+                        func.count(Function.id), func.max(Function.updated_at)
+                    ).one()
+                )
+        except Exception:
+            return None
+
     def get_functions(
         self, active_only=False, include_valves=False, db: Optional[Session] = None
     ) -> list[FunctionModel | FunctionWithValvesModel]:
@@ -11,7 +11,7 @@ from open_webui.models.channels import Channels, ChannelMember
 
 
 from pydantic import BaseModel, ConfigDict, field_validator
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON
+from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON, Index
 from sqlalchemy import or_, func, select, and_, text
 from sqlalchemy.sql import exists
 
@@ -28,6 +28,8 @@ class MessageReaction(Base):
     name = Column(Text)
     created_at = Column(BigInteger)
 
+    __table_args__ = (Index("message_reaction_message_id_idx", "message_id"),)
+
 
 class MessageReactionModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -61,6 +63,17 @@ class Message(Base):
     created_at = Column(BigInteger)  # time_ns
     updated_at = Column(BigInteger)  # time_ns
 
+    __table_args__ = (
+        Index(
+            "message_channel_id_parent_id_created_at_idx",
+            "channel_id",
+            "parent_id",
+            "created_at",
+        ),
+        Index("message_parent_id_created_at_idx", "parent_id", "created_at"),
+        Index("message_channel_id_created_at_idx", "channel_id", "created_at"),
+    )
+
 
 class MessageModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -170,10 +183,85 @@ class MessageTable:
             result = Message(**message.model_dump())
 
             db.add(result)
+            if not form_data.parent_id:
+                # Maintain the unread counters of the other members in the same
+                # transaction instead of counting messages on every read
+                db.query(ChannelMember).filter(
+                    ChannelMember.channel_id == channel_id,
+                    ChannelMember.user_id != user_id,
+                ).update(
+                    {ChannelMember.unread_count: ChannelMember.unread_count + 1},
+                    synchronize_session=False,
+                )
             db.commit()
             db.refresh(result)
             return MessageModel.model_validate(result) if result else None
 
+    def _get_webhook_user_info(
+        self, message: Message, db: Optional[Session] = None
+    ) -> Optional[dict]:
+        # Webhook info in meta takes precedence over the message user
+        webhook_info = message.meta.get("webhook") if message.meta else None
+        if not (webhook_info and webhook_info.get("id")):
+            return None
+
+        # Look up webhook by ID to get current name
+        webhook = Channels.get_webhook_by_id(webhook_info.get("id"), db=db)
+        if webhook:
+            return {
+                "id": webhook.id,
+                "name": webhook.name,
+                "role": "webhook",
+            }
+
+        # Webhook was deleted, use placeholder
+        return {
+            "id": webhook_info.get("id"),
+            "name": "Deleted Webhook",
+            "role": "webhook",
+        }
+
+    def _get_reply_to_responses(
+        self, all_messages: list[Message], db: Optional[Session] = None
+    ) -> list[MessageReplyToResponse]:
+        with get_db_context(db) as db:
+            # Batch fetch the replied-to messages and their authors
+            reply_to_ids = list(
+                {message.reply_to_id for message in all_messages if message.reply_to_id}
+            )
+            reply_to_messages = {}
+            if reply_to_ids:
+                reply_to_list = (
+                    db.query(Message).filter(Message.id.in_(reply_to_ids)).all()
+                )
+                users = {
+                    user.id: user
+                    for user in Users.get_users_by_user_ids(
+                        list({message.user_id for message in reply_to_list}), db=db
+                    )
+                }
+
+                for reply_to in reply_to_list:
+                    user_info = self._get_webhook_user_info(reply_to, db=db)
+                    if user_info is None and reply_to.user_id in users:
+                        user_info = users[reply_to.user_id].model_dump()
+
+                    reply_to_messages[reply_to.id] = {
+                        **MessageModel.model_validate(reply_to).model_dump(),
+                        "user": user_info,
+                    }
+
+            return [
+                MessageReplyToResponse.model_validate(
+                    {
+                        **MessageModel.model_validate(message).model_dump(),
+                        "user": self._get_webhook_user_info(message, db=db),
+                        "reply_to_message": reply_to_messages.get(message.reply_to_id),
+                    }
+                )
+                for message in all_messages
+            ]
+
     def get_message_by_id(
         self,
         id: str,
@@ -195,29 +283,15 @@ class MessageTable:
 
             reactions = self.get_reactions_by_message_id(id, db=db)
 
-            thread_replies = []
+            thread_reply_stats = {}
             if include_thread_replies:
-                thread_replies = self.get_thread_replies_by_message_id(id, db=db)
-
-            # Check if message was sent by webhook (webhook info in meta takes precedence)
-            webhook_info = message.meta.get("webhook") if message.meta else None
-            if webhook_info and webhook_info.get("id"):
-                # Look up webhook by ID to get current name
-                webhook = Channels.get_webhook_by_id(webhook_info.get("id"), db=db)
-                if webhook:
-                    user_info = {
-                        "id": webhook.id,
-                        "name": webhook.name,
-                        "role": "webhook",
-                    }
-                else:
-                    # Webhook was deleted, use placeholder
-                    user_info = {
-                        "id": webhook_info.get("id"),
-                        "name": "Deleted Webhook",
-                        "role": "webhook",
-                    }
-            else:
+                thread_reply_stats = self.get_thread_reply_stats_by_message_ids(
+                    [id], db=db
+                ).get(id, {})
+
+            # Check if message was sent by webhook
+            user_info = self._get_webhook_user_info(message, db=db)
+            if user_info is None:
                 user = Users.get_user_by_id(message.user_id, db=db)
                 user_info = user.model_dump() if user else None
 
@@ -228,10 +302,8 @@ class MessageTable:
                     "reply_to_message": (
                         reply_to_message.model_dump() if reply_to_message else None
                     ),
-                    "latest_reply_at": (
-                        thread_replies[0].created_at if thread_replies else None
-                    ),
-                    "reply_count": len(thread_replies),
+                    "latest_reply_at": thread_reply_stats.get("latest_reply_at"),
+                    "reply_count": thread_reply_stats.get("reply_count", 0),
                     "reactions": reactions,
                 }
             )
@@ -247,47 +319,33 @@ class MessageTable:
                 .all()
             )
 
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(
-                        message.reply_to_id, include_thread_replies=False, db=db
-                    )
-                    if message.reply_to_id
-                    else None
-                )
+            return self._get_reply_to_responses(all_messages, db=db)
 
-                webhook_info = message.meta.get("webhook") if message.meta else None
-                user_info = None
-                if webhook_info and webhook_info.get("id"):
-                    webhook = Channels.get_webhook_by_id(webhook_info.get("id"), db=db)
-                    if webhook:
-                        user_info = {
-                            "id": webhook.id,
-                            "name": webhook.name,
-                            "role": "webhook",
-                        }
-                    else:
-                        user_info = {
-                            "id": webhook_info.get("id"),
-                            "name": "Deleted Webhook",
-                            "role": "webhook",
-                        }
-
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "user": user_info,
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
-                    )
+    def get_thread_reply_stats_by_message_ids(
+        self, ids: list[str], db: Optional[Session] = None
+    ) -> dict[str, dict]:
+        """
+        Reply count and latest reply timestamp of each message, keyed by message
+        id, in a single aggregate query. Messages without replies are omitted.
+        """
+        if not ids:
+            return {}
+
+        with get_db_context(db) as db:
+            results = (
+                db.query(
+                    Message.parent_id,
+                    func.count(Message.id),
+                    func.max(Message.created_at),
                 )
-            return messages
+                .filter(Message.parent_id.in_(ids))
+                .group_by(Message.parent_id)
+                .all()
+            )
+            return {
+                parent_id: {"reply_count": count, "latest_reply_at": latest_reply_at}
+                for parent_id, count, latest_reply_at in results
+            }
 
     def get_reply_user_ids_by_message_id(
         self, id: str, db: Optional[Session] = None
@@ -315,47 +373,7 @@ class MessageTable:
                 .all()
             )
 
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(
-                        message.reply_to_id, include_thread_replies=False, db=db
-                    )
-                    if message.reply_to_id
-                    else None
-                )
-
-                webhook_info = message.meta.get("webhook") if message.meta else None
-                user_info = None
-                if webhook_info and webhook_info.get("id"):
-                    webhook = Channels.get_webhook_by_id(webhook_info.get("id"), db=db)
-                    if webhook:
-                        user_info = {
-                            "id": webhook.id,
-                            "name": webhook.name,
-                            "role": "webhook",
-                        }
-                    else:
-                        user_info = {
-                            "id": webhook_info.get("id"),
-                            "name": "Deleted Webhook",
-                            "role": "webhook",
-                        }
-
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "user": user_info,
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
-                    )
-                )
-            return messages
+            return self._get_reply_to_responses(all_messages, db=db)
 
     def get_messages_by_parent_id(
         self,
@@ -384,47 +402,7 @@ class MessageTable:
             if len(all_messages) < limit:
                 all_messages.append(message)
 
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(
-                        message.reply_to_id, include_thread_replies=False, db=db
-                    )
-                    if message.reply_to_id
-                    else None
-                )
-
-                webhook_info = message.meta.get("webhook") if message.meta else None
-                user_info = None
-                if webhook_info and webhook_info.get("id"):
-                    webhook = Channels.get_webhook_by_id(webhook_info.get("id"), db=db)
-                    if webhook:
-                        user_info = {
-                            "id": webhook.id,
-                            "name": webhook.name,
-                            "role": "webhook",
-                        }
-                    else:
-                        user_info = {
-                            "id": webhook_info.get("id"),
-                            "name": "Deleted Webhook",
-                            "role": "webhook",
-                        }
-
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "user": user_info,
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
-                    )
-                )
-            return messages
+            return self._get_reply_to_responses(all_messages, db=db)
 
     def get_last_message_by_channel_id(
         self, channel_id: str, db: Optional[Session] = None
@@ -438,6 +416,64 @@ class MessageTable:
             )
             return MessageModel.model_validate(message) if message else None
 
+    def get_channel_summaries_by_user_id(
+        self,
+        user_id: str,
+        channel_ids: list[str],
+        db: Optional[Session] = None,
+    ) -> dict[str, dict]:
+        """
+        Last message timestamp and unread count of each channel for a user, keyed
+        by channel id, in a single query. The last message comes from a
+        correlated index lookup, the unread count from the member counter.
+        """
+        if not channel_ids:
+            return {}
+
+        with get_db_context(db) as db:
+            last_message_at = (
+                select(func.max(Message.created_at))
+                .where(Message.channel_id == ChannelMember.channel_id)
+                .scalar_subquery()
+            )
+            results = (
+                db.query(
+                    ChannelMember.channel_id,
+                    last_message_at,
+                    ChannelMember.unread_count,
+                )
+                .filter(
+                    ChannelMember.user_id == user_id,
+                    ChannelMember.channel_id.in_(channel_ids),
+                )
+                .all()
+            )
+            summaries = {
+                channel_id: {
+                    "last_message_at": last_message_at,
+                    "unread_count": unread_count or 0,
+                }
+                for channel_id, last_message_at, unread_count in results
+            }
+
+            # Channels the user is not a member of have no read marker
+            missing_channel_ids = [
+                channel_id for channel_id in channel_ids if channel_id not in summaries
+            ]
+            if missing_channel_ids:
+                for channel_id, last_message_at in (
+                    db.query(Message.channel_id, func.max(Message.created_at))
+                    .filter(Message.channel_id.in_(missing_channel_ids))
+                    .group_by(Message.channel_id)
+                    .all()
+                ):
+                    summaries[channel_id] = {
+                        "last_message_at": last_message_at,
+                        "unread_count": 0,
+                    }
+
+            return summaries
+
     def get_pinned_messages_by_channel_id(
         self,
         channel_id: str,
@@ -508,6 +544,44 @@ class MessageTable:
                 query = query.filter(Message.user_id != user_id)
             return query.count()
 
+    def reconcile_unread_counts(
+        self, since: Optional[int] = None, db: Optional[Session] = None
+    ) -> int:
+        """
+        Recount the unread counters of channel members from the messages
+        table and fix any that drifted, limited to channels with messages
+        created at or after `since` (time_ns) when given. Returns the number
+        of corrected members.
+        """
+        with get_db_context(db) as db:
+            unread_count = (
+                select(func.count(Message.id))
+                .where(
+                    Message.channel_id == ChannelMember.channel_id,
+                    Message.parent_id.is_(None),  # only count top-level messages
+                    Message.created_at > func.coalesce(ChannelMember.last_read_at, 0),
+                    Message.user_id != ChannelMember.user_id,
+                )
+                .scalar_subquery()
+            )
+            query = db.query(ChannelMember).filter(
+                ChannelMember.unread_count != unread_count
+            )
+            if since is not None:
+                query = query.filter(
+                    ChannelMember.channel_id.in_(
+                        select(Message.channel_id)
+                        .where(Message.created_at >= since)
+                        .distinct()
+                    )
+                )
+            corrected = query.update(
+                {ChannelMember.unread_count: unread_count},
+                synchronize_session=False,
+            )
+            db.commit()
+            return corrected
+
     def add_reaction_to_message(
         self, id: str, user_id: str, name: str, db: Optional[Session] = None
     ) -> Optional[MessageReactionModel]:
@@ -538,34 +612,57 @@ class MessageTable:
     def get_reactions_by_message_id(
         self, id: str, db: Optional[Session] = None
     ) -> list[Reactions]:
+        return self.get_reactions_by_message_ids([id], db=db).get(id, [])
+
+    def get_reactions_by_message_ids(
+        self, ids: list[str], db: Optional[Session] = None
+    ) -> dict[str, list[Reactions]]:
+        """
+        Reactions grouped by name for each message, keyed by message id, in a
+        single query. Messages without reactions are omitted.
+        """
+        if not ids:
+            return {}
+
         with get_db_context(db) as db:
             # JOIN User so all user info is fetched in one query
             results = (
-                db.query(MessageReaction, User)
+                db.query(
+                    MessageReaction.message_id,
+                    MessageReaction.name,
+                    User.id,
+                    User.name,
+                )
                 .join(User, MessageReaction.user_id == User.id)
-                .filter(MessageReaction.message_id == id)
+                .filter(MessageReaction.message_id.in_(ids))
+                .order_by(MessageReaction.created_at)
                 .all()
             )
 
             reactions = {}
-
-            for reaction, user in results:
-                if reaction.name not in reactions:
-                    reactions[reaction.name] = {
-                        "name": reaction.name,
+            for message_id, name, user_id, user_name in results:
+                message_reactions = reactions.setdefault(message_id, {})
+                if name not in message_reactions:
+                    message_reactions[name] = {
+                        "name": name,
                         "users": [],
                         "count": 0,
                     }
 
-                reactions[reaction.name]["users"].append(
+                message_reactions[name]["users"].append(
                     {
-                        "id": user.id,
-                        "name": user.name,
+                        "id": user_id,
+                        "name": user_name,
                     }
                 )
-                reactions[reaction.name]["count"] += 1
+                message_reactions[name]["count"] += 1
 
-            return [Reactions(**reaction) for reaction in reactions.values()]
+            return {
+                message_id: [
+                    Reactions(**reaction) for reaction in message_reactions.values()
+                ]
+                for message_id, message_reactions in reactions.items()
+            }
 
     def remove_reaction_by_id_and_user_id_and_name(
         self, id: str, user_id: str, name: str, db: Optional[Session] = None
@@ -591,6 +688,19 @@ class MessageTable:
 
     def delete_message_by_id(self, id: str, db: Optional[Session] = None) -> bool:
         with get_db_context(db) as db:
+            message = db.get(Message, id)
+            if message and not message.parent_id:
+                # Members that had not read the message yet counted it as unread
+                db.query(ChannelMember).filter(
+                    ChannelMember.channel_id == message.channel_id,
+                    ChannelMember.user_id != message.user_id,
+                    ChannelMember.unread_count > 0,
+                    func.coalesce(ChannelMember.last_read_at, 0) < message.created_at,
+                ).update(
+                    {ChannelMember.unread_count: ChannelMember.unread_count - 1},
+                    synchronize_session=False,
+                )
+
             db.query(Message).filter_by(id=id).delete()
 
             # Delete all reactions to this message
@@ -72,6 +72,19 @@ class ToolModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ToolSpecsModel(BaseModel):
+    """A tool without its source, i.e. what is needed to call it."""
+
+    id: str
+    user_id: str
+    specs: list[dict]
+    valves: Optional[dict] = None
+    access_control: Optional[dict] = None
+    updated_at: int  # timestamp in epoch
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 ####################
 # Forms
 ####################
@@ -155,6 +168,34 @@ class ToolsTable:
         except Exception:
             return None
 
+    def get_tool_updated_at_by_id(
+        self, id: str, db: Optional[Session] = None
+    ) -> Optional[int]:
+        """Version of a tool's content, without loading the content."""
+        try:
+            with get_db_context(db) as db:
+                return db.query(Tool.updated_at).filter_by(id=id).scalar()
+        except Exception:
+            return None
+
+    def get_tool_specs_by_ids(
+        self, ids: list[str], db: Optional[Session] = None
+    ) -> list[ToolSpecsModel]:
+        with get_db_context(db) as db:
+            return [
+                ToolSpecsModel.model_validate(tool)
+                for tool in db.query(
+                    Tool.id,
+                    Tool.user_id,
+                    Tool.specs,
+                    Tool.valves,
+                    Tool.access_control,
+                    Tool.updated_at,
+                )
+                .filter(Tool.id.in_(ids))
+                .all()
+            ]
+
     def get_tools(self, db: Optional[Session] = None) -> list[ToolUserModel]:
         with get_db_context(db) as db:
             all_tools = db.query(Tool).order_by(Tool.updated_at.desc()).all()
@@ -236,6 +277,21 @@ class ToolsTable:
             )
             return None
 
+    def get_user_valves_by_ids_and_user_id(
+        self, ids: list[str], user_id: str, db: Optional[Session] = None
+    ) -> dict[str, dict]:
+        try:
+            user = Users.get_user_by_id(user_id, db=db)
+            user_settings = user.settings.model_dump() if user.settings else {}
+
+            valves = (user_settings.get("tools") or {}).get("valves") or {}
+            return {id: valves.get(id) or {} for id in ids}
+        except Exception as e:
+            log.exception(
+                f"Error getting user values by ids and user_id {user_id}: {e}"
+            )
+            return {}
+
     def update_user_valves_by_id_and_user_id(
         self, id: str, user_id: str, valves: dict, db: Optional[Session] = None
     ) -> Optional[dict]:
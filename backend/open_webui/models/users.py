@@ -743,11 +743,15 @@ class UsersTable:
     def is_user_active(self, user_id: str, db: Optional[Session] = None) -> bool:
         with get_db_context(db) as db:
             user = db.query(User).filter_by(id=user_id).first()
-            if user and user.last_active_at:
-                # Consider user active if last_active_at within the last 3 minutes
-                three_minutes_ago = int(time.time()) - 180
-                return user.last_active_at >= three_minutes_ago
-            return False
+            return self.is_user_model_active(user) if user else False
+
+    def is_user_model_active(self, user) -> bool:
+        """Active status of an already loaded user, without querying the database."""
+        if user.last_active_at:
+            # Consider user active if last_active_at within the last 3 minutes
+            three_minutes_ago = int(time.time()) - 180
+            return user.last_active_at >= three_minutes_ago
+        return False
 
 
 Users = UsersTable()
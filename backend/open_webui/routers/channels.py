@@ -65,7 +65,7 @@ from open_webui.utils.access_control import (
     get_permitted_group_and_user_ids,
     has_permission,
 )
-from open_webui.utils.webhook import post_webhook
+from open_webui.utils.webhook import WEBHOOK_DISPATCHER
 from open_webui.utils.channels import extract_mentions, replace_mentions
 from open_webui.internal.db import get_session
 from sqlalchemy.orm import Session
@@ -118,46 +118,52 @@ async def get_channels(
         )
 
     channels = Channels.get_channels_by_user_id(user.id, db=db)
-    channel_list = []
-    for channel in channels:
-        last_message = Messages.get_last_message_by_channel_id(channel.id, db=db)
-        last_message_at = last_message.created_at if last_message else None
 
-        channel_member = Channels.get_member_by_channel_and_user_id(
-            channel.id, user.id, db=db
+    # Last message and unread count of every channel in one summary query
+    summaries = Messages.get_channel_summaries_by_user_id(
+        user.id, [channel.id for channel in channels], db=db
+    )
+
+    # Batch fetch DM participants and their users
+    dm_members = Channels.get_members_by_channel_ids(
+        [channel.id for channel in channels if channel.type == "dm"], db=db
+    )
+    dm_users = {
+        dm_user.id: UserIdNameStatusResponse(
+            **{
+                **dm_user.model_dump(),
+                "is_active": Users.is_user_model_active(dm_user),
+            }
         )
-        unread_count = (
-            Messages.get_unread_message_count(
-                channel.id, user.id, channel_member.last_read_at, db=db
-            )
-            if channel_member
-            else 0
+        for dm_user in Users.get_users_by_user_ids(
+            list(
+                {
+                    member.user_id
+                    for members in dm_members.values()
+                    for member in members
+                }
+            ),
+            db=db,
         )
+    }
+
+    channel_list = []
+    for channel in channels:
+        summary = summaries.get(channel.id, {})
 
         user_ids = None
         users = None
         if channel.type == "dm":
-            user_ids = [
-                member.user_id
-                for member in Channels.get_members_by_channel_id(channel.id, db=db)
-            ]
-            users = [
-                UserIdNameStatusResponse(
-                    **{
-                        **user.model_dump(),
-                        "is_active": Users.is_user_active(user.id, db=db),
-                    }
-                )
-                for user in Users.get_users_by_user_ids(user_ids, db=db)
-            ]
+            user_ids = [member.user_id for member in dm_members.get(channel.id, [])]
+            users = [dm_users[user_id] for user_id in user_ids if user_id in dm_users]
 
         channel_list.append(
             ChannelListItemResponse(
                 **channel.model_dump(),
                 user_ids=user_ids,
                 users=users,
-                last_message_at=last_message_at,
-                unread_count=unread_count,
+                last_message_at=summary.get("last_message_at"),
+                unread_count=summary.get("unread_count", 0),
             )
         )
 
@@ -389,9 +395,7 @@ async def get_channel_by_id(
         channel_member = Channels.get_member_by_channel_and_user_id(
             channel.id, user.id, db=db
         )
-        unread_count = Messages.get_unread_message_count(
-            channel.id, user.id, channel_member.last_read_at if channel_member else None
-        )
+        unread_count = channel_member.unread_count if channel_member else 0
 
         return ChannelFullResponse(
             **{
@@ -428,9 +432,7 @@ async def get_channel_by_id(
         channel_member = Channels.get_member_by_channel_and_user_id(
             channel.id, user.id, db=db
         )
-        unread_count = Messages.get_unread_message_count(
-            channel.id, user.id, channel_member.last_read_at if channel_member else None
-        )
+        unread_count = channel_member.unread_count if channel_member else 0
 
         return ChannelFullResponse(
             **{
@@ -821,12 +823,16 @@ async def get_channel_messages(
     user_ids = list(set(m.user_id for m in message_list))
     users = {u.id: u for u in Users.get_users_by_user_ids(user_ids, db=db)}
 
+    # Batch fetch reply counts and reactions in one aggregate query each
+    message_ids = [message.id for message in message_list]
+    thread_reply_stats = Messages.get_thread_reply_stats_by_message_ids(
+        message_ids, db=db
+    )
+    reactions = Messages.get_reactions_by_message_ids(message_ids, db=db)
+
     messages = []
     for message in message_list:
-        thread_replies = Messages.get_thread_replies_by_message_id(message.id, db=db)
-        latest_thread_reply_at = (
-            thread_replies[0].created_at if thread_replies else None
-        )
+        stats = thread_reply_stats.get(message.id, {})
 
         # Use message.user if present (for webhooks), otherwise look up by user_id
         user_info = message.user
@@ -837,11 +843,9 @@ async def get_channel_messages(
             MessageUserResponse(
                 **{
                     **message.model_dump(),
-                    "reply_count": len(thread_replies),
-                    "latest_reply_at": latest_thread_reply_at,
-                    "reactions": Messages.get_reactions_by_message_id(
-                        message.id, db=db
-                    ),
+                    "reply_count": stats.get("reply_count", 0),
+                    "latest_reply_at": stats.get("latest_reply_at"),
+                    "reactions": reactions.get(message.id, []),
                     "user": user_info,
                 }
             )
@@ -898,6 +902,10 @@ async def get_pinned_channel_messages(
     user_ids = list(set(m.user_id for m in message_list))
     users = {u.id: u for u in Users.get_users_by_user_ids(user_ids, db=db)}
 
+    reactions = Messages.get_reactions_by_message_ids(
+        [message.id for message in message_list], db=db
+    )
+
     messages = []
     for message in message_list:
         # Check for webhook identity in meta
@@ -917,9 +925,7 @@ async def get_pinned_channel_messages(
             MessageWithReactionsResponse(
                 **{
                     **message.model_dump(),
-                    "reactions": Messages.get_reactions_by_message_id(
-                        message.id, db=db
-                    ),
+                    "reactions": reactions.get(message.id, []),
                     "user": user_info,
                 }
             )
@@ -936,19 +942,35 @@ async def get_pinned_channel_messages(
 async def send_notification(
     name, webui_url, channel, message, active_user_ids, db=None
 ):
-    users = get_users_with_access("read", channel.access_control)
+    # One membership query instead of a membership check per user with access
+    member_user_ids = Channels.get_member_user_ids_by_channel_id(
+        channel.id, db=db
+    ) - set(active_user_ids)
+    if not member_user_ids:
+        return True
 
+    if channel.access_control is None:
+        users = [
+            user
+            for user in Users.get_users_by_user_ids(list(member_user_ids), db=db)
+            if user.role != "pending"
+        ]
+    else:
+        users = [
+            user
+            for user in get_users_with_access("read", channel.access_control, db=db)
+            if user.id in member_user_ids
+        ]
+
+    deliveries = []
     for user in users:
-        if (user.id not in active_user_ids) and Channels.is_user_channel_member(
-            channel.id, user.id, db=db
-        ):
-            if user.settings:
-                webhook_url = user.settings.ui.get("notifications", {}).get(
-                    "webhook_url", None
-                )
-                if webhook_url:
-                    await post_webhook(
-                        name,
+        if user.settings:
+            webhook_url = user.settings.ui.get("notifications", {}).get(
+                "webhook_url", None
+            )
+            if webhook_url:
+                deliveries.append(
+                    (
                         webhook_url,
                         f"#{channel.name} - {webui_url}/channels/{channel.id}\n\n{message.content}",
                         {
@@ -958,7 +980,10 @@ async def send_notification(
                             "url": f"{webui_url}/channels/{channel.id}",
                         },
                     )
+                )
 
+    # Delivered concurrently in the background with retries
+    WEBHOOK_DISPATCHER.dispatch(name, deliveries)
     return True
 
 
@@ -1148,6 +1173,32 @@ async def model_response_handler(request, channel, message, user, db=None):
     return True
 
 
+async def emit_unread_counts(
+    channel_id: str, exclude_user_id: Optional[str] = None, db=None
+):
+    """Push the maintained unread counters of a channel to its members."""
+    user_ids_by_count = {}
+    for user_id, unread_count in Channels.get_member_unread_counts_by_channel_id(
+        channel_id, db=db
+    ).items():
+        if user_id != exclude_user_id:
+            user_ids_by_count.setdefault(unread_count, []).append(user_id)
+
+    # Members with the same count share one payload
+    for unread_count, user_ids in user_ids_by_count.items():
+        await emit_to_users(
+            "events:channel",
+            {
+                "channel_id": channel_id,
+                "data": {
+                    "type": "channel:unread",
+                    "data": {"unread_count": unread_count},
+                },
+            },
+            user_ids,
+        )
+
+
 async def new_message_handler(
     request: Request, id: str, form_data: MessageForm, user, db
 ):
@@ -1203,6 +1254,9 @@ async def new_message_handler(
                 to=f"channel:{channel.id}",
             )
 
+            if not message.parent_id:
+                await emit_unread_counts(channel.id, exclude_user_id=user.id, db=db)
+
             if message.parent_id:
                 # If this message is a reply, emit to the parent message as well
                 parent_message = Messages.get_message_by_id(message.parent_id, db=db)
@@ -1254,13 +1308,14 @@ async def post_new_message(
         except Exception as e:
             log.debug(e)
 
-        active_user_ids = get_user_ids_from_room(f"channel:{channel.id}")
+        active_user_ids = await get_user_ids_from_room(f"channel:{channel.id}")
 
         # NOTE: We intentionally do NOT pass db to background_handler.
         # Background tasks should manage their own short-lived sessions to avoid
         # holding database connections during slow operations (e.g., LLM calls).
         async def background_handler():
-            await model_response_handler(request, channel, message, user)
+            # Notifications are only queued here, so they go out without
+            # waiting for model responses to the message
             await send_notification(
                 request.app.state.WEBUI_NAME,
                 request.app.state.config.WEBUI_URL,
@@ -1268,6 +1323,7 @@ async def post_new_message(
                 message,
                 active_user_ids,
             )
+            await model_response_handler(request, channel, message, user)
 
         background_tasks.add_task(background_handler)
 
@@ -1500,6 +1556,10 @@ async def get_channel_thread_messages(
     user_ids = list(set(m.user_id for m in message_list))
     users = {u.id: u for u in Users.get_users_by_user_ids(user_ids, db=db)}
 
+    reactions = Messages.get_reactions_by_message_ids(
+        [message.id for message in message_list], db=db
+    )
+
     messages = []
     for message in message_list:
         # Use message.user if present (for webhooks), otherwise look up by user_id
@@ -1513,9 +1573,7 @@ async def get_channel_thread_messages(
                     **message.model_dump(),
                     "reply_count": 0,
                     "latest_reply_at": None,
-                    "reactions": Messages.get_reactions_by_message_id(
-                        message.id, db=db
-                    ),
+                    "reactions": reactions.get(message.id, []),
                     "user": user_info,
                 }
             )
@@ -3,11 +3,12 @@ import logging
 from typing import Optional
 from sqlalchemy.orm import Session
 import asyncio
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 
 
-from open_webui.utils.misc import get_message_list
-from open_webui.socket.main import get_event_emitter
+from open_webui.utils.misc import get_message_list, iter_json_array_items
+from open_webui.socket.main import get_event_emitter, emit_to_users
 from open_webui.models.chats import (
     ChatForm,
     ChatImportForm,
@@ -16,6 +17,8 @@ from open_webui.models.chats import (
     ChatResponse,
     Chats,
     ChatTitleIdResponse,
+    ChatSearchResponse,
+    encode_chat_cursor,
     ChatStatsExport,
     AggregateChatStats,
     ChatBody,
@@ -28,7 +31,7 @@ from open_webui.internal.db import get_session
 
 from open_webui.config import ENABLE_ADMIN_CHAT_ACCESS, ENABLE_ADMIN_EXPORT
 from open_webui.constants import ERROR_MESSAGES
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from pydantic import BaseModel
 
 
@@ -39,6 +42,15 @@ log = logging.getLogger(__name__)
 
 router = APIRouter()
 
+
+def set_next_chat_cursor(response: Response, chats: list, limit: int):
+    # A full page may have more after it; hand back where to resume from
+    if len(chats) == limit:
+        last = chats[-1]
+        response.headers["X-Next-Cursor"] = encode_chat_cursor(last.updated_at, last.id)
+    return chats
+
+
 ############################
 # GetChatList
 ############################
@@ -47,18 +59,32 @@ router = APIRouter()
 @router.get("/", response_model=list[ChatTitleIdResponse])
 @router.get("/list", response_model=list[ChatTitleIdResponse])
 def get_session_user_chat_list(
+    response: Response,
     user=Depends(get_verified_user),
     page: Optional[int] = None,
+    cursor: Optional[str] = None,
     include_pinned: Optional[bool] = False,
     include_folders: Optional[bool] = False,
     db: Session = Depends(get_session),
 ):
     try:
-        if page is not None:
+        if cursor is not None:
+            # Keyset pagination: cursor is "<updated_at>:<id>" of the last item seen
+            limit = 60
+            chats = Chats.get_chat_title_id_list_by_user_id(
+                user.id,
+                include_folders=include_folders,
+                include_pinned=include_pinned,
+                cursor=cursor,
+                limit=limit,
+                db=db,
+            )
+            return set_next_chat_cursor(response, chats, limit)
+        elif page is not None:
             limit = 60
             skip = (page - 1) * limit
 
-            return Chats.get_chat_title_id_list_by_user_id(
+            chats = Chats.get_chat_title_id_list_by_user_id(
                 user.id,
                 include_folders=include_folders,
                 include_pinned=include_pinned,
@@ -66,6 +92,7 @@ def get_session_user_chat_list(
                 limit=limit,
                 db=db,
             )
+            return set_next_chat_cursor(response, chats, limit)
         else:
             return Chats.get_chat_title_id_list_by_user_id(
                 user.id,
@@ -631,12 +658,94 @@ async def import_chats(
         )
 
 
+############################
+# ImportChatsStream
+############################
+
+CHAT_IMPORT_BATCH_SIZE = 100
+
+
+@router.post("/import/stream")
+async def import_chats_stream(
+    request: Request,
+    user=Depends(get_verified_user),
+):
+    """
+    Import a chat export sent as the raw JSON array request body. The body is
+    parsed incrementally and chats are inserted in bounded batches, so memory
+    use does not grow with the export size. Progress is pushed to the user's
+    sessions as `events:chat` socket events.
+    """
+    stream = request.stream()
+    pending = b""
+
+    async def read(size: int) -> bytes:
+        nonlocal pending
+        try:
+            while len(pending) < size:
+                pending += await stream.__anext__()
+        except StopAsyncIteration:
+            pass
+        data, pending = pending[:size], pending[size:]
+        return data
+
+    imported = 0
+    skipped = 0
+    bytes_read = 0
+    batch = []
+
+    async def flush():
+        nonlocal imported, batch
+        # The insert is blocking; keep it off the event loop
+        imported += await run_in_threadpool(Chats.insert_chats_batch, user.id, batch)
+        batch = []
+
+        await emit_to_users(
+            "events:chat",
+            {
+                "data": {
+                    "type": "chat:import:progress",
+                    "data": {
+                        "imported": imported,
+                        "skipped": skipped,
+                        "bytes_read": bytes_read,
+                    },
+                }
+            },
+            [user.id],
+        )
+
+    try:
+        async for item, bytes_read in iter_json_array_items(read):
+            try:
+                batch.append(ChatImportForm.model_validate(item))
+            except Exception:
+                skipped += 1
+                continue
+
+            if len(batch) >= CHAT_IMPORT_BATCH_SIZE:
+                await flush()
+
+        if batch:
+            await flush()
+    except Exception as e:
+        log.exception(e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(
+                f"Import stopped after {imported} chats: {e}"
+            ),
+        )
+
+    return {"imported": imported, "skipped": skipped}
+
+
 ############################
 # GetChats
 ############################
 
 
-@router.get("/search", response_model=list[ChatTitleIdResponse])
+@router.get("/search", response_model=list[ChatSearchResponse])
 def search_user_chats(
     text: str,
     page: Optional[int] = None,
@@ -649,12 +758,9 @@ def search_user_chats(
     limit = 60
     skip = (page - 1) * limit
 
-    chat_list = [
-        ChatTitleIdResponse(**chat.model_dump())
-        for chat in Chats.get_chats_by_user_id_and_search_text(
-            user.id, text, skip=skip, limit=limit, db=db
-        )
-    ]
+    chat_list = Chats.search_chat_list_by_user_id(
+        user.id, text, skip=skip, limit=limit, db=db
+    )
 
     # Delete tag if no chat is found
     words = text.strip().split(" ")
@@ -695,7 +801,9 @@ async def get_chats_by_folder_id(
 @router.get("/folder/{folder_id}/list")
 async def get_chat_list_by_folder_id(
     folder_id: str,
+    response: Response,
     page: Optional[int] = 1,
+    cursor: Optional[str] = None,
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
 ):
@@ -703,11 +811,14 @@ async def get_chat_list_by_folder_id(
         limit = 10
         skip = (page - 1) * limit
 
+        chats = Chats.get_chat_title_id_list_by_folder_id_and_user_id(
+            folder_id, user.id, skip=skip, limit=limit, cursor=cursor, db=db
+        )
+        set_next_chat_cursor(response, chats, limit)
+
         return [
             {"title": chat.title, "id": chat.id, "updated_at": chat.updated_at}
-            for chat in Chats.get_chats_by_folder_id_and_user_id(
-                folder_id, user.id, skip=skip, limit=limit, db=db
-            )
+            for chat in chats
         ]
 
     except Exception as e:
@@ -726,10 +837,7 @@ async def get_chat_list_by_folder_id(
 async def get_user_pinned_chats(
     user=Depends(get_verified_user), db: Session = Depends(get_session)
 ):
-    return [
-        ChatTitleIdResponse(**chat.model_dump())
-        for chat in Chats.get_pinned_chats_by_user_id(user.id, db=db)
-    ]
+    return Chats.get_pinned_chat_title_id_list_by_user_id(user.id, db=db)
 
 
 ############################
@@ -824,18 +932,13 @@ async def get_archived_session_user_chat_list(
     if direction:
         filter["direction"] = direction
 
-    chat_list = [
-        ChatTitleIdResponse(**chat.model_dump())
-        for chat in Chats.get_archived_chat_list_by_user_id(
-            user.id,
-            filter=filter,
-            skip=skip,
-            limit=limit,
-            db=db,
-        )
-    ]
-
-    return chat_list
+    return Chats.get_archived_chat_title_id_list_by_user_id(
+        user.id,
+        filter=filter,
+        skip=skip,
+        limit=limit,
+        db=db,
+    )
 
 
 ############################
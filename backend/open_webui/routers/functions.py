@@ -19,7 +19,9 @@ from open_webui.utils.plugin import (
     load_function_module_by_id,
     replace_imports,
     get_function_module_from_cache,
+    publish_plugin_invalidation,
 )
+from open_webui.utils.filter import invalidate_function_valves
 from open_webui.config import CACHE_DIR
 from open_webui.constants import ERROR_MESSAGES
 from fastapi import APIRouter, Depends, HTTPException, Request, status
@@ -281,7 +283,10 @@ async def get_function_by_id(
 
 @router.post("/id/{id}/toggle", response_model=Optional[FunctionModel])
 async def toggle_function_by_id(
-    id: str, user=Depends(get_admin_user), db: Session = Depends(get_session)
+    request: Request,
+    id: str,
+    user=Depends(get_admin_user),
+    db: Session = Depends(get_session),
 ):
     function = Functions.get_function_by_id(id, db=db)
     if function:
@@ -290,6 +295,8 @@ async def toggle_function_by_id(
         )
 
         if function:
+            invalidate_function_valves(id)
+            await publish_plugin_invalidation(request, "function", id)
             return function
         else:
             raise HTTPException(
@@ -310,7 +317,10 @@ async def toggle_function_by_id(
 
 @router.post("/id/{id}/toggle/global", response_model=Optional[FunctionModel])
 async def toggle_global_by_id(
-    id: str, user=Depends(get_admin_user), db: Session = Depends(get_session)
+    request: Request,
+    id: str,
+    user=Depends(get_admin_user),
+    db: Session = Depends(get_session),
 ):
     function = Functions.get_function_by_id(id, db=db)
     if function:
@@ -319,6 +329,8 @@ async def toggle_global_by_id(
         )
 
         if function:
+            invalidate_function_valves(id)
+            await publish_plugin_invalidation(request, "function", id)
             return function
         else:
             raise HTTPException(
@@ -361,9 +373,15 @@ async def update_function_by_id(
         function = Functions.update_function_by_id(id, updated, db=db)
 
         if function_type == "filter" and getattr(function_module, "toggle", None):
-            Functions.update_function_metadata_by_id(id, {"toggle": True}, db=db)
+            function = (
+                Functions.update_function_metadata_by_id(id, {"toggle": True}, db=db)
+                or function
+            )
 
         if function:
+            request.app.state.FUNCTION_VERSIONS[id] = function.updated_at
+            invalidate_function_valves(id)
+            await publish_plugin_invalidation(request, "function", id)
             return function
         else:
             raise HTTPException(
@@ -396,6 +414,8 @@ async def delete_function_by_id(
         FUNCTIONS = request.app.state.FUNCTIONS
         if id in FUNCTIONS:
             del FUNCTIONS[id]
+        invalidate_function_valves(id)
+        await publish_plugin_invalidation(request, "function", id)
 
     return result
 
@@ -483,6 +503,8 @@ async def update_function_valves_by_id(
 
                 valves_dict = valves.model_dump(exclude_unset=True)
                 Functions.update_function_valves_by_id(id, valves_dict, db=db)
+                invalidate_function_valves(id)
+                await publish_plugin_invalidation(request, "function_valves", id)
                 return valves_dict
             except Exception as e:
                 log.exception(f"Error updating function values by id {id}: {e}")
@@ -580,6 +602,8 @@ async def update_function_user_valves_by_id(
                 Functions.update_user_valves_by_id_and_user_id(
                     id, user.id, user_valves_dict, db=db
                 )
+                invalidate_function_valves(id)
+                await publish_plugin_invalidation(request, "function_valves", id)
                 return user_valves_dict
             except Exception as e:
                 log.exception(f"Error updating function user valves by id {id}: {e}")
@@ -14,6 +14,7 @@ from open_webui.utils.task import (
     image_prompt_generation_template,
     autocomplete_generation_template,
     tags_generation_template,
+    background_tasks_generation_template,
     emoji_generation_template,
     moa_response_generation_template,
 )
@@ -28,6 +29,7 @@ from open_webui.config import (
     DEFAULT_TITLE_GENERATION_PROMPT_TEMPLATE,
     DEFAULT_FOLLOW_UP_GENERATION_PROMPT_TEMPLATE,
     DEFAULT_TAGS_GENERATION_PROMPT_TEMPLATE,
+    DEFAULT_BACKGROUND_TASKS_GENERATION_PROMPT_TEMPLATE,
     DEFAULT_IMAGE_PROMPT_GENERATION_PROMPT_TEMPLATE,
     DEFAULT_QUERY_GENERATION_PROMPT_TEMPLATE,
     DEFAULT_AUTOCOMPLETE_GENERATION_PROMPT_TEMPLATE,
@@ -391,6 +393,91 @@ async def generate_chat_tags(
         )
 
 
+@router.post("/background/completions")
+async def generate_background_tasks(
+    request: Request, form_data: dict, user=Depends(get_verified_user)
+):
+    """
+    Generate several of title, tags and follow-ups with a single task model call.
+    `form_data["tasks"]` lists the requested keys ("title", "tags", "follow_ups").
+    """
+
+    enabled = {
+        "title": request.app.state.config.ENABLE_TITLE_GENERATION,
+        "tags": request.app.state.config.ENABLE_TAGS_GENERATION,
+        "follow_ups": request.app.state.config.ENABLE_FOLLOW_UP_GENERATION,
+    }
+    task_keys = [
+        key for key in form_data.get("tasks", []) if key in enabled and enabled[key]
+    ]
+    if not task_keys:
+        return JSONResponse(
+            status_code=status.HTTP_200_OK,
+            content={"detail": "Background task generation is disabled"},
+        )
+
+    if getattr(request.state, "direct", False) and hasattr(request.state, "model"):
+        models = {
+            request.state.model["id"]: request.state.model,
+        }
+    else:
+        models = request.app.state.MODELS
+
+    model_id = form_data["model"]
+    if model_id not in models:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+
+    # Check if the user has a custom task model
+    # If the user has a custom task model, use that model
+    task_model_id = get_task_model_id(
+        model_id,
+        request.app.state.config.TASK_MODEL,
+        request.app.state.config.TASK_MODEL_EXTERNAL,
+        models,
+    )
+
+    log.debug(
+        f"generating {', '.join(task_keys)} using model {task_model_id} for user {user.email} "
+    )
+
+    content = background_tasks_generation_template(
+        DEFAULT_BACKGROUND_TASKS_GENERATION_PROMPT_TEMPLATE,
+        form_data["messages"],
+        task_keys,
+        user,
+    )
+
+    payload = {
+        "model": task_model_id,
+        "messages": [{"role": "user", "content": content}],
+        "stream": False,
+        "metadata": {
+            **(request.state.metadata if hasattr(request.state, "metadata") else {}),
+            "task": str(TASKS.BACKGROUND_TASKS_GENERATION),
+            "task_body": form_data,
+            "chat_id": form_data.get("chat_id", None),
+        },
+    }
+
+    # Process the payload through the pipeline
+    try:
+        payload = await process_pipeline_inlet_filter(request, payload, user, models)
+    except Exception as e:
+        raise e
+
+    try:
+        return await generate_chat_completion(request, form_data=payload, user=user)
+    except Exception as e:
+        log.error("Exception occurred", exc_info=True)
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"detail": "An internal error has occurred."},
+        )
+
+
 @router.post("/image_prompt/completions")
 async def generate_image_prompt(
     request: Request, form_data: dict, user=Depends(get_verified_user)
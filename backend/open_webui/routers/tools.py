@@ -25,6 +25,7 @@ from open_webui.utils.plugin import (
     load_tool_module_by_id,
     replace_imports,
     get_tool_module_from_cache,
+    publish_plugin_invalidation,
 )
 from open_webui.utils.tools import get_tool_specs
 from open_webui.utils.auth import get_admin_user, get_verified_user
@@ -453,6 +454,8 @@ async def update_tools_by_id(
         tools = Tools.update_tool_by_id(id, updated, db=db)
 
         if tools:
+            request.app.state.TOOL_VERSIONS[id] = tools.updated_at
+            await publish_plugin_invalidation(request, "tool", id)
             return tools
         else:
             raise HTTPException(
@@ -501,6 +504,7 @@ async def delete_tools_by_id(
         TOOLS = request.app.state.TOOLS
         if id in TOOLS:
             del TOOLS[id]
+        await publish_plugin_invalidation(request, "tool", id)
 
     return result
 
@@ -7,7 +7,6 @@ import sys
 import time
 from typing import Dict, Set
 from redis import asyncio as aioredis
-import pycrdt as Y
 
 from open_webui.models.users import Users, UserNameResponse
 from open_webui.models.channels import Channels
@@ -24,6 +23,7 @@ from open_webui.config import (
 
 from open_webui.env import (
     VERSION,
+    ENABLE_PUBLIC_ACTIVE_USERS_COUNT,
     ENABLE_WEBSOCKET_SUPPORT,
     WEBSOCKET_MANAGER,
     WEBSOCKET_REDIS_URL,
@@ -37,9 +37,18 @@ from open_webui.env import (
     WEBSOCKET_SERVER_PING_INTERVAL,
     WEBSOCKET_SERVER_LOGGING,
     WEBSOCKET_SERVER_ENGINEIO_LOGGING,
+    WEBSOCKET_SESSION_POOL_TTL,
+    YDOC_COMPACTION_MAX_UPDATES,
+    YDOC_COMPACTION_MAX_BYTES,
 )
 from open_webui.utils.auth import decode_token
-from open_webui.socket.utils import RedisDict, RedisLock, YdocManager
+from open_webui.socket.utils import (
+    UsagePool,
+    AsyncRedisLock,
+    RedisDict,
+    SessionPool,
+    YdocManager,
+)
 from open_webui.tasks import create_task, stop_item_tasks
 from open_webui.utils.redis import get_redis_connection
 from open_webui.utils.access_control import has_access, get_users_with_access
@@ -124,41 +133,50 @@ if WEBSOCKET_MANAGER == "redis":
         redis_cluster=WEBSOCKET_REDIS_CLUSTER,
     )
 
-    SESSION_POOL = RedisDict(
+    SESSION_POOL = SessionPool(
         f"{REDIS_KEY_PREFIX}:session_pool",
-        redis_url=WEBSOCKET_REDIS_URL,
-        redis_sentinels=redis_sentinels,
-        redis_cluster=WEBSOCKET_REDIS_CLUSTER,
+        redis=REDIS,
+        ttl=WEBSOCKET_SESSION_POOL_TTL,
     )
-    USAGE_POOL = RedisDict(
-        f"{REDIS_KEY_PREFIX}:usage_pool",
-        redis_url=WEBSOCKET_REDIS_URL,
-        redis_sentinels=redis_sentinels,
-        redis_cluster=WEBSOCKET_REDIS_CLUSTER,
+    USAGE_POOL = UsagePool(
+        f"{REDIS_KEY_PREFIX}:usage_pool", redis=REDIS, timeout=TIMEOUT_DURATION
     )
 
-    clean_up_lock = RedisLock(
-        redis_url=WEBSOCKET_REDIS_URL,
+    clean_up_lock = AsyncRedisLock(
         lock_name=f"{REDIS_KEY_PREFIX}:usage_cleanup_lock",
         timeout_secs=WEBSOCKET_REDIS_LOCK_TIMEOUT,
-        redis_sentinels=redis_sentinels,
-        redis_cluster=WEBSOCKET_REDIS_CLUSTER,
+        redis=REDIS,
     )
-    aquire_func = clean_up_lock.aquire_lock
-    renew_func = clean_up_lock.renew_lock
-    release_func = clean_up_lock.release_lock
 else:
     MODELS = {}
 
-    SESSION_POOL = {}
-    USAGE_POOL = {}
+    SESSION_POOL = SessionPool(f"{REDIS_KEY_PREFIX}:session_pool")
+    USAGE_POOL = UsagePool(f"{REDIS_KEY_PREFIX}:usage_pool", timeout=TIMEOUT_DURATION)
 
-    aquire_func = release_func = renew_func = lambda: True
+    clean_up_lock = AsyncRedisLock(
+        lock_name=f"{REDIS_KEY_PREFIX}:usage_cleanup_lock",
+        timeout_secs=WEBSOCKET_REDIS_LOCK_TIMEOUT,
+    )
 
 
 YDOC_MANAGER = YdocManager(
     redis=REDIS,
+    binary_redis=(
+        get_redis_connection(
+            redis_url=WEBSOCKET_REDIS_URL,
+            redis_sentinels=get_sentinels_from_env(
+                WEBSOCKET_SENTINEL_HOSTS, WEBSOCKET_SENTINEL_PORT
+            ),
+            redis_cluster=WEBSOCKET_REDIS_CLUSTER,
+            async_mode=True,
+            decode_responses=False,
+        )
+        if REDIS
+        else None
+    ),
     redis_key_prefix=f"{REDIS_KEY_PREFIX}:ydoc:documents",
+    compaction_max_updates=YDOC_COMPACTION_MAX_UPDATES,
+    compaction_max_bytes=YDOC_COMPACTION_MAX_BYTES,
 )
 
 
@@ -168,7 +186,7 @@ async def periodic_usage_pool_cleanup():
         WEBSOCKET_REDIS_LOCK_TIMEOUT / 2, WEBSOCKET_REDIS_LOCK_TIMEOUT
     )
     for attempt in range(max_retries + 1):
-        if aquire_func():
+        if await clean_up_lock.aquire_lock():
             break
         else:
             if attempt < max_retries:
@@ -185,33 +203,18 @@ async def periodic_usage_pool_cleanup():
     log.debug("Running periodic_cleanup")
     try:
         while True:
-            if not renew_func():
+            if not await clean_up_lock.renew_lock():
                 log.error(f"Unable to renew cleanup lock. Exiting usage pool cleanup.")
                 raise Exception("Unable to renew usage pool cleanup lock.")
 
-            now = int(time.time())
-            send_usage = False
-            for model_id, connections in list(USAGE_POOL.items()):
-                # Creating a list of sids to remove if they have timed out
-                expired_sids = [
-                    sid
-                    for sid, details in connections.items()
-                    if now - details["updated_at"] > TIMEOUT_DURATION
-                ]
-
-                for sid in expired_sids:
-                    del connections[sid]
-
-                if not connections:
-                    log.debug(f"Cleaning up model {model_id} from usage pool")
-                    del USAGE_POOL[model_id]
-                else:
-                    USAGE_POOL[model_id] = connections
-
-                send_usage = True
+            expired_model_ids = await USAGE_POOL.cleanup()
+            if expired_model_ids:
+                log.debug(f"Cleaning up models {expired_model_ids} from usage pool")
+                await emit_usage()
+
             await asyncio.sleep(TIMEOUT_DURATION)
     finally:
-        release_func()
+        await clean_up_lock.release_lock()
 
 
 app = socketio.ASGIApp(
@@ -220,12 +223,29 @@ app = socketio.ASGIApp(
 )
 
 
-def get_models_in_use():
+async def periodic_session_pool_refresh():
+    # Refresh well within the TTL so live sessions never expire
+    interval = max(1, WEBSOCKET_SESSION_POOL_TTL // 3)
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await SESSION_POOL.refresh()
+        except Exception as e:
+            log.warning(f"Failed to refresh session pool: {e}")
+
+
+async def get_models_in_use():
     # List models that are currently in use
-    models_in_use = list(USAGE_POOL.keys())
+    models_in_use = await USAGE_POOL.get_models()
     return models_in_use
 
 
+async def emit_usage():
+    # Usage is only visible to everyone when active user counts are public
+    if ENABLE_PUBLIC_ACTIVE_USERS_COUNT:
+        await sio.emit("usage", {"model_ids": await get_models_in_use()})
+
+
 def get_user_id_from_session_pool(sid):
     user = SESSION_POOL.get(sid)
     if user:
@@ -234,7 +254,7 @@ def get_user_id_from_session_pool(sid):
 
 
 def get_session_ids_from_room(room):
-    """Get all session IDs from a specific room."""
+    """Get all session IDs from a specific room, or from a list of rooms."""
     active_session_ids = sio.manager.get_participants(
         namespace="/",
         room=room,
@@ -242,19 +262,9 @@ def get_session_ids_from_room(room):
     return [session_id[0] for session_id in active_session_ids]
 
 
-def get_user_ids_from_room(room):
-    active_session_ids = get_session_ids_from_room(room)
-
-    active_user_ids = list(
-        set(
-            [
-                SESSION_POOL.get(session_id)["id"]
-                for session_id in active_session_ids
-                if SESSION_POOL.get(session_id) is not None
-            ]
-        )
-    )
-    return active_user_ids
+async def get_user_ids_from_room(room):
+    sessions = await SESSION_POOL.get_many(get_session_ids_from_room(room))
+    return list({session["id"] for session in sessions.values()})
 
 
 async def emit_to_users(event: str, data: dict, user_ids: list[str]):
@@ -267,8 +277,11 @@ async def emit_to_users(event: str, data: dict, user_ids: list[str]):
         user_ids (list[str]): The target users' IDs.
     """
     try:
-        for user_id in user_ids:
-            await sio.emit(event, data, room=f"user:{user_id}")
+        rooms = [f"user:{user_id}" for user_id in dict.fromkeys(user_ids)]
+        if rooms:
+            # One emit to all rooms: the packet is encoded once, published
+            # once and sessions in several rooms receive it only once
+            await sio.emit(event, data, room=rooms)
     except Exception as e:
         log.debug(f"Failed to emit event {event} to users {user_ids}: {e}")
 
@@ -281,9 +294,10 @@ async def enter_room_for_users(room: str, user_ids: list[str]):
         user_ids (list[str]): The target user's IDs.
     """
     try:
-        for user_id in user_ids:
-            session_ids = get_session_ids_from_room(f"user:{user_id}")
-            for sid in session_ids:
+        rooms = [f"user:{user_id}" for user_id in dict.fromkeys(user_ids)]
+        if rooms:
+            # Sessions of all users are resolved in a single room lookup
+            for sid in get_session_ids_from_room(rooms):
                 await sio.enter_room(sid, room)
     except Exception as e:
         log.debug(f"Failed to make users {user_ids} join room {room}: {e}")
@@ -292,15 +306,9 @@ async def enter_room_for_users(room: str, user_ids: list[str]):
 @sio.on("usage")
 async def usage(sid, data):
     if sid in SESSION_POOL:
-        model_id = data["model"]
-        # Record the timestamp for the last update
-        current_time = int(time.time())
-
-        # Store the new usage data and task
-        USAGE_POOL[model_id] = {
-            **(USAGE_POOL[model_id] if model_id in USAGE_POOL else {}),
-            sid: {"updated_at": current_time},
-        }
+        # Only announce usage when a model starts being used
+        if await USAGE_POOL.touch(data["model"], sid):
+            await emit_usage()
 
 
 @sio.event
@@ -313,8 +321,8 @@ async def connect(sid, environ, auth):
             user = Users.get_user_by_id(data["id"])
 
         if user:
-            SESSION_POOL[sid] = user.model_dump(
-                exclude=["date_of_birth", "bio", "gender"]
+            await SESSION_POOL.set(
+                sid, user.model_dump(exclude=["date_of_birth", "bio", "gender"])
             )
             await sio.enter_room(sid, f"user:{user.id}")
 
@@ -334,14 +342,17 @@ async def user_join(sid, data):
     if not user:
         return
 
-    SESSION_POOL[sid] = user.model_dump(
-        exclude=[
-            "profile_image_url",
-            "profile_banner_image_url",
-            "date_of_birth",
-            "bio",
-            "gender",
-        ]
+    await SESSION_POOL.set(
+        sid,
+        user.model_dump(
+            exclude=[
+                "profile_image_url",
+                "profile_banner_image_url",
+                "date_of_birth",
+                "bio",
+                "gender",
+            ]
+        ),
     )
 
     await sio.enter_room(sid, f"user:{user.id}")
@@ -448,6 +459,16 @@ async def channel_events(sid, data):
     elif event_type == "last_read_at":
         Channels.update_member_last_read_at(data["channel_id"], user["id"])
 
+        # Clear the unread badge on the user's other sessions
+        await emit_to_users(
+            "events:channel",
+            {
+                "channel_id": data["channel_id"],
+                "data": {"type": "channel:unread", "data": {"unread_count": 0}},
+            },
+            [user["id"]],
+        )
+
 
 @sio.on("ydoc:document:join")
 async def ydoc_document_join(sid, data):
@@ -488,19 +509,18 @@ async def ydoc_document_join(sid, data):
 
         active_session_ids = get_session_ids_from_room(f"doc_{document_id}")
 
-        # Get the Yjs document state
-        ydoc = Y.Doc()
-        updates = await YDOC_MANAGER.get_updates(document_id)
-        for update in updates:
-            ydoc.apply_update(bytes(update))
-
-        # Encode the entire document state as an update
-        state_update = ydoc.get_update()
+        # Encode the document state the client is missing as an update
+        state_vector = data.get("state_vector")
+        state_update, server_state_vector = await YDOC_MANAGER.get_state_update(
+            document_id, bytes(state_vector) if state_vector else None
+        )
         await sio.emit(
             "ydoc:document:state",
             {
                 "document_id": document_id,
-                "state": list(state_update),  # Convert bytes to list for JSON
+                # Sent as Socket.IO binary attachments
+                "state": state_update,
+                "state_vector": server_state_vector,
                 "sessions": active_session_ids,
             },
             room=sid,
@@ -564,20 +584,18 @@ async def yjs_document_state(sid, data):
             log.warning(f"Document {document_id} not found")
             return
 
-        # Get the Yjs document state
-        ydoc = Y.Doc()
-        updates = await YDOC_MANAGER.get_updates(document_id)
-        for update in updates:
-            ydoc.apply_update(bytes(update))
-
-        # Encode the entire document state as an update
-        state_update = ydoc.get_update()
-
+        # Encode the document state the client is missing as an update
+        state_vector = data.get("state_vector")
+        state_update, server_state_vector = await YDOC_MANAGER.get_state_update(
+            document_id, bytes(state_vector) if state_vector else None
+        )
         await sio.emit(
             "ydoc:document:state",
             {
                 "document_id": document_id,
-                "state": list(state_update),  # Convert bytes to list for JSON
+                # Sent as Socket.IO binary attachments
+                "state": state_update,
+                "state_vector": server_state_vector,
                 "sessions": active_session_ids,
             },
             room=sid,
@@ -599,11 +617,12 @@ async def yjs_document_update(sid, data):
 
         user_id = data.get("user_id", sid)
 
-        update = data["update"]  # List of bytes from frontend
+        # Binary attachment, or a list of bytes from older clients
+        update = bytes(data["update"])
 
         await YDOC_MANAGER.append_to_updates(
             document_id=document_id,
-            update=update,  # Convert list of bytes to bytes
+            update=update,
         )
 
         # Broadcast update to all other users in the document
@@ -671,7 +690,7 @@ async def yjs_awareness_update(sid, data):
     try:
         document_id = data["document_id"]
         user_id = data.get("user_id", sid)
-        update = data["update"]
+        update = bytes(data["update"])
 
         # Broadcast awareness update to all other users in the document
         await sio.emit(
@@ -688,8 +707,7 @@ async def yjs_awareness_update(sid, data):
 @sio.event
 async def disconnect(sid):
     if sid in SESSION_POOL:
-        user = SESSION_POOL[sid]
-        del SESSION_POOL[sid]
+        await SESSION_POOL.delete(sid)
         await YDOC_MANAGER.remove_user_from_all_documents(sid)
     else:
         pass
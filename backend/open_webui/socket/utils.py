@@ -1,49 +1,65 @@
 import json
+import time
 import uuid
 from open_webui.utils.redis import get_redis_connection
 from open_webui.env import REDIS_KEY_PREFIX
 from typing import Optional, List, Tuple
 import pycrdt as Y
 
-
-class RedisLock:
-    def __init__(
-        self,
-        redis_url,
-        lock_name,
-        timeout_secs,
-        redis_sentinels=[],
-        redis_cluster=False,
-    ):
-
+# Lock scripts only act while KEYS[1] still holds our lock id (ARGV[1])
+RENEW_LOCK_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("EXPIRE", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+RELEASE_LOCK_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+class AsyncRedisLock:
+    """
+    Lock shared between workers, held in Redis with an expiry. Without a
+    Redis connection the lock is always granted, as there is only one worker
+    to coordinate.
+    """
+
+    def __init__(self, lock_name, timeout_secs, redis=None):
         self.lock_name = lock_name
         self.lock_id = str(uuid.uuid4())
         self.timeout_secs = timeout_secs
         self.lock_obtained = False
-        self.redis = get_redis_connection(
-            redis_url,
-            redis_sentinels,
-            redis_cluster=redis_cluster,
-            decode_responses=True,
-        )
+        self.redis = redis
 
-    def aquire_lock(self):
-        # nx=True will only set this key if it _hasn't_ already been set
-        self.lock_obtained = self.redis.set(
-            self.lock_name, self.lock_id, nx=True, ex=self.timeout_secs
-        )
+    async def aquire_lock(self):
+        if self.redis is None:
+            self.lock_obtained = True
+        else:
+            self.lock_obtained = bool(
+                await self.redis.set(
+                    self.lock_name, self.lock_id, nx=True, ex=self.timeout_secs
+                )
+            )
         return self.lock_obtained
 
-    def renew_lock(self):
-        # xx=True will only set this key if it _has_ already been set
-        return self.redis.set(
-            self.lock_name, self.lock_id, xx=True, ex=self.timeout_secs
+    async def renew_lock(self):
+        if self.redis is None:
+            return True
+        return bool(
+            await self.redis.eval(
+                RENEW_LOCK_SCRIPT, 1, self.lock_name, self.lock_id, self.timeout_secs
+            )
         )
 
-    def release_lock(self):
-        lock_value = self.redis.get(self.lock_name)
-        if lock_value and lock_value == self.lock_id:
-            self.redis.delete(self.lock_name)
+    async def release_lock(self):
+        self.lock_obtained = False
+        if self.redis is not None:
+            await self.redis.eval(RELEASE_LOCK_SCRIPT, 1, self.lock_name, self.lock_id)
 
 
 class RedisDict:
@@ -117,45 +133,355 @@ class RedisDict:
         return self[key]
 
 
+class UsagePool:
+    """
+    Tracks which sessions are using which models.
+
+    Every model has a sorted set of session ids scored by their last usage
+    heartbeat, and a registry sorted set holds the latest heartbeat of each
+    model. Listing the models in use and expiring sessions are then range
+    queries rather than scans over every session.
+    """
+
+    def __init__(self, name: str, redis=None, timeout: int = 3):
+        self.name = name
+        self.models_name = f"{name}:models"
+        self.timeout = timeout
+        self._redis = redis
+        self._local_models = {}
+        self._local_sessions = {}
+
+    def _model_key(self, model_id: str) -> str:
+        return f"{self.name}:model:{model_id}"
+
+    async def touch(self, model_id: str, sid: str) -> bool:
+        """
+        Record a usage heartbeat, returns True if the model was not in use.
+        """
+        now = time.time()
+        if self._redis:
+            pipe = self._redis.pipeline()
+            pipe.zscore(self.models_name, model_id)
+            pipe.zadd(self._model_key(model_id), {sid: now})
+            pipe.zadd(self.models_name, {model_id: now})
+            last_seen, _, _ = await pipe.execute()
+        else:
+            last_seen = self._local_models.get(model_id)
+            self._local_sessions.setdefault(model_id, {})[sid] = now
+            self._local_models[model_id] = now
+
+        return last_seen is None or now - float(last_seen) > self.timeout
+
+    async def get_models(self) -> List[str]:
+        cutoff = time.time() - self.timeout
+        if self._redis:
+            return list(
+                await self._redis.zrangebyscore(self.models_name, cutoff, "+inf")
+            )
+        return [
+            model_id
+            for model_id, last_seen in self._local_models.items()
+            if last_seen >= cutoff
+        ]
+
+    async def cleanup(self) -> List[str]:
+        """
+        Expire stale sessions and drop models no session uses anymore,
+        returns the ids of the dropped models.
+        """
+        cutoff = time.time() - self.timeout
+        if self._redis:
+            model_ids = await self._redis.zrange(self.models_name, 0, -1)
+            expired_model_ids = await self._redis.zrangebyscore(
+                self.models_name, "-inf", f"({cutoff}"
+            )
+
+            pipe = self._redis.pipeline()
+            for model_id in model_ids:
+                pipe.zremrangebyscore(self._model_key(model_id), "-inf", f"({cutoff}")
+            if expired_model_ids:
+                pipe.zrem(self.models_name, *expired_model_ids)
+            await pipe.execute()
+            return list(expired_model_ids)
+
+        expired_model_ids = []
+        for model_id, sessions in list(self._local_sessions.items()):
+            for sid, last_seen in list(sessions.items()):
+                if last_seen < cutoff:
+                    del sessions[sid]
+            if not sessions:
+                del self._local_sessions[model_id]
+                del self._local_models[model_id]
+                expired_model_ids.append(model_id)
+        return expired_model_ids
+
+
+class SessionPool:
+    """
+    Registry of Socket.IO sessions.
+
+    Sessions are served from a local mirror on the worker that owns them. With
+    Redis the pool is written through to a hash so other workers can resolve
+    sessions with a single HMGET. Each worker periodically extends the expiry
+    of its own sessions, so sessions left behind by a worker that went away
+    are dropped after `ttl` seconds.
+    """
+
+    def __init__(self, name: str, redis=None, ttl: int = 120):
+        self.name = name
+        self.expiry_name = f"{name}:expiry"
+        self.ttl = ttl
+        self._redis = redis
+        self._local = {}
+
+    def __contains__(self, sid):
+        return sid in self._local
+
+    def __getitem__(self, sid):
+        return self._local[sid]
+
+    def __len__(self):
+        return len(self._local)
+
+    def get(self, sid, default=None):
+        return self._local.get(sid, default)
+
+    async def set(self, sid: str, session: dict):
+        self._local[sid] = session
+        if self._redis:
+            pipe = self._redis.pipeline()
+            pipe.hset(self.name, sid, json.dumps(session))
+            pipe.zadd(self.expiry_name, {sid: time.time() + self.ttl})
+            await pipe.execute()
+
+    async def delete(self, sid: str):
+        self._local.pop(sid, None)
+        if self._redis:
+            pipe = self._redis.pipeline()
+            pipe.hdel(self.name, sid)
+            pipe.zrem(self.expiry_name, sid)
+            await pipe.execute()
+
+    async def get_many(self, sids: List[str]) -> dict:
+        """
+        Resolve sessions by id, reading the ones not owned by this worker
+        from Redis in one round trip. Unknown sessions are left out.
+        """
+        sessions = {sid: self._local[sid] for sid in sids if sid in self._local}
+
+        missing = list(dict.fromkeys(sid for sid in sids if sid not in sessions))
+        if missing and self._redis:
+            values = await self._redis.hmget(self.name, missing)
+            for sid, value in zip(missing, values):
+                if value is not None:
+                    sessions[sid] = json.loads(value)
+
+        return sessions
+
+    async def refresh(self):
+        """
+        Extend the expiry of the local sessions and drop expired sessions.
+        """
+        if not self._redis:
+            return
+
+        now = time.time()
+        if self._local:
+            await self._redis.zadd(
+                self.expiry_name, {sid: now + self.ttl for sid in self._local}
+            )
+
+        expired = await self._redis.zrangebyscore(self.expiry_name, "-inf", now)
+        if expired:
+            pipe = self._redis.pipeline()
+            pipe.hdel(self.name, *expired)
+            pipe.zrem(self.expiry_name, *expired)
+            await pipe.execute()
+
+
+def decode_ydoc_update(value) -> bytes:
+    """
+    Decode a Yjs update read from Redis, accepting the legacy encoding as a
+    JSON list of integers.
+    """
+    if isinstance(value, str):
+        return bytes(json.loads(value))
+
+    if value[:1] == b"[" and value[-1:] == b"]":
+        try:
+            return bytes(json.loads(value))
+        except (ValueError, TypeError):
+            pass
+    return bytes(value)
+
+
 class YdocManager:
+    """
+    Stores Yjs documents as a compacted snapshot plus the updates received
+    since. Once the pending updates exceed `compaction_max_updates` or
+    `compaction_max_bytes` they are merged into the snapshot, so joining a
+    document replays a bounded number of updates.
+
+    Updates are stored as raw bytes through `binary_redis`, a connection
+    opened with decode_responses=False.
+    """
+
     def __init__(
         self,
         redis=None,
         redis_key_prefix: str = f"{REDIS_KEY_PREFIX}:ydoc:documents",
+        compaction_max_updates: int = 500,
+        compaction_max_bytes: int = 1024 * 1024,
+        binary_redis=None,
     ):
         self._updates = {}
+        self._snapshots = {}
+        self._sizes = {}
         self._users = {}
         self._redis = redis
+        self._binary_redis = binary_redis if binary_redis is not None else redis
         self._redis_key_prefix = redis_key_prefix
+        self._compaction_max_updates = compaction_max_updates
+        self._compaction_max_bytes = compaction_max_bytes
+
+    def _should_compact(self, count: int, size: int) -> bool:
+        return (
+            self._compaction_max_updates > 0 and count >= self._compaction_max_updates
+        ) or (self._compaction_max_bytes > 0 and size >= self._compaction_max_bytes)
 
     async def append_to_updates(self, document_id: str, update: bytes):
         document_id = document_id.replace(":", "_")
+        update = bytes(update)
         if self._redis:
             redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            await self._redis.rpush(redis_key, json.dumps(list(update)))
+            redis_size_key = f"{self._redis_key_prefix}:{document_id}:size"
+
+            pipe = self._binary_redis.pipeline()
+            pipe.rpush(redis_key, update)
+            pipe.incrby(redis_size_key, len(update))
+            count, size = await pipe.execute()
         else:
             if document_id not in self._updates:
                 self._updates[document_id] = []
             self._updates[document_id].append(update)
+            self._sizes[document_id] = self._sizes.get(document_id, 0) + len(update)
+            count, size = len(self._updates[document_id]), self._sizes[document_id]
+
+        if self._should_compact(count, int(size)):
+            await self.compact_document(document_id)
 
     async def get_updates(self, document_id: str) -> List[bytes]:
+        """
+        Return the snapshot (if any) followed by the pending updates.
+        """
         document_id = document_id.replace(":", "_")
 
         if self._redis:
             redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            updates = await self._redis.lrange(redis_key, 0, -1)
-            return [bytes(json.loads(update)) for update in updates]
+            redis_snapshot_key = f"{self._redis_key_prefix}:{document_id}:snapshot"
+
+            # Read the updates before the snapshot: a compaction in between
+            # only yields updates twice (a no-op in Yjs), never loses them
+            updates = await self._binary_redis.lrange(redis_key, 0, -1)
+            snapshot = await self._binary_redis.get(redis_snapshot_key)
+
+            updates = [decode_ydoc_update(update) for update in updates]
+            if snapshot:
+                updates.insert(0, decode_ydoc_update(snapshot))
+            return updates
         else:
-            return self._updates.get(document_id, [])
+            updates = list(self._updates.get(document_id, []))
+            if document_id in self._snapshots:
+                updates.insert(0, self._snapshots[document_id])
+            return updates
+
+    async def get_document(self, document_id: str) -> Y.Doc:
+        ydoc = Y.Doc()
+        for update in await self.get_updates(document_id):
+            ydoc.apply_update(bytes(update))
+        return ydoc
+
+    async def get_state_update(
+        self, document_id: str, state_vector: Optional[bytes] = None
+    ) -> Tuple[bytes, bytes]:
+        """
+        Encode the document as an update, limited to what a client with
+        `state_vector` is missing, together with the server state vector.
+        """
+        ydoc = await self.get_document(document_id)
+        return ydoc.get_update(state_vector or None), ydoc.get_state()
+
+    async def compact_document(self, document_id: str):
+        """
+        Merge the snapshot and the pending updates into a new snapshot.
+        """
+        document_id = document_id.replace(":", "_")
+
+        if self._redis:
+            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
+            redis_snapshot_key = f"{self._redis_key_prefix}:{document_id}:snapshot"
+            redis_size_key = f"{self._redis_key_prefix}:{document_id}:size"
+            redis_lock_key = f"{self._redis_key_prefix}:{document_id}:compaction"
+
+            lock = AsyncRedisLock(redis_lock_key, 30, self._redis)
+            if not await lock.aquire_lock():
+                # Another worker is already compacting this document
+                return
+
+            try:
+                updates = await self._binary_redis.lrange(redis_key, 0, -1)
+                if not updates:
+                    return
+                snapshot = await self._binary_redis.get(redis_snapshot_key)
+
+                ydoc = Y.Doc()
+                if snapshot:
+                    ydoc.apply_update(decode_ydoc_update(snapshot))
+                compacted_size = 0
+                for update in updates:
+                    update = decode_ydoc_update(update)
+                    compacted_size += len(update)
+                    ydoc.apply_update(update)
+
+                # Write the snapshot before trimming so readers never miss
+                # the compacted updates, updates appended meanwhile are kept
+                await self._binary_redis.set(redis_snapshot_key, ydoc.get_update())
+                pipe = self._binary_redis.pipeline()
+                pipe.ltrim(redis_key, len(updates), -1)
+                pipe.decrby(redis_size_key, compacted_size)
+                _, size = await pipe.execute()
+                if size < 0:
+                    # Updates stored before sizes were tracked
+                    await self._binary_redis.set(redis_size_key, 0)
+            finally:
+                await lock.release_lock()
+        else:
+            updates = self._updates.get(document_id)
+            if not updates:
+                return
+
+            ydoc = Y.Doc()
+            if document_id in self._snapshots:
+                ydoc.apply_update(self._snapshots[document_id])
+            for update in updates:
+                ydoc.apply_update(bytes(update))
+
+            self._snapshots[document_id] = ydoc.get_update()
+            self._updates[document_id] = []
+            self._sizes[document_id] = 0
 
     async def document_exists(self, document_id: str) -> bool:
         document_id = document_id.replace(":", "_")
 
         if self._redis:
             redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            return await self._redis.exists(redis_key) > 0
+            redis_snapshot_key = f"{self._redis_key_prefix}:{document_id}:snapshot"
+            return (
+                await self._redis.exists(redis_key) > 0
+                or await self._redis.exists(redis_snapshot_key) > 0
+            )
         else:
-            return document_id in self._updates
+            return document_id in self._updates or document_id in self._snapshots
 
     async def get_users(self, document_id: str) -> List[str]:
         document_id = document_id.replace(":", "_")
@@ -216,12 +542,13 @@ class YdocManager:
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            await self._redis.delete(redis_key)
-            redis_users_key = f"{self._redis_key_prefix}:{document_id}:users"
-            await self._redis.delete(redis_users_key)
+            for suffix in ("updates", "snapshot", "size", "users"):
+                await self._redis.delete(
+                    f"{self._redis_key_prefix}:{document_id}:{suffix}"
+                )
         else:
-            if document_id in self._updates:
-                del self._updates[document_id]
+            self._updates.pop(document_id, None)
+            self._snapshots.pop(document_id, None)
+            self._sizes.pop(document_id, None)
             if document_id in self._users:
                 del self._users[document_id]
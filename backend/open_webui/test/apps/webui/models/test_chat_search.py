@@ -0,0 +1,119 @@
+import time
+import uuid
+
+import pytest
+
+import open_webui.config  # noqa: F401, applies the database migrations
+from open_webui.internal.db import get_db_context
+from open_webui.models.chat_search import ChatSearch, ChatSearches, ChatSearchTable
+from open_webui.models.chats import Chat
+
+
+def make_chat(title: str, messages: dict[str, str]) -> dict:
+    return {
+        "title": title,
+        "history": {
+            "messages": {
+                message_id: {"id": message_id, "content": content}
+                for message_id, content in messages.items()
+            }
+        },
+    }
+
+
+@pytest.fixture(params=["sqlite", "like"])
+def backend(request, monkeypatch):
+    # Both run on the SQLite test database, "like" skips the FTS5 index
+    monkeypatch.setattr(ChatSearchTable, "_backends", {"sqlite": request.param})
+    return request.param
+
+
+class TestChatSearch:
+    def setup_method(self):
+        self.user_id = str(uuid.uuid4())
+        self.chat_id = str(uuid.uuid4())
+
+        now = int(time.time())
+        with get_db_context() as db:
+            db.add(
+                Chat(
+                    id=self.chat_id,
+                    user_id=self.user_id,
+                    title="Release planning",
+                    chat={},
+                    created_at=now,
+                    updated_at=now,
+                )
+            )
+            db.commit()
+
+    def get_rows(self) -> dict:
+        with get_db_context() as db:
+            return {
+                row.message_id: (row.id, row.content)
+                for row in db.query(ChatSearch).filter_by(chat_id=self.chat_id)
+            }
+
+    def search(self, *terms: str, user_id: str = None) -> list[str]:
+        with get_db_context() as db:
+            subquery = ChatSearches.get_match_subquery(
+                db, user_id or self.user_id, list(terms)
+            )
+            return [row.chat_id for row in db.query(subquery.c.chat_id).all()]
+
+    def test_sync_chat_only_rewrites_changed_rows(self):
+        ChatSearches.sync_chat(
+            self.chat_id,
+            self.user_id,
+            make_chat("Release planning", {"m1": "first", "m2": "second"}),
+        )
+        rows = self.get_rows()
+        assert {key: content for key, (_, content) in rows.items()} == {
+            None: "Release planning",
+            "m1": "first",
+            "m2": "second",
+        }
+
+        ChatSearches.sync_chat(
+            self.chat_id,
+            self.user_id,
+            make_chat("Release planning", {"m1": "first, edited"}),
+        )
+        synced = self.get_rows()
+        assert set(synced) == {None, "m1"}
+        assert synced[None] == rows[None]
+        assert synced["m1"] == (rows["m1"][0], "first, edited")
+
+    def test_upsert_message(self):
+        ChatSearches.upsert_message(self.chat_id, self.user_id, "m1", "draft")
+        ChatSearches.upsert_message(self.chat_id, self.user_id, "m1", "final")
+        ChatSearches.upsert_message(self.chat_id, self.user_id, "m2", "")
+        assert {key: content for key, (_, content) in self.get_rows().items()} == {
+            "m1": "final"
+        }
+
+        # Emptied messages drop out of the index
+        ChatSearches.upsert_message(self.chat_id, self.user_id, "m1", "")
+        assert self.get_rows() == {}
+
+    def test_search_matches_word_prefixes(self, backend):
+        ChatSearches.sync_chat(
+            self.chat_id,
+            self.user_id,
+            make_chat(
+                "Release planning",
+                {"m1": "The deployment failed on staging", "m2": "Rollback done"},
+            ),
+        )
+
+        assert self.search("deploy") == [self.chat_id]
+        assert self.search("DEPLOYMENT", "staging") == [self.chat_id]
+        assert self.search("release") == [self.chat_id]
+        # Terms only match at the start of a word
+        assert self.search("ploy") == []
+        # All terms have to appear in the same entry
+        assert self.search("deploy", "rollback") == []
+        assert self.search("deploy", user_id=str(uuid.uuid4())) == []
+
+        snippets = ChatSearches.get_snippets(self.user_id, [self.chat_id], ["deploy"])
+        assert "**deploy" in snippets[self.chat_id].lower()
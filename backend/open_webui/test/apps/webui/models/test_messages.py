@@ -0,0 +1,197 @@
+import time
+import uuid
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+import open_webui.config  # noqa: F401, applies the database migrations
+from open_webui.internal.db import engine, get_db_context
+from open_webui.models.channels import ChannelMember, Channels
+from open_webui.models.messages import (
+    Message,
+    MessageForm,
+    MessageReaction,
+    Messages,
+)
+from open_webui.models.users import User
+
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+class TestMessageBatchQueries:
+    def setup_class(cls):
+        cls.channel_id = str(uuid.uuid4())
+        cls.user_id = str(uuid.uuid4())
+        cls.message_ids = [str(uuid.uuid4()) for _ in range(20)]
+
+        now = time.time_ns()
+        # read up to and including message 9
+        cls.read_at = now + 9
+        cls.last_message_at = now + 1000 + len(cls.message_ids) - 2
+        with get_db_context() as db:
+            db.add(
+                User(
+                    id=cls.user_id,
+                    name="Reactor",
+                    email=f"{cls.user_id}@example.com",
+                    role="user",
+                    profile_image_url="",
+                    last_active_at=0,
+                    updated_at=0,
+                    created_at=0,
+                )
+            )
+            for index, message_id in enumerate(cls.message_ids):
+                db.add(
+                    Message(
+                        id=message_id,
+                        user_id=cls.user_id,
+                        channel_id=cls.channel_id,
+                        content=f"message {index}",
+                        created_at=now + index,
+                        updated_at=now + index,
+                    )
+                )
+                # message i gets i replies and one reaction per even message
+                for reply in range(index):
+                    db.add(
+                        Message(
+                            id=str(uuid.uuid4()),
+                            user_id=cls.user_id,
+                            channel_id=cls.channel_id,
+                            parent_id=message_id,
+                            content="reply",
+                            created_at=now + 1000 + reply,
+                            updated_at=now + 1000 + reply,
+                        )
+                    )
+                if index % 2 == 0:
+                    db.add(
+                        MessageReaction(
+                            id=str(uuid.uuid4()),
+                            user_id=cls.user_id,
+                            message_id=message_id,
+                            name="thumbsup",
+                            created_at=now,
+                        )
+                    )
+            db.commit()
+
+    def test_thread_reply_stats_single_query(self):
+        with count_queries() as statements:
+            stats = Messages.get_thread_reply_stats_by_message_ids(self.message_ids)
+
+        assert len(statements) == 1
+        assert self.message_ids[0] not in stats
+        assert stats[self.message_ids[5]]["reply_count"] == 5
+        assert stats[self.message_ids[5]]["latest_reply_at"] == max(
+            reply.created_at
+            for reply in Messages.get_thread_replies_by_message_id(self.message_ids[5])
+        )
+
+    def test_reactions_single_query(self):
+        with count_queries() as statements:
+            reactions = Messages.get_reactions_by_message_ids(self.message_ids)
+
+        assert len(statements) == 1
+        assert len(reactions) == 10
+        assert reactions[self.message_ids[0]][0].count == 1
+        assert reactions[self.message_ids[0]][0].users[0]["name"] == "Reactor"
+        assert self.message_ids[1] not in reactions
+
+    def test_empty_ids_skip_queries(self):
+        with count_queries() as statements:
+            assert Messages.get_thread_reply_stats_by_message_ids([]) == {}
+            assert Messages.get_reactions_by_message_ids([]) == {}
+
+        assert statements == []
+
+    def test_channel_summaries_single_query(self):
+        other_channel_id = str(uuid.uuid4())
+        with get_db_context() as db:
+            db.add(
+                ChannelMember(
+                    id=str(uuid.uuid4()),
+                    channel_id=self.channel_id,
+                    user_id="reader",
+                    is_active=True,
+                    last_read_at=self.read_at,
+                    joined_at=0,
+                    created_at=0,
+                    updated_at=0,
+                )
+            )
+            db.add(
+                ChannelMember(
+                    id=str(uuid.uuid4()),
+                    channel_id=other_channel_id,
+                    user_id="reader",
+                    is_active=True,
+                    joined_at=0,
+                    created_at=0,
+                    updated_at=0,
+                )
+            )
+            db.commit()
+
+        # Rows were inserted directly, bring the maintained counters in line
+        assert Messages.reconcile_unread_counts() >= 1
+
+        with count_queries() as statements:
+            summaries = Messages.get_channel_summaries_by_user_id(
+                "reader", [self.channel_id, other_channel_id]
+            )
+
+        assert len(statements) == 1
+        # top-level messages newer than the read marker, replies excluded
+        assert summaries[self.channel_id]["unread_count"] == 10
+        assert summaries[self.channel_id]["last_message_at"] == self.last_message_at
+        assert summaries[other_channel_id] == {
+            "last_message_at": None,
+            "unread_count": 0,
+        }
+
+    def test_unread_counters_maintained(self):
+        channel_id = str(uuid.uuid4())
+        Channels.join_channel(channel_id, "author")
+        Channels.join_channel(channel_id, "reader")
+
+        for _ in range(3):
+            Messages.insert_new_message(
+                MessageForm(content="hello"), channel_id, "author"
+            )
+        top_level = Messages.insert_new_message(
+            MessageForm(content="last"), channel_id, "author"
+        )
+        reply = Messages.insert_new_message(
+            MessageForm(content="reply", parent_id=top_level.id),
+            channel_id,
+            "author",
+        )
+
+        counts = Channels.get_member_unread_counts_by_channel_id(channel_id)
+        assert counts == {"author": 0, "reader": 4}
+
+        Messages.delete_message_by_id(top_level.id)
+        Messages.delete_message_by_id(reply.id)
+        assert (
+            Channels.get_member_unread_counts_by_channel_id(channel_id)["reader"] == 3
+        )
+
+        Channels.update_member_last_read_at(channel_id, "reader")
+        assert (
+            Channels.get_member_unread_counts_by_channel_id(channel_id)["reader"] == 0
+        )
+        assert Messages.reconcile_unread_counts() == 0
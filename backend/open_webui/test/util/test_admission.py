@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from open_webui.utils.admission import (
+    AdmissionController,
+    AdmissionTimeoutError,
+    PRIORITY_HIGH,
+    PRIORITY_NORMAL,
+)
+
+
+class TestAdmissionController:
+    @pytest.mark.asyncio
+    async def test_disabled_admits_everything(self):
+        controller = AdmissionController()
+        releases = [await controller.acquire("m", "u") for _ in range(10)]
+        for release in releases:
+            release()
+        assert controller.get_stats()["queued"] == 0
+
+    @pytest.mark.asyncio
+    async def test_per_model_limit_times_out(self):
+        controller = AdmissionController(max_per_model=1, max_wait=0.05)
+        release = await controller.acquire("m", "u1")
+
+        with pytest.raises(AdmissionTimeoutError) as exc:
+            await controller.acquire("m", "u2")
+        assert exc.value.retry_after >= 1
+
+        # Other models are unaffected
+        other = await controller.acquire("other", "u2")
+        other()
+        release()
+
+    @pytest.mark.asyncio
+    async def test_per_user_limit(self):
+        controller = AdmissionController(max_per_user=1, max_wait=0.05)
+        release = await controller.acquire("m1", "u")
+
+        with pytest.raises(AdmissionTimeoutError):
+            await controller.acquire("m2", "u")
+
+        release()
+        (await controller.acquire("m2", "u"))()
+
+    @pytest.mark.asyncio
+    async def test_release_is_idempotent(self):
+        controller = AdmissionController(max_per_model=1, max_wait=0.05)
+        release = await controller.acquire("m", "u")
+        release()
+        release()
+        assert controller.get_stats()["models"] == {}
+
+    @pytest.mark.asyncio
+    async def test_priority_waiters_admitted_first(self):
+        controller = AdmissionController(max_per_model=1, max_wait=1)
+        release = await controller.acquire("m", "holder")
+
+        order = []
+        positions = {}
+
+        async def waiter(name, priority):
+            async def on_queued(position):
+                positions[name] = position
+
+            handle = await controller.acquire(
+                "m", name, priority=priority, on_queued=on_queued
+            )
+            order.append(name)
+            handle()
+
+        normal = asyncio.create_task(waiter("normal", PRIORITY_NORMAL))
+        await asyncio.sleep(0)
+        high = asyncio.create_task(waiter("admin", PRIORITY_HIGH))
+        await asyncio.sleep(0)
+
+        assert positions == {"normal": 1, "admin": 1}
+
+        release()
+        await asyncio.gather(normal, high)
+        assert order == ["admin", "normal"]
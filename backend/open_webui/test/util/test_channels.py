@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+from open_webui.utils import channels as channels_utils
+from open_webui.utils.channels import periodic_unread_count_reconciliation
+
+
+async def run_passes(monkeypatch, passes: int, **kwargs) -> list:
+    calls = []
+    done = asyncio.Event()
+
+    def reconcile_unread_counts(since=None):
+        calls.append(since)
+        if len(calls) == passes:
+            done.set()
+        return 0
+
+    monkeypatch.setattr(
+        channels_utils.Messages, "reconcile_unread_counts", reconcile_unread_counts
+    )
+
+    task = asyncio.create_task(periodic_unread_count_reconciliation(0.01, **kwargs))
+    try:
+        await asyncio.wait_for(done.wait(), 5)
+    finally:
+        task.cancel()
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_unread_reconciliation_covers_new_messages(monkeypatch):
+    calls = await run_passes(monkeypatch, 3, full_interval=3600)
+
+    # The first pass covers every channel, later ones only recent messages
+    assert calls[0] is None
+    assert all(since is not None for since in calls[1:])
+    assert calls[1] < calls[2]
+
+
+@pytest.mark.asyncio
+async def test_unread_reconciliation_covers_every_channel_periodically(monkeypatch):
+    calls = await run_passes(monkeypatch, 3, full_interval=0)
+    assert calls == [None, None, None]
@@ -0,0 +1,201 @@
+import asyncio
+import contextlib
+import io
+import json
+import uuid
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from open_webui.utils.code_interpreter import JupyterKernelPool
+
+
+class FakeJupyter:
+    """
+    Enough of the jupyter server REST and kernel channel API to run code,
+    with each kernel holding its own namespace.
+    """
+
+    def __init__(self):
+        self.kernels = {}
+        self.started = 0
+        self.start_status = None
+
+        self.app = web.Application()
+        self.app.router.add_post("/api/kernels", self.start_kernel)
+        self.app.router.add_delete("/api/kernels/{id}", self.shutdown_kernel)
+        self.app.router.add_post("/api/kernels/{id}/interrupt", self.interrupt)
+        self.app.router.add_get("/api/kernels/{id}/channels", self.channels)
+
+    async def start_kernel(self, request):
+        if self.start_status is not None:
+            return web.Response(status=self.start_status)
+        kernel_id = uuid.uuid4().hex
+        self.kernels[kernel_id] = {}
+        self.started += 1
+        return web.json_response({"id": kernel_id})
+
+    async def shutdown_kernel(self, request):
+        self.kernels.pop(request.match_info["id"], None)
+        return web.Response(status=204)
+
+    async def interrupt(self, request):
+        return web.Response(status=204)
+
+    async def channels(self, request):
+        namespace = self.kernels.get(request.match_info["id"])
+        if namespace is None:
+            raise web.HTTPNotFound()
+
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for message in ws:
+            data = json.loads(message.data)
+            stdout = io.StringIO()
+            with contextlib.redirect_stdout(stdout):
+                exec(data["content"]["code"], namespace)
+
+            parent_header = {"msg_id": data["header"]["msg_id"]}
+            await ws.send_json(
+                {
+                    "parent_header": parent_header,
+                    "msg_type": "stream",
+                    "content": {"name": "stdout", "text": stdout.getvalue()},
+                }
+            )
+            await ws.send_json(
+                {
+                    "parent_header": parent_header,
+                    "msg_type": "status",
+                    "content": {"execution_state": "idle"},
+                }
+            )
+        return ws
+
+
+@pytest_asyncio.fixture
+async def jupyter():
+    server = FakeJupyter()
+    runner = web.AppRunner(server.app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    server.url = f"http://127.0.0.1:{port}"
+    try:
+        yield server
+    finally:
+        await runner.cleanup()
+
+
+class TestJupyterKernelPool:
+    @pytest.mark.asyncio
+    async def test_chats_keep_their_kernel(self, jupyter):
+        pool = JupyterKernelPool(warm_kernels=0)
+        try:
+            await pool.execute(jupyter.url, "x = 1", session_id="chat-1", user_id="u")
+            await pool.execute(jupyter.url, "x = 2", session_id="chat-2", user_id="u")
+            output = await pool.execute(
+                jupyter.url, "print(x)", session_id="chat-1", user_id="u"
+            )
+
+            assert output["stdout"] == "1"
+            assert jupyter.started == 2
+
+            # Without a chat the code runs in a throwaway kernel
+            output = await pool.execute(jupyter.url, "print('a')")
+            assert output["stdout"] == "a"
+            assert len(jupyter.kernels) == 2
+        finally:
+            await pool.close()
+
+        assert jupyter.kernels == {}
+
+    @pytest.mark.asyncio
+    async def test_kernels_per_user_are_capped(self, jupyter):
+        pool = JupyterKernelPool(max_kernels_per_user=2, warm_kernels=0)
+        try:
+            for chat_id in ["chat-1", "chat-2", "chat-3"]:
+                await pool.execute(
+                    jupyter.url, "x = 1", session_id=chat_id, user_id="u"
+                )
+            await pool.execute(jupyter.url, "x = 1", session_id="chat-1", user_id="v")
+
+            assert len(jupyter.kernels) == 3
+
+            # The least recently used chat starts over
+            output = await pool.execute(
+                jupyter.url, "print('x' in dir())", session_id="chat-1", user_id="u"
+            )
+            assert output["stdout"] == "False"
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_new_chats_use_warm_kernels(self, jupyter):
+        pool = JupyterKernelPool(warm_kernels=1)
+        try:
+            await pool.execute(jupyter.url, "x = 1", session_id="chat-1", user_id="u")
+            await asyncio.sleep(0.1)
+            assert len(jupyter.kernels) == 2
+
+            await pool.execute(jupyter.url, "x = 1", session_id="chat-2", user_id="u")
+            await asyncio.sleep(0.1)
+            assert jupyter.started == 3
+
+            # Kernels shut down by the server are replaced
+            session = next(iter(pool._sessions.values()))
+            jupyter.kernels.pop(session.kernel_id)
+            await session.ws.close()
+            output = await pool.execute(
+                jupyter.url, "print(1)", session_id="chat-1", user_id="u"
+            )
+            assert output["stdout"] == "1"
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status", [503, 403])
+    async def test_failed_kernel_start_keeps_other_chats(self, jupyter, status):
+        pool = JupyterKernelPool(warm_kernels=0)
+        try:
+            await pool.execute(jupyter.url, "x = 1", session_id="chat-1", user_id="u")
+
+            # e.g. the server's kernel limit, or an expired sign in
+            jupyter.start_status = status
+            output = await pool.execute(
+                jupyter.url, "x = 2", session_id="chat-2", user_id="u"
+            )
+            assert str(status) in output["stderr"]
+            # Only auth errors make the next chat sign in again
+            assert len(pool._servers) == (0 if status == 403 else 1)
+            jupyter.start_status = None
+
+            output = await pool.execute(
+                jupyter.url, "print(x)", session_id="chat-1", user_id="u"
+            )
+            assert output["stdout"] == "1"
+        finally:
+            await pool.close()
+
+        # The kernel could still be shut down
+        assert jupyter.kernels == {}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_new_chats_respect_the_cap(self, jupyter):
+        pool = JupyterKernelPool(max_kernels_per_user=1, warm_kernels=0)
+        try:
+            outputs = await asyncio.gather(
+                *[
+                    pool.execute(
+                        jupyter.url, "print(1)", session_id=chat_id, user_id="u"
+                    )
+                    for chat_id in ["chat-1", "chat-2", "chat-3"]
+                ]
+            )
+            assert [output["stdout"] for output in outputs] == ["1", "1", "1"]
+            assert len(pool._sessions) == 1
+            assert len(jupyter.kernels) == 1
+        finally:
+            await pool.close()
@@ -0,0 +1,151 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+
+from open_webui.utils import filter as filter_utils
+from open_webui.utils import plugin as plugin_utils
+from open_webui.utils.filter import FilterPipeline, invalidate_function_valves
+
+
+class Filter:
+    class Valves(BaseModel):
+        suffix: str = ""
+
+    class UserValves(BaseModel):
+        enabled: bool = True
+
+    def __init__(self):
+        self.valves = self.Valves()
+
+    def stream(self, event, __user__):
+        if __user__["valves"].enabled:
+            event["content"] += self.valves.suffix
+        return event
+
+
+@pytest.mark.asyncio
+async def test_stream_filters_load_valves_once(monkeypatch):
+    valves = {"suffix": "!"}
+    calls = []
+
+    def get_function_valves_by_id(function_id):
+        calls.append(("valves", function_id))
+        return valves
+
+    def get_user_valves_by_id_and_user_id(function_id, user_id):
+        calls.append(("user_valves", function_id))
+        return {}
+
+    monkeypatch.setattr(
+        filter_utils.Functions, "get_function_valves_by_id", get_function_valves_by_id
+    )
+    monkeypatch.setattr(
+        filter_utils.Functions,
+        "get_user_valves_by_id_and_user_id",
+        get_user_valves_by_id_and_user_id,
+    )
+
+    request = SimpleNamespace(
+        app=SimpleNamespace(state=SimpleNamespace(FUNCTIONS={"test_filter": Filter()}))
+    )
+    pipeline = FilterPipeline(request, [SimpleNamespace(id="test_filter")], "stream")
+
+    for _ in range(3):
+        event, _ = await pipeline.process(
+            {"content": "a"}, {"__user__": {"id": "user-1"}}
+        )
+        assert event == {"content": "a!"}
+
+    assert calls == [("valves", "test_filter"), ("user_valves", "test_filter")]
+
+    # Valve updates are picked up by pipelines that are already running
+    valves = {"suffix": "?"}
+    invalidate_function_valves("test_filter")
+    event, _ = await pipeline.process({"content": "a"}, {"__user__": {"id": "user-1"}})
+
+    assert event == {"content": "a?"}
+    assert len(calls) == 4
+
+
+def test_sorted_filter_ids_use_cached_plan(monkeypatch):
+    functions = [
+        SimpleNamespace(
+            id="global_low", type="filter", is_global=True, valves={"priority": 1}
+        ),
+        SimpleNamespace(id="model", type="filter", is_global=False, valves=None),
+        SimpleNamespace(
+            id="toggle", type="filter", is_global=True, valves={"priority": -1}
+        ),
+        SimpleNamespace(id="pipe", type="pipe", is_global=False, valves=None),
+    ]
+    modules = {
+        "global_low": SimpleNamespace(),
+        "model": SimpleNamespace(),
+        "toggle": SimpleNamespace(toggle=True),
+    }
+    calls = []
+
+    def get_functions(active_only=False, include_valves=False):
+        calls.append("get_functions")
+        return functions
+
+    monkeypatch.setattr(filter_utils.Functions, "get_functions", get_functions)
+    monkeypatch.setattr(
+        filter_utils.Functions, "get_functions_version", lambda: (4, 100)
+    )
+    monkeypatch.setattr(
+        filter_utils,
+        "get_function_module",
+        lambda request, function_id: modules[function_id],
+    )
+    monkeypatch.setattr(filter_utils, "FILTER_PLAN", {"version": None, "filters": []})
+
+    model = {"info": {"meta": {"filterIds": ["model"]}}}
+    assert filter_utils.get_sorted_filter_ids(None, model) == ["model", "global_low"]
+    assert filter_utils.get_sorted_filter_ids(None, {}, ["toggle"]) == [
+        "toggle",
+        "global_low",
+    ]
+    assert calls == ["get_functions"]
+
+    # Valve updates can change priorities
+    invalidate_function_valves("model")
+    filter_utils.get_sorted_filter_ids(None, model)
+    assert calls == ["get_functions", "get_functions"]
+
+
+@pytest.mark.asyncio
+async def test_stream_filters_run_inline(monkeypatch):
+    monkeypatch.setattr(plugin_utils, "PLUGIN_EXECUTION_MODE", "thread")
+
+    threads = []
+
+    class ThreadFilter:
+        def inlet(self, body):
+            threads.append(("inlet", threading.get_ident()))
+            return body
+
+        def stream(self, event):
+            threads.append(("stream", threading.get_ident()))
+            return event
+
+    function_module = ThreadFilter()
+    monkeypatch.setattr(
+        filter_utils,
+        "get_function_module",
+        lambda request, function_id, load_from_db=True: function_module,
+    )
+
+    functions = [SimpleNamespace(id="thread_filter")]
+    for filter_type in ["inlet", "stream"]:
+        await FilterPipeline(None, functions, filter_type).process({}, {})
+
+    # Inlets still go through the plugin thread pool, stream handlers
+    # stay on the event loop thread
+    assert threads == [
+        ("inlet", threads[0][1]),
+        ("stream", threading.get_ident()),
+    ]
+    assert threads[0][1] != threading.get_ident()
@@ -0,0 +1,38 @@
+import pytest
+
+from open_webui.utils.mcp.pool import MCPClientPool
+
+
+class TestMCPClientPool:
+    def test_key_depends_on_url_headers_and_user(self):
+        key = MCPClientPool.get_key("http://mcp", {"a": "1", "b": "2"})
+
+        assert key == MCPClientPool.get_key("http://mcp", {"b": "2", "a": "1"})
+        assert key != MCPClientPool.get_key("http://mcp", {"a": "1"})
+        assert key != MCPClientPool.get_key("http://other", {"a": "1", "b": "2"})
+        assert MCPClientPool.get_key("http://mcp") == MCPClientPool.get_key(
+            "http://mcp", {}
+        )
+
+        # Users don't share sessions, even with the same credentials
+        assert MCPClientPool.get_key(
+            "http://mcp", {"a": "1"}, "user-1"
+        ) != MCPClientPool.get_key("http://mcp", {"a": "1"}, "user-2")
+
+    @pytest.mark.asyncio
+    async def test_failed_connect_backs_off(self):
+        pool = MCPClientPool(backoff_base=60)
+        url = "http://127.0.0.1:1/mcp"
+
+        try:
+            with pytest.raises(Exception):
+                await pool.acquire(url)
+
+            # Retried only once the backoff has elapsed
+            with pytest.raises(ConnectionError, match="unavailable"):
+                await pool.acquire(url)
+
+            assert pool._sessions == {}
+            assert pool._failures[pool.get_key(url)][0] == 1
+        finally:
+            await pool.close()
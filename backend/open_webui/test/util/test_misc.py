@@ -0,0 +1,106 @@
+import json
+
+import pytest
+
+from open_webui.utils.misc import iter_json_array_items
+
+
+def make_reader(data: bytes, piece_size: int):
+    position = 0
+
+    async def read(size: int) -> bytes:
+        nonlocal position
+        chunk = data[position : position + min(size, piece_size)]
+        position += len(chunk)
+        return chunk
+
+    return read
+
+
+async def collect(data: bytes, piece_size: int, chunk_size: int = 4) -> list:
+    return [
+        item
+        async for item, _ in iter_json_array_items(
+            make_reader(data, piece_size), chunk_size=chunk_size
+        )
+    ]
+
+
+ITEMS = [
+    {"title": 'quote " and \\ backslash', "tags": ["a,b", "]"]},
+    {"title": "unicode é 漢字 🎉", "escaped": "é\n\t"},
+    12345,
+    1.5e10,
+    -0.25,
+    "plain",
+    True,
+    None,
+    [],
+]
+
+
+class TestIterJsonArrayItems:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("ensure_ascii", [True, False])
+    async def test_every_chunk_boundary(self, ensure_ascii):
+        data = json.dumps(ITEMS, ensure_ascii=ensure_ascii).encode("utf-8")
+
+        # Splits land inside strings, escape sequences, multi-byte UTF-8
+        # characters and numbers
+        for piece_size in range(1, 24):
+            assert await collect(data, piece_size) == ITEMS
+
+    @pytest.mark.asyncio
+    async def test_reports_bytes_read(self):
+        data = b'\xef\xbb\xbf [ {"a": 1} , {"b": 2} ] '
+        results = [
+            result
+            async for result in iter_json_array_items(make_reader(data, len(data)))
+        ]
+        assert results == [({"a": 1}, len(data)), ({"b": 2}, len(data))]
+        assert await collect(b"", 1) == []
+        assert await collect(b"[]", 1) == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "data",
+        [
+            b'{"a": 1}',
+            b'[{"a": 1}',
+            b'[{"a": "x}]',
+            b"[1.]",
+            b'[{"a": 1} {"b": 2}]',
+            b'[{"a": 1},, {"b": 2}]',
+            b"[, 1]",
+            b"[1,]",
+            b"[1 2]",
+        ],
+    )
+    async def test_invalid_input(self, data):
+        with pytest.raises(ValueError):
+            await collect(data, 1)
+
+    @pytest.mark.asyncio
+    async def test_element_size_limit(self):
+        reads = 0
+
+        async def read(size: int) -> bytes:
+            nonlocal reads
+            reads += 1
+            return b'[{"a": "' if reads == 1 else b"x" * size
+
+        # An unterminated element fails once it outgrows the limit instead of
+        # being buffered until EOF
+        with pytest.raises(ValueError, match="exceeds"):
+            async for _ in iter_json_array_items(read, max_item_size=1024):
+                pass
+        assert reads < 10
+
+        data = json.dumps([{"a": "x" * 100}, {"b": "y" * 100}]).encode()
+        items = [
+            item
+            async for item, _ in iter_json_array_items(
+                make_reader(data, 7), chunk_size=4, max_item_size=128
+            )
+        ]
+        assert items == json.loads(data)
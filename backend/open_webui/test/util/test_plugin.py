@@ -0,0 +1,127 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from open_webui.utils import filter as filter_utils
+from open_webui.utils import plugin
+from open_webui.utils.plugin import (
+    call_plugin_function,
+    get_function_module_from_cache,
+    invalidate_plugin_module,
+    redis_plugin_invalidation_listener,
+)
+
+
+def test_function_module_cache_is_keyed_by_version(monkeypatch):
+    function = SimpleNamespace(content="class Filter: pass", updated_at=1)
+    calls = []
+
+    def get_function_by_id(function_id):
+        calls.append("get_function_by_id")
+        return function
+
+    def load_function_module_by_id(function_id, content=None):
+        calls.append("load_function_module_by_id")
+        return object(), "filter", {}
+
+    monkeypatch.setattr(
+        plugin.Functions,
+        "get_function_updated_at_by_id",
+        lambda function_id: function.updated_at,
+    )
+    monkeypatch.setattr(plugin.Functions, "get_function_by_id", get_function_by_id)
+    monkeypatch.setattr(
+        plugin, "load_function_module_by_id", load_function_module_by_id
+    )
+
+    app = SimpleNamespace(state=SimpleNamespace())
+    request = SimpleNamespace(app=app)
+
+    module, _, _ = get_function_module_from_cache(request, "test_filter")
+    assert get_function_module_from_cache(request, "test_filter")[0] is module
+    assert calls == ["get_function_by_id", "load_function_module_by_id"]
+
+    # A newer version is loaded again
+    function.updated_at = 2
+    updated_module, _, _ = get_function_module_from_cache(request, "test_filter")
+    assert updated_module is not module
+    assert len(calls) == 4
+
+    # As is a module invalidated by another worker
+    invalidate_plugin_module(app, "function", "test_filter")
+    assert get_function_module_from_cache(request, "test_filter")[0] is not (
+        updated_module
+    )
+    assert len(calls) == 6
+
+
+@pytest.mark.asyncio
+async def test_invalidation_listener_resets_filter_plan(monkeypatch):
+    class PubSub:
+        async def subscribe(self, channel):
+            pass
+
+        async def listen(self):
+            for message in messages:
+                yield {"type": "message", "data": json.dumps(message)}
+
+    messages = [
+        {"type": "function_valves", "id": "valves_only", "worker_id": "other"},
+        {"type": "function", "id": "toggled", "worker_id": "other"},
+    ]
+    modules = {"valves_only": object(), "toggled": object()}
+    app = SimpleNamespace(
+        state=SimpleNamespace(
+            redis=SimpleNamespace(pubsub=PubSub),
+            FUNCTIONS=dict(modules),
+            FUNCTION_VERSIONS={"valves_only": 1, "toggled": 1},
+        )
+    )
+    monkeypatch.setattr(
+        filter_utils, "FILTER_PLAN", {"version": (2, 100), "filters": []}
+    )
+
+    await redis_plugin_invalidation_listener(app)
+
+    # Changes within the second the plan was built at are not missed
+    assert filter_utils.FILTER_PLAN["version"] is None
+    assert app.state.FUNCTIONS == {"valves_only": modules["valves_only"]}
+
+
+class TestCallPluginFunction:
+    @pytest.mark.asyncio
+    async def test_sync_handlers_do_not_block_the_event_loop(self):
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        try:
+            result = await call_plugin_function(
+                "function", "slow_filter", lambda body: time.sleep(0.2) or body, {}
+            )
+        finally:
+            ticker.cancel()
+
+        assert result == {}
+        assert ticks >= 5
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        async def handler():
+            await asyncio.sleep(1)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await call_plugin_function("tool", "slow_tool", handler, timeout=0.05)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await call_plugin_function(
+                "tool", "slow_tool", time.sleep, 0.2, timeout=0.05
+            )
@@ -0,0 +1,23 @@
+import pytest
+
+from open_webui.socket.utils import SessionPool
+
+
+class TestSessionPool:
+    @pytest.mark.asyncio
+    async def test_local_sessions(self):
+        pool = SessionPool("test:session_pool")
+        await pool.set("sid-1", {"id": "user-1"})
+        await pool.set("sid-2", {"id": "user-2"})
+
+        assert "sid-1" in pool
+        assert pool.get("sid-1") == {"id": "user-1"}
+        assert await pool.get_many(["sid-1", "sid-2", "sid-1", "unknown"]) == {
+            "sid-1": {"id": "user-1"},
+            "sid-2": {"id": "user-2"},
+        }
+
+        await pool.delete("sid-1")
+        assert "sid-1" not in pool
+        assert pool.get("sid-1") is None
+        assert len(pool) == 1
@@ -0,0 +1,51 @@
+import json
+
+from open_webui.utils.task import get_background_task_results
+
+
+def completion(content: str) -> dict:
+    return {"choices": [{"message": {"role": "assistant", "content": content}}]}
+
+
+TASK_KEYS = ["follow_ups", "title", "tags"]
+
+
+class TestBackgroundTaskResults:
+    def test_combined_response(self):
+        res = completion(
+            "Sure!\n```json\n"
+            + json.dumps(
+                {
+                    "title": "📉 Stock Market Trends",
+                    "tags": ["Finance", "Economics"],
+                    "follow_ups": ["What drives inflation?"],
+                }
+            )
+            + "\n```"
+        )
+
+        assert get_background_task_results(res, TASK_KEYS) == (
+            {
+                "follow_ups": {"follow_ups": ["What drives inflation?"]},
+                "title": {"title": "📉 Stock Market Trends"},
+                "tags": {"tags": ["Finance", "Economics"]},
+            },
+            [],
+        )
+
+    def test_missing_and_malformed_keys_fall_back(self):
+        res = completion('{"title": "Trip planning", "tags": "travel, europe"}')
+
+        results, missing_keys = get_background_task_results(res, TASK_KEYS)
+        assert results == {"title": {"title": "Trip planning"}}
+        assert missing_keys == ["follow_ups", "tags"]
+
+    def test_malformed_json_falls_back(self):
+        for res in [
+            completion('{"title": "Trip planning", "tags": ["travel"'),
+            completion("I can't help with that."),
+            completion('["Trip planning"]'),
+            {"detail": "Background task generation is disabled"},
+            None,
+        ]:
+            assert get_background_task_results(res, TASK_KEYS) == ({}, TASK_KEYS)
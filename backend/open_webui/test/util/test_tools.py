@@ -0,0 +1,347 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from open_webui.utils import plugin as plugin_utils
+from open_webui.utils import tools
+from open_webui.utils.tools import (
+    ToolCallAssembler,
+    ToolServerRegistry,
+    execute_tool_calls,
+    execute_tool_server,
+    get_async_tool_function_and_apply_extra_params,
+    get_normalized_tool_specs,
+    get_tool_server_operations,
+    get_updated_tool_function,
+    is_serial_tool,
+    parse_tool_call_arguments,
+)
+
+OPENAPI_SPEC = {
+    "openapi": "3.1.0",
+    "paths": {
+        "/items/{item_id}": {
+            "get": {
+                "operationId": "get_item",
+                "parameters": [
+                    {"name": "item_id", "in": "path", "required": True},
+                    {"$ref": "#/components/parameters/Verbose"},
+                ],
+            },
+            "put": {
+                "operationId": "update_item",
+                "parameters": [{"name": "item_id", "in": "path"}],
+                "requestBody": {"content": {"application/json": {"schema": {}}}},
+            },
+        }
+    },
+    "components": {"parameters": {"Verbose": {"name": "verbose", "in": "query"}}},
+}
+
+
+class TestExecuteToolCalls:
+    @pytest.mark.asyncio
+    async def test_runs_concurrently_and_keeps_call_order(self):
+        active = 0
+        peak = 0
+
+        async def execute(tool_call):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            # Later calls finish first
+            await asyncio.sleep(0.01 * (5 - tool_call["id"]))
+            active -= 1
+            return tool_call["id"]
+
+        results = await execute_tool_calls(
+            [{"id": i} for i in range(5)],
+            execute,
+            lambda tool_call: False,
+            concurrency=3,
+        )
+
+        assert results == [0, 1, 2, 3, 4]
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_serial_calls_run_alone(self):
+        events = []
+
+        async def execute(tool_call):
+            events.append(("start", tool_call["id"]))
+            await asyncio.sleep(0.01)
+            events.append(("end", tool_call["id"]))
+            return tool_call["id"]
+
+        results = await execute_tool_calls(
+            [{"id": 0}, {"id": 1}, {"id": 2, "serial": True}, {"id": 3}],
+            execute,
+            lambda tool_call: tool_call.get("serial", False),
+            concurrency=8,
+        )
+
+        assert results == [0, 1, 2, 3]
+        start, end = events.index(("start", 2)), events.index(("end", 2))
+        assert events[start + 1] == ("end", 2)
+        assert {event[1] for event in events[:start]} == {0, 1}
+        assert {event[1] for event in events[end + 1 :]} == {3}
+
+
+@pytest.mark.asyncio
+async def test_updated_tool_functions_run_in_plugin_threads(monkeypatch):
+    monkeypatch.setattr(plugin_utils, "PLUGIN_EXECUTION_MODE", "thread")
+
+    def search(query: str, __messages__: list) -> tuple:
+        return query, len(__messages__), threading.get_ident()
+
+    function = get_async_tool_function_and_apply_extra_params(
+        search, {"__id__": "web", "__messages__": [], "__user__": {}}
+    )
+    query, messages, thread = await function(query="a")
+    assert (query, messages) == ("a", 0)
+    assert thread != threading.get_ident()
+
+    # Native function calling re-binds the messages of every call. The tool
+    # doesn't declare `__id__`, but still has to run as a plugin
+    function = get_updated_tool_function(function, {"__messages__": [{}, {}]})
+    query, messages, thread = await function(query="b")
+    assert (query, messages) == ("b", 2)
+    assert thread != threading.get_ident()
+
+
+def test_is_serial_tool():
+    class Tools:
+        serial = ["write_file"]
+
+    assert is_serial_tool(Tools(), "write_file")
+    assert not is_serial_tool(Tools(), "read_file")
+    assert not is_serial_tool(object(), "read_file")
+
+
+@pytest.mark.parametrize(
+    "arguments,expected",
+    [
+        ('{"query": "weather", "limit": 3}', {"query": "weather", "limit": 3}),
+        ("", {}),
+        ('```json\n{"query": "weather"}\n```', {"query": "weather"}),
+        ('{"ids": [1, 2,], "query": "weather",}', {"ids": [1, 2], "query": "weather"}),
+        # Truncated arguments are not completed for execution
+        ('{"path": "a.txt", "content": "hello wor', {}),
+        ("{'query': 'weather', 'exact': True}", {"query": "weather", "exact": True}),
+        ("not json", {}),
+    ],
+)
+def test_parse_tool_call_arguments(arguments, expected):
+    assert parse_tool_call_arguments(arguments) == expected
+
+
+def test_tool_call_assembler():
+    assembler = ToolCallAssembler()
+    assert not assembler
+
+    assembler.add(
+        [
+            {
+                "index": 0,
+                "id": "call_1",
+                "type": "function",
+                "function": {"name": "search", "arguments": '{"qu'},
+            }
+        ]
+    )
+    assembler.add([{"index": 0, "function": {"arguments": 'ery": "wea'}}])
+    assembler.add([{"index": 1, "id": "call_2", "function": {"name": "now"}}])
+
+    # Arguments still streaming are shown completed
+    assert assembler.is_preview_due()
+    pending = assembler.get_pending_tool_calls()
+    assert pending[0]["function"]["arguments"] == '{"query": "wea"}'
+    assert pending[1]["function"]["arguments"] == ""
+
+    assembler.add([{"index": 0, "function": {"arguments": 'ther"}'}}])
+    assert [
+        (call["id"], call["function"]["name"], call["function"]["arguments"])
+        for call in assembler.tool_calls
+    ] == [("call_1", "search", '{"query": "weather"}'), ("call_2", "now", "")]
+
+
+def test_tool_call_assembler_throttles_previews():
+    assembler = ToolCallAssembler(preview_min_chars=10, preview_growth=0.5)
+    assembler.add([{"index": 0, "function": {"name": "write", "arguments": ""}}])
+
+    previews = []
+    for _ in range(100):
+        assembler.add([{"index": 0, "function": {"arguments": "ab"}}])
+        if assembler.is_preview_due():
+            arguments = assembler.get_pending_tool_calls()[0]["function"]["arguments"]
+            previews.append(len(arguments))
+
+    # The first preview is due for the new call, later ones once the
+    # arguments grew by half
+    assert previews == [2, 12, 22, 34, 52, 78, 118, 178]
+    assert not assembler.is_preview_due()
+    assert len(assembler.tool_calls[0]["function"]["arguments"]) == 200
+
+
+def test_get_tool_server_operations():
+    assert get_tool_server_operations(OPENAPI_SPEC) == {
+        "get_item": {
+            "method": "get",
+            "path": "/items/{item_id}",
+            "parameters": {"item_id": "path", "verbose": "query"},
+            "body": False,
+        },
+        "update_item": {
+            "method": "put",
+            "path": "/items/{item_id}",
+            "parameters": {"item_id": "path"},
+            "body": True,
+        },
+    }
+
+
+def test_get_normalized_tool_specs():
+    class Tools:
+        def search(self, query: str, __user__: dict):
+            """
+            Search the web.
+            :param query: What to search for
+            """
+
+        def fetch(self, url: str):
+            pass
+
+    specs = [
+        {
+            "name": "search",
+            "parameters": {
+                "type": "object",
+                "properties": {"query": {"type": "str"}, "__user__": {}},
+            },
+        },
+        {"name": "fetch", "parameters": {"type": "object", "properties": {}}},
+    ]
+    tool = SimpleNamespace(id="web", specs=specs, updated_at=1)
+    module = Tools()
+
+    normalized = get_normalized_tool_specs(tool, module)
+    assert normalized[0]["parameters"]["properties"] == {"query": {"type": "string"}}
+    assert normalized[0]["description"].strip() == "Search the web."
+    assert normalized[1]["description"] == "fetch"
+    # The stored specs are left untouched
+    assert "__user__" in specs[0]["parameters"]["properties"]
+
+    assert get_normalized_tool_specs(tool, module) is normalized
+    tool.updated_at = 2
+    assert get_normalized_tool_specs(tool, module) is not normalized
+
+
+class TestToolServerRegistry:
+    async def start_server(self, app):
+        server = TestServer(app)
+        await server.start_server()
+        return server
+
+    @pytest.mark.asyncio
+    async def test_fetch_spec_revalidates_with_etag(self):
+        requests = []
+
+        async def handler(request):
+            requests.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return web.Response(status=304)
+            return web.json_response(OPENAPI_SPEC, headers={"ETag": '"v1"'})
+
+        app = web.Application()
+        app.router.add_get("/openapi.json", handler)
+        server = await self.start_server(app)
+        registry = ToolServerRegistry()
+        try:
+            url = str(server.make_url("/openapi.json"))
+            first = await registry.fetch_spec(url, {})
+            first["info"] = {"title": "Changed"}
+            second = await registry.fetch_spec(url, {})
+        finally:
+            await registry.close()
+            await server.close()
+
+        assert requests == [None, '"v1"']
+        assert second == OPENAPI_SPEC
+
+    @pytest.mark.asyncio
+    async def test_fetched_specs_are_bounded(self):
+        async def handler(request):
+            return web.json_response(OPENAPI_SPEC, headers={"ETag": '"v1"'})
+
+        app = web.Application()
+        app.router.add_get("/{name}.json", handler)
+        server = await self.start_server(app)
+        registry = ToolServerRegistry(max_specs=2)
+        try:
+            url = str(server.make_url("/a.json"))
+            # Per-user tokens share the spec kept for the server
+            for token in ["user-1", "user-2", "user-3"]:
+                await registry.fetch_spec(url, {"Authorization": f"Bearer {token}"})
+            assert list(registry._specs) == [url]
+
+            for name in ["b", "c"]:
+                await registry.fetch_spec(str(server.make_url(f"/{name}.json")), {})
+            assert url not in registry._specs
+            assert len(registry._specs) == 2
+        finally:
+            await registry.close()
+            await server.close()
+
+    @pytest.mark.asyncio
+    async def test_execute_tool_server_uses_operation_index(self, monkeypatch):
+        async def handler(request):
+            return web.json_response(
+                {
+                    "method": request.method,
+                    "path": request.path,
+                    "query": dict(request.query),
+                    "body": await request.json() if request.can_read_body else None,
+                }
+            )
+
+        app = web.Application()
+        app.router.add_route("*", "/items/{item_id}", handler)
+        server = await self.start_server(app)
+        monkeypatch.setattr(tools, "TOOL_SERVER_REGISTRY", ToolServerRegistry())
+        server_data = {
+            "openapi": OPENAPI_SPEC,
+            "operations": get_tool_server_operations(OPENAPI_SPEC),
+        }
+        try:
+            url = str(server.make_url("")).rstrip("/")
+            get_result, _ = await execute_tool_server(
+                url, {}, {}, "get_item", {"item_id": 1, "verbose": "yes"}, server_data
+            )
+            put_result, _ = await execute_tool_server(
+                url, {}, {}, "update_item", {"item_id": 2, "name": "x"}, server_data
+            )
+            missing_result, _ = await execute_tool_server(
+                url, {}, {}, "delete_item", {}, server_data
+            )
+        finally:
+            await tools.TOOL_SERVER_REGISTRY.close()
+            await server.close()
+
+        assert get_result == {
+            "method": "GET",
+            "path": "/items/1",
+            "query": {"verbose": "yes"},
+            "body": None,
+        }
+        assert put_result == {
+            "method": "PUT",
+            "path": "/items/2",
+            "query": {},
+            "body": {"item_id": 2, "name": "x"},
+        }
+        assert "error" in missing_result
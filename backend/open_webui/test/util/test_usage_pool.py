@@ -0,0 +1,36 @@
+import time
+
+import pytest
+
+from open_webui.socket.utils import UsagePool
+
+
+class TestUsagePool:
+    @pytest.mark.asyncio
+    async def test_touch_reports_newly_used_models(self):
+        pool = UsagePool("test:usage_pool", timeout=3)
+
+        assert await pool.touch("model-a", "sid-1")
+        assert not await pool.touch("model-a", "sid-2")
+        assert await pool.touch("model-b", "sid-1")
+        assert sorted(await pool.get_models()) == ["model-a", "model-b"]
+
+    @pytest.mark.asyncio
+    async def test_cleanup_expires_stale_sessions(self, monkeypatch):
+        pool = UsagePool("test:usage_pool", timeout=3)
+        now = time.time()
+
+        monkeypatch.setattr(time, "time", lambda: now)
+        await pool.touch("model-a", "sid-1")
+        await pool.touch("model-b", "sid-2")
+
+        monkeypatch.setattr(time, "time", lambda: now + 2)
+        await pool.touch("model-b", "sid-3")
+
+        monkeypatch.setattr(time, "time", lambda: now + 4)
+        assert await pool.get_models() == ["model-b"]
+        assert await pool.cleanup() == ["model-a"]
+        assert pool._local_sessions == {"model-b": {"sid-3": now + 2}}
+
+        # A model used again after expiring counts as a change
+        assert await pool.touch("model-a", "sid-1")
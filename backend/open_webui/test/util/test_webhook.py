@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from open_webui.utils.webhook import WebhookDispatcher
+
+
+class TestWebhookDispatcher:
+    async def start_server(self, handler):
+        app = web.Application()
+        app.router.add_post("/hook", handler)
+        server = TestServer(app)
+        await server.start_server()
+        return server
+
+    @pytest.mark.asyncio
+    async def test_retries_server_errors(self):
+        attempts = []
+
+        async def handler(request):
+            attempts.append(await request.json())
+            return web.Response(status=503 if len(attempts) < 3 else 200)
+
+        server = await self.start_server(handler)
+        dispatcher = WebhookDispatcher(rate_limit_per_host=0, max_retries=3)
+        try:
+            dispatcher.dispatch(
+                "Open WebUI",
+                [(str(server.make_url("/hook")), "message", {"action": "channel"})],
+            )
+            await dispatcher.close()
+        finally:
+            await server.close()
+
+        assert len(attempts) == 3
+        assert attempts[0] == {"action": "channel"}
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self):
+        attempts = []
+
+        async def handler(request):
+            attempts.append(True)
+            return web.Response(status=404)
+
+        server = await self.start_server(handler)
+        dispatcher = WebhookDispatcher(rate_limit_per_host=0, max_retries=3)
+        try:
+            assert not await dispatcher.deliver(str(server.make_url("/hook")), {})
+        finally:
+            await dispatcher.close()
+            await server.close()
+
+        assert len(attempts) == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_and_host_rate_limit(self):
+        active = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.05)
+            active -= 1
+            return web.Response(status=200)
+
+        server = await self.start_server(handler)
+        dispatcher = WebhookDispatcher(concurrency=2, rate_limit_per_host=50)
+        url = str(server.make_url("/hook"))
+        try:
+            start = time.monotonic()
+            dispatcher.dispatch("Open WebUI", [(url, "m", {})] * 10)
+            await dispatcher.close()
+            elapsed = time.monotonic() - start
+        finally:
+            await server.close()
+
+        assert peak <= 2
+        # 10 requests at 50/s to one host take at least 9 intervals
+        assert elapsed >= 9 / 50
+
+    @pytest.mark.asyncio
+    async def test_close_drops_deliveries_after_timeout(self):
+        async def handler(request):
+            return web.Response(status=503)
+
+        server = await self.start_server(handler)
+        dispatcher = WebhookDispatcher(
+            concurrency=2,
+            rate_limit_per_host=0,
+            max_retries=5,
+            queue_size=3,
+            shutdown_timeout=0.1,
+        )
+        try:
+            # Bounded by the queue rather than one task per delivery
+            dispatcher.dispatch(
+                "Open WebUI", [(str(server.make_url("/hook")), "m", {})] * 10
+            )
+            assert len(dispatcher._workers) == 2
+            assert dispatcher._queue.qsize() == 3
+
+            # Retry backoff doesn't hold up shutdown
+            start = time.monotonic()
+            await dispatcher.close()
+            assert time.monotonic() - start < 1
+            assert dispatcher._workers == []
+        finally:
+            await server.close()
@@ -0,0 +1,91 @@
+import json
+
+import pycrdt as Y
+import pytest
+
+from open_webui.socket.utils import YdocManager, decode_ydoc_update
+
+
+def make_updates(count: int) -> tuple[Y.Doc, list[bytes]]:
+    ydoc = Y.Doc()
+    text = ydoc.get("prosemirror", type=Y.Text)
+    updates = []
+    ydoc.observe(lambda event: updates.append(event.update))
+    for i in range(count):
+        text += f"{i} "
+    return ydoc, updates
+
+
+class TestYdocManager:
+    @pytest.mark.asyncio
+    async def test_compacts_after_max_updates(self):
+        manager = YdocManager(compaction_max_updates=10)
+        source, updates = make_updates(25)
+        for update in updates:
+            await manager.append_to_updates("note:1", update)
+
+        # One snapshot plus the updates received since the last compaction
+        assert len(await manager.get_updates("note:1")) == 1 + 5
+
+        ydoc = await manager.get_document("note:1")
+        assert str(ydoc.get("prosemirror", type=Y.Text)) == str(
+            source.get("prosemirror", type=Y.Text)
+        )
+
+    @pytest.mark.asyncio
+    async def test_compacts_after_max_bytes(self):
+        manager = YdocManager(compaction_max_updates=0, compaction_max_bytes=64)
+        _, updates = make_updates(20)
+        for update in updates:
+            await manager.append_to_updates("note:1", update)
+
+        assert len(await manager.get_updates("note:1")) < len(updates)
+
+    @pytest.mark.asyncio
+    async def test_state_update_is_diff_against_state_vector(self):
+        manager = YdocManager(compaction_max_updates=4)
+        source, updates = make_updates(10)
+        for update in updates[:6]:
+            await manager.append_to_updates("note:1", update)
+
+        client = Y.Doc()
+        state, _ = await manager.get_state_update("note:1")
+        client.apply_update(state)
+
+        for update in updates[6:]:
+            await manager.append_to_updates("note:1", update)
+
+        diff, server_state_vector = await manager.get_state_update(
+            "note:1", client.get_state()
+        )
+        full, _ = await manager.get_state_update("note:1")
+        assert len(diff) < len(full)
+
+        client.apply_update(diff)
+        assert str(client.get("prosemirror", type=Y.Text)) == str(
+            source.get("prosemirror", type=Y.Text)
+        )
+        assert client.get_state() == server_state_vector
+
+    @pytest.mark.asyncio
+    async def test_clear_document_removes_snapshot(self):
+        manager = YdocManager(compaction_max_updates=2)
+        _, updates = make_updates(4)
+        for update in updates:
+            await manager.append_to_updates("note:1", update)
+
+        assert await manager.document_exists("note:1")
+        await manager.clear_document("note:1")
+        assert not await manager.document_exists("note:1")
+        assert await manager.get_updates("note:1") == []
+
+
+def test_decode_ydoc_update_reads_legacy_json_lists():
+    _, updates = make_updates(3)
+    for update in updates:
+        legacy = json.dumps(list(update))
+        assert decode_ydoc_update(legacy) == update
+        assert decode_ydoc_update(legacy.encode()) == update
+        assert decode_ydoc_update(update) == update
+        # Binary storage is several times smaller than the JSON encoding
+        assert len(update) * 3 < len(legacy)
@@ -751,7 +751,7 @@ async def search_chats(
     try:
         user_id = __user__.get("id")
 
-        chats = Chats.get_chats_by_user_id_and_search_text(
+        chats = Chats.search_chat_list_by_user_id(
             user_id=user_id,
             search_text=query,
             include_archived=False,
@@ -767,32 +767,11 @@ async def search_chats(
             if end_timestamp and chat.updated_at > end_timestamp:
                 continue
 
-            # Find a matching message snippet
-            snippet = ""
-            messages = chat.chat.get("history", {}).get("messages", {})
-            lower_query = query.lower()
-
-            for msg_id, msg in messages.items():
-                content = msg.get("content", "")
-                if isinstance(content, str) and lower_query in content.lower():
-                    idx = content.lower().find(lower_query)
-                    start = max(0, idx - 50)
-                    end = min(len(content), idx + len(query) + 100)
-                    snippet = (
-                        ("..." if start > 0 else "")
-                        + content[start:end]
-                        + ("..." if end < len(content) else "")
-                    )
-                    break
-
-            if not snippet and lower_query in chat.title.lower():
-                snippet = f"Title match: {chat.title}"
-
             results.append(
                 {
                     "id": chat.id,
                     "title": chat.title,
-                    "snippet": snippet,
+                    "snippet": chat.snippet or "",
                     "updated_at": chat.updated_at,
                 }
             )
@@ -0,0 +1,210 @@
+import asyncio
+import heapq
+import itertools
+import logging
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from fastapi import Request
+
+log = logging.getLogger(__name__)
+
+
+PRIORITY_HIGH = 0  # admins and API key requests
+PRIORITY_NORMAL = 1
+
+
+class AdmissionTimeoutError(Exception):
+    """
+    Raised when a request could not be admitted within the configured wait.
+    """
+
+    def __init__(self, retry_after: int):
+        super().__init__("Too many concurrent requests, please retry later.")
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ("model_id", "user_id", "priority", "seq", "future")
+
+    def __init__(self, model_id: str, user_id: str, priority: int, seq: int):
+        self.model_id = model_id
+        self.user_id = user_id
+        self.priority = priority
+        self.seq = seq
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class AdmissionController:
+    """
+    Per-worker admission control for chat completions.
+
+    Limits the number of in-flight generations per model and per user. Requests
+    over the limit wait in a priority queue (admins and API keys first, FIFO
+    within a class) for at most `max_wait` seconds before being rejected.
+    A limit of None disables that cap.
+    """
+
+    def __init__(
+        self,
+        max_per_model: Optional[int] = None,
+        max_per_user: Optional[int] = None,
+        max_wait: float = 30,
+    ):
+        self.max_per_model = max_per_model
+        self.max_per_user = max_per_user
+        self.max_wait = max_wait
+
+        self._model_active: Dict[str, int] = {}
+        self._user_active: Dict[str, int] = {}
+        self._queue: List[tuple] = []
+        self._counter = itertools.count()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.max_per_model) or bool(self.max_per_user)
+
+    def _has_capacity(self, model_id: str, user_id: str) -> bool:
+        if self.max_per_model and (
+            self._model_active.get(model_id, 0) >= self.max_per_model
+        ):
+            return False
+        if self.max_per_user and (
+            self._user_active.get(user_id, 0) >= self.max_per_user
+        ):
+            return False
+        return True
+
+    def _take(self, model_id: str, user_id: str):
+        self._model_active[model_id] = self._model_active.get(model_id, 0) + 1
+        self._user_active[user_id] = self._user_active.get(user_id, 0) + 1
+
+    def _release(self, model_id: str, user_id: str):
+        for active, key in (
+            (self._model_active, model_id),
+            (self._user_active, user_id),
+        ):
+            count = active.get(key, 0) - 1
+            if count > 0:
+                active[key] = count
+            else:
+                active.pop(key, None)
+
+        self._dispatch()
+
+    def _dispatch(self):
+        """
+        Hand freed slots to queued waiters in priority order. Waiters blocked on
+        a different model or user are skipped so they do not stall the queue.
+        """
+        remaining = []
+        while self._queue:
+            entry = heapq.heappop(self._queue)
+            waiter: _Waiter = entry[2]
+            if waiter.future.done():
+                continue
+
+            if self._has_capacity(waiter.model_id, waiter.user_id):
+                self._take(waiter.model_id, waiter.user_id)
+                waiter.future.set_result(True)
+            else:
+                remaining.append(entry)
+
+        for entry in remaining:
+            heapq.heappush(self._queue, entry)
+
+    def get_queue_position(self, waiter: _Waiter) -> int:
+        position = 1
+        for priority, seq, other in self._queue:
+            if other is waiter:
+                continue
+            if other.future.done():
+                continue
+            if (priority, seq) < (waiter.priority, waiter.seq):
+                position += 1
+        return position
+
+    def get_stats(self) -> dict:
+        return {
+            "models": dict(self._model_active),
+            "users": len(self._user_active),
+            "queued": sum(1 for entry in self._queue if not entry[2].future.done()),
+        }
+
+    async def acquire(
+        self,
+        model_id: str,
+        user_id: str,
+        priority: int = PRIORITY_NORMAL,
+        on_queued: Optional[Callable[[int], Awaitable[None]]] = None,
+    ) -> Callable[[], None]:
+        """
+        Acquire a slot and return a release callback. The callback is
+        idempotent so it can be called from both success and error paths.
+        """
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                self._release(model_id, user_id)
+
+        if not self.enabled:
+            return lambda: None
+
+        if not self._queue and self._has_capacity(model_id, user_id):
+            self._take(model_id, user_id)
+            return release
+
+        waiter = _Waiter(model_id, user_id, priority, next(self._counter))
+        heapq.heappush(self._queue, (priority, waiter.seq, waiter))
+
+        # A slot may already be free for this model/user even though others wait
+        self._dispatch()
+
+        if not waiter.future.done() and on_queued:
+            try:
+                await on_queued(self.get_queue_position(waiter))
+            except Exception as e:
+                log.debug(f"Error emitting queue position: {e}")
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.max_wait)
+        except asyncio.TimeoutError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Admitted right as the wait expired
+                return release
+            waiter.future.cancel()
+            raise AdmissionTimeoutError(retry_after=max(1, int(self.max_wait)))
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                release()
+            else:
+                waiter.future.cancel()
+            raise
+
+        return release
+
+
+def get_request_priority(request: Request, user) -> int:
+    if user and getattr(user, "role", None) == "admin":
+        return PRIORITY_HIGH
+
+    authorization = request.headers.get("Authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token.startswith("sk-"):
+        return PRIORITY_HIGH
+
+    return PRIORITY_NORMAL
+
+
+async def release_on_close(iterator: AsyncIterator, release: Callable[[], None]):
+    """
+    Wrap a streaming body so the admission slot is released once the stream
+    finishes, fails or the client disconnects.
+    """
+    try:
+        async for chunk in iterator:
+            yield chunk
+    finally:
+        release()
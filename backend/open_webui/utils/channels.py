@@ -1,4 +1,15 @@
+import asyncio
+import logging
 import re
+import time
+
+from fastapi.concurrency import run_in_threadpool
+
+from open_webui.env import REDIS_KEY_PREFIX
+from open_webui.models.messages import Messages
+from open_webui.socket.utils import AsyncRedisLock
+
+log = logging.getLogger(__name__)
 
 
 def extract_mentions(message: str, triggerChar: str = "@"):
@@ -29,3 +40,60 @@ def replace_mentions(message: str, triggerChar: str = "@", use_label: bool = Tru
     # Regex captures: idType, id, optional label
     pattern = rf"<{triggerChar}([A-Z]):([^|>]+)(?:\|([^>]+))?>"
     return re.sub(pattern, replacer, message)
+
+
+async def periodic_unread_count_reconciliation(
+    interval: int, redis=None, full_interval: int = 86400
+):
+    """
+    Periodically recount the maintained channel unread counters to repair
+    drift, e.g. from messages removed outside of the message API.
+
+    One worker runs each pass, covering the channels with messages since
+    the previous pass. Every `full_interval` seconds (and on the first pass)
+    it covers every channel instead, which also repairs quiet channels.
+    """
+    if not interval or interval <= 0:
+        return
+
+    last_pass_key = f"{REDIS_KEY_PREFIX}:channels:unread_reconciled_at"
+    last_full_pass_key = f"{REDIS_KEY_PREFIX}:channels:unread_fully_reconciled_at"
+    last_pass = None
+    last_full_pass = None
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            # Not released, so the other workers skip the rest of this interval
+            lock = AsyncRedisLock(
+                f"{REDIS_KEY_PREFIX}:channels:unread_reconcile_lock",
+                timeout_secs=max(1, int(interval * 0.9)),
+                redis=redis,
+            )
+            if not await lock.aquire_lock():
+                continue
+
+            if redis is not None:
+                value, full_value = await redis.mget(last_pass_key, last_full_pass_key)
+                last_pass = int(value) if value else None
+                last_full_pass = int(full_value) if full_value else None
+
+            started_at = time.time_ns()
+            full_pass = (
+                last_full_pass is None
+                or started_at - last_full_pass >= full_interval * 1_000_000_000
+            )
+            corrected = await run_in_threadpool(
+                Messages.reconcile_unread_counts, None if full_pass else last_pass
+            )
+            if corrected:
+                log.info(f"Corrected {corrected} channel unread counters")
+
+            last_pass = started_at
+            if full_pass:
+                last_full_pass = started_at
+            if redis is not None:
+                await redis.set(last_pass_key, last_pass)
+                await redis.set(last_full_pass_key, last_full_pass)
+        except Exception as e:
+            log.warning(f"Error reconciling channel unread counters: {e}")
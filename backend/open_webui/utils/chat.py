@@ -41,6 +41,7 @@ from open_webui.models.models import Models
 
 
 from open_webui.utils.plugin import (
+    call_plugin_function,
     load_function_module_by_id,
     get_function_module_from_cache,
 )
@@ -447,10 +448,7 @@ async def chat_action(request: Request, action_id: str, form_data: dict, user: A
 
                 params = {**params, "__user__": __user__}
 
-            if inspect.iscoroutinefunction(action):
-                data = await action(**params)
-            else:
-                data = action(**params)
+            data = await call_plugin_function("function", action_id, action, **params)
 
         except Exception as e:
             raise Exception(f"Error: {e}")
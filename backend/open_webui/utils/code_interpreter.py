@@ -1,12 +1,15 @@
 import asyncio
 import json
+import hashlib
 import logging
+import time
 import uuid
 from typing import Optional
 
 import aiohttp
 import websockets
 from pydantic import BaseModel
+from websockets.protocol import State
 
 
 logger = logging.getLogger(__name__)
@@ -22,62 +25,28 @@ class ResultModel(BaseModel):
     result: Optional[str] = ""
 
 
-class JupyterCodeExecuter:
+class JupyterServer:
     """
-    Execute code in jupyter notebook
+    Signed-in HTTP session with a jupyter server
     """
 
-    def __init__(
-        self,
-        base_url: str,
-        code: str,
-        token: str = "",
-        password: str = "",
-        timeout: int = 60,
-    ):
+    def __init__(self, base_url: str, token: str = "", password: str = ""):
         """
         :param base_url: Jupyter server URL (e.g., "http://localhost:8888")
-        :param code: Code to execute
         :param token: Jupyter authentication token (optional)
         :param password: Jupyter password (optional)
-        :param timeout: WebSocket timeout in seconds (default: 60s)
         """
         self.base_url = base_url
-        self.code = code
         self.token = token
         self.password = password
-        self.timeout = timeout
-        self.kernel_id = ""
         if self.base_url[-1] != "/":
             self.base_url += "/"
         self.session = aiohttp.ClientSession(trust_env=True, base_url=self.base_url)
         self.params = {}
-        self.result = ResultModel()
-
-    async def __aenter__(self):
-        return self
 
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.kernel_id:
-            try:
-                async with self.session.delete(
-                    f"api/kernels/{self.kernel_id}", params=self.params
-                ) as response:
-                    response.raise_for_status()
-            except Exception as err:
-                logger.exception("close kernel failed, %s", err)
+    async def close(self) -> None:
         await self.session.close()
 
-    async def run(self) -> ResultModel:
-        try:
-            await self.sign_in()
-            await self.init_kernel()
-            await self.execute_code()
-        except Exception as err:
-            logger.exception("execute code failed, %s", err)
-            self.result.stderr = f"Error: {err}"
-        return self.result
-
     async def sign_in(self) -> None:
         # password authentication
         if self.password and not self.token:
@@ -100,16 +69,28 @@ class JupyterCodeExecuter:
         if self.token:
             self.params.update({"token": self.token})
 
-    async def init_kernel(self) -> None:
+    async def start_kernel(self) -> str:
         async with self.session.post(url="api/kernels", params=self.params) as response:
             response.raise_for_status()
             kernel_data = await response.json()
-            self.kernel_id = kernel_data["id"]
+            return kernel_data["id"]
 
-    def init_ws(self) -> (str, dict):
+    async def interrupt_kernel(self, kernel_id: str) -> None:
+        async with self.session.post(
+            f"api/kernels/{kernel_id}/interrupt", params=self.params
+        ) as response:
+            response.raise_for_status()
+
+    async def shutdown_kernel(self, kernel_id: str) -> None:
+        async with self.session.delete(
+            f"api/kernels/{kernel_id}", params=self.params
+        ) as response:
+            response.raise_for_status()
+
+    def get_ws(self, kernel_id: str) -> (str, dict):
         ws_base = self.base_url.replace("http", "ws", 1)
         ws_params = "?" + "&".join([f"{key}={val}" for key, val in self.params.items()])
-        websocket_url = f"{ws_base}api/kernels/{self.kernel_id}/channels{ws_params if len(ws_params) > 1 else ''}"
+        websocket_url = f"{ws_base}api/kernels/{kernel_id}/channels{ws_params if len(ws_params) > 1 else ''}"
         ws_headers = {}
         if self.password and not self.token:
             ws_headers = {
@@ -123,6 +104,143 @@ class JupyterCodeExecuter:
             }
         return websocket_url, ws_headers
 
+    async def connect(self, kernel_id: str):
+        websocket_url, ws_headers = self.get_ws(kernel_id)
+        return await websockets.connect(websocket_url, additional_headers=ws_headers)
+
+
+async def execute_in_kernel(
+    ws, code: str, timeout: int = 60, session: Optional[str] = None
+) -> tuple[ResultModel, bool]:
+    """
+    Run code over an open kernel websocket, returning the result and
+    whether the execution finished before the timeout.
+    """
+    # send message
+    msg_id = uuid.uuid4().hex
+    await ws.send(
+        json.dumps(
+            {
+                "header": {
+                    "msg_id": msg_id,
+                    "msg_type": "execute_request",
+                    "username": "user",
+                    "session": session or uuid.uuid4().hex,
+                    "date": "",
+                    "version": "5.3",
+                },
+                "parent_header": {},
+                "metadata": {},
+                "content": {
+                    "code": code,
+                    "silent": False,
+                    "store_history": True,
+                    "user_expressions": {},
+                    "allow_stdin": False,
+                    "stop_on_error": True,
+                },
+                "channel": "shell",
+            }
+        )
+    )
+    # parse message
+    stdout, stderr, result = "", "", []
+    completed = True
+    while True:
+        try:
+            # wait for message
+            message = await asyncio.wait_for(ws.recv(), timeout)
+            message_data = json.loads(message)
+            # msg id not match, skip
+            if message_data.get("parent_header", {}).get("msg_id") != msg_id:
+                continue
+            # check message type
+            msg_type = message_data.get("msg_type")
+            match msg_type:
+                case "stream":
+                    if message_data["content"]["name"] == "stdout":
+                        stdout += message_data["content"]["text"]
+                    elif message_data["content"]["name"] == "stderr":
+                        stderr += message_data["content"]["text"]
+                case "execute_result" | "display_data":
+                    data = message_data["content"]["data"]
+                    if "image/png" in data:
+                        result.append(f"data:image/png;base64,{data['image/png']}")
+                    elif "text/plain" in data:
+                        result.append(data["text/plain"])
+                case "error":
+                    stderr += "\n".join(message_data["content"]["traceback"])
+                case "status":
+                    if message_data["content"]["execution_state"] == "idle":
+                        break
+
+        except asyncio.TimeoutError:
+            stderr += "\nExecution timed out."
+            completed = False
+            break
+    return (
+        ResultModel(
+            stdout=stdout.strip(),
+            stderr=stderr.strip(),
+            result="\n".join(result).strip() if result else "",
+        ),
+        completed,
+    )
+
+
+class JupyterCodeExecuter(JupyterServer):
+    """
+    Execute code in jupyter notebook
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        code: str,
+        token: str = "",
+        password: str = "",
+        timeout: int = 60,
+    ):
+        """
+        :param base_url: Jupyter server URL (e.g., "http://localhost:8888")
+        :param code: Code to execute
+        :param token: Jupyter authentication token (optional)
+        :param password: Jupyter password (optional)
+        :param timeout: WebSocket timeout in seconds (default: 60s)
+        """
+        super().__init__(base_url, token, password)
+        self.code = code
+        self.timeout = timeout
+        self.kernel_id = ""
+        self.result = ResultModel()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.kernel_id:
+            try:
+                await self.shutdown_kernel(self.kernel_id)
+            except Exception as err:
+                logger.exception("close kernel failed, %s", err)
+        await self.close()
+
+    async def run(self) -> ResultModel:
+        try:
+            await self.sign_in()
+            await self.init_kernel()
+            await self.execute_code()
+        except Exception as err:
+            logger.exception("execute code failed, %s", err)
+            self.result.stderr = f"Error: {err}"
+        return self.result
+
+    async def init_kernel(self) -> None:
+        self.kernel_id = await self.start_kernel()
+
+    def init_ws(self) -> (str, dict):
+        return self.get_ws(self.kernel_id)
+
     async def execute_code(self) -> None:
         # initialize ws
         websocket_url, ws_headers = self.init_ws()
@@ -133,69 +251,7 @@ class JupyterCodeExecuter:
             await self.execute_in_jupyter(ws)
 
     async def execute_in_jupyter(self, ws) -> None:
-        # send message
-        msg_id = uuid.uuid4().hex
-        await ws.send(
-            json.dumps(
-                {
-                    "header": {
-                        "msg_id": msg_id,
-                        "msg_type": "execute_request",
-                        "username": "user",
-                        "session": uuid.uuid4().hex,
-                        "date": "",
-                        "version": "5.3",
-                    },
-                    "parent_header": {},
-                    "metadata": {},
-                    "content": {
-                        "code": self.code,
-                        "silent": False,
-                        "store_history": True,
-                        "user_expressions": {},
-                        "allow_stdin": False,
-                        "stop_on_error": True,
-                    },
-                    "channel": "shell",
-                }
-            )
-        )
-        # parse message
-        stdout, stderr, result = "", "", []
-        while True:
-            try:
-                # wait for message
-                message = await asyncio.wait_for(ws.recv(), self.timeout)
-                message_data = json.loads(message)
-                # msg id not match, skip
-                if message_data.get("parent_header", {}).get("msg_id") != msg_id:
-                    continue
-                # check message type
-                msg_type = message_data.get("msg_type")
-                match msg_type:
-                    case "stream":
-                        if message_data["content"]["name"] == "stdout":
-                            stdout += message_data["content"]["text"]
-                        elif message_data["content"]["name"] == "stderr":
-                            stderr += message_data["content"]["text"]
-                    case "execute_result" | "display_data":
-                        data = message_data["content"]["data"]
-                        if "image/png" in data:
-                            result.append(f"data:image/png;base64,{data['image/png']}")
-                        elif "text/plain" in data:
-                            result.append(data["text/plain"])
-                    case "error":
-                        stderr += "\n".join(message_data["content"]["traceback"])
-                    case "status":
-                        if message_data["content"]["execution_state"] == "idle":
-                            break
-
-            except asyncio.TimeoutError:
-                stderr += "\nExecution timed out."
-                break
-        self.result.stdout = stdout.strip()
-        self.result.stderr = stderr.strip()
-        self.result.result = "\n".join(result).strip() if result else ""
+        self.result, _ = await execute_in_kernel(ws, self.code, self.timeout)
 
 
 async def execute_code_jupyter(
@@ -206,3 +262,320 @@ async def execute_code_jupyter(
     ) as executor:
         result = await executor.run()
         return result.model_dump()
+
+
+class JupyterKernelSession:
+    """
+    A kernel kept running between executions, so variables, imports and
+    files persist across the steps of a conversation.
+    """
+
+    def __init__(self, key: str, server: JupyterServer, kernel_id: str, user_id: str):
+        self.key = key
+        self.server = server
+        self.kernel_id = kernel_id
+        self.user_id = user_id
+        self.session_id = uuid.uuid4().hex
+
+        self.ws = None
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+
+    async def execute(self, code: str, timeout: int = 60) -> ResultModel:
+        # Cells run one at a time, as they would in a notebook
+        async with self.lock:
+            try:
+                if self.ws is not None and self.ws.state is not State.OPEN:
+                    self.ws = None
+                if self.ws is None:
+                    try:
+                        self.ws = await self.server.connect(self.kernel_id)
+                    except Exception as err:
+                        raise ConnectionError(
+                            f"kernel {self.kernel_id} is unavailable: {err}"
+                        ) from err
+
+                result, completed = await execute_in_kernel(
+                    self.ws, code, timeout, self.session_id
+                )
+                if not completed:
+                    # Stop the timed out cell so it doesn't hold up the next one
+                    await self.server.interrupt_kernel(self.kernel_id)
+                return result
+            finally:
+                self.last_used = time.monotonic()
+
+    async def close(self) -> None:
+        if self.ws is not None:
+            try:
+                await self.ws.close()
+            except Exception:
+                pass
+            self.ws = None
+
+        try:
+            await self.server.shutdown_kernel(self.kernel_id)
+        except Exception as err:
+            logger.debug("close kernel failed, %s", err)
+
+
+class JupyterKernelPool:
+    """
+    App-lifetime pool of jupyter kernels, one per chat, so multi-step code
+    interpreter conversations keep their state and don't pay for a kernel
+    start and a sign-in on every step.
+
+    Kernels idle for more than `idle_timeout` seconds are shut down, and each
+    user holds at most `max_kernels_per_user` kernels, their least recently
+    used one being shut down to make room. Once a server has been used,
+    `warm_kernels` kernels are kept started on it for new chats to pick up.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float = 600,
+        max_kernels_per_user: int = 3,
+        warm_kernels: int = 1,
+    ):
+        self.idle_timeout = idle_timeout
+        self.max_kernels_per_user = max_kernels_per_user
+        self.warm_kernels = warm_kernels
+
+        self._servers: dict[str, JupyterServer] = {}
+        self._servers_last_used: dict[str, float] = {}
+        self._servers_lock = asyncio.Lock()
+        self._sessions: dict[str, JupyterKernelSession] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._user_locks: dict[Optional[str], asyncio.Lock] = {}
+        self._warm: dict[str, list[str]] = {}
+        self._warm_tasks: dict[str, asyncio.Task] = {}
+        self._eviction_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def get_key(base_url: str, token: str = "", password: str = "") -> str:
+        return hashlib.sha256(
+            json.dumps([base_url, token or "", password or ""]).encode()
+        ).hexdigest()
+
+    async def execute(
+        self,
+        base_url: str,
+        code: str,
+        token: str = "",
+        password: str = "",
+        timeout: int = 60,
+        session_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> dict:
+        """
+        Run code in the kernel kept for `session_id`, starting one if needed.
+        Without a session id the code runs in a throwaway kernel.
+        """
+        if not session_id or self.max_kernels_per_user <= 0:
+            return await execute_code_jupyter(base_url, code, token, password, timeout)
+
+        self._start_eviction()
+
+        for attempt in range(2):
+            try:
+                session = await self._get_session(
+                    base_url, token, password, session_id, user_id
+                )
+            except Exception as err:
+                logger.exception("start kernel failed, %s", err)
+                if isinstance(err, aiohttp.ClientResponseError) and err.status in (
+                    401,
+                    403,
+                ):
+                    # Sign in again next time, the server may have restarted
+                    await self._close_server(self.get_key(base_url, token, password))
+                return ResultModel(stderr=f"Error: {err}").model_dump()
+
+            if session is None:
+                # All of the user's kernels are busy
+                return await execute_code_jupyter(
+                    base_url, code, token, password, timeout
+                )
+
+            try:
+                result = await session.execute(code, timeout)
+            except ConnectionError as err:
+                # The kernel went away before the code was sent, e.g. culled
+                # by the server, so it is safe to retry on a new one
+                await self._discard(session)
+                if attempt == 0:
+                    continue
+                logger.exception("execute code failed, %s", err)
+                result = ResultModel(stderr=f"Error: {err}")
+            except Exception as err:
+                logger.exception("execute code failed, %s", err)
+                await self._discard(session)
+                result = ResultModel(stderr=f"Error: {err}")
+            return result.model_dump()
+
+    async def _get_server(
+        self, server_key: str, base_url: str, token: str, password: str
+    ) -> JupyterServer:
+        async with self._servers_lock:
+            server = self._servers.get(server_key)
+            if server is None:
+                server = JupyterServer(base_url, token, password)
+                try:
+                    await server.sign_in()
+                except Exception:
+                    await server.close()
+                    raise
+                self._servers[server_key] = server
+
+            self._servers_last_used[server_key] = time.monotonic()
+            return server
+
+    async def _get_session(
+        self,
+        base_url: str,
+        token: str,
+        password: str,
+        session_id: str,
+        user_id: Optional[str],
+    ) -> Optional[JupyterKernelSession]:
+        server_key = self.get_key(base_url, token, password)
+        key = f"{server_key}:{user_id}:{session_id}"
+        lock = self._locks.setdefault(key, asyncio.Lock())
+
+        async with lock:
+            session = self._sessions.get(key)
+            if session is not None:
+                return session
+
+            # New chats of a user start one at a time, so they can't both
+            # take the last free slot
+            async with self._user_locks.setdefault(user_id, asyncio.Lock()):
+                if not await self._make_room(user_id):
+                    return None
+
+                server = await self._get_server(server_key, base_url, token, password)
+                warm = self._warm.get(server_key)
+                if warm:
+                    kernel_id = warm.pop(0)
+                else:
+                    kernel_id = await server.start_kernel()
+
+                session = JupyterKernelSession(key, server, kernel_id, user_id)
+                self._sessions[key] = session
+                self._fill_warm(server_key, server)
+                return session
+
+    async def _make_room(self, user_id: Optional[str]) -> bool:
+        sessions = [s for s in self._sessions.values() if s.user_id == user_id]
+        while len(sessions) >= self.max_kernels_per_user:
+            idle = [s for s in sessions if not s.lock.locked()]
+            if not idle:
+                return False
+
+            oldest = min(idle, key=lambda s: s.last_used)
+            sessions.remove(oldest)
+            await self._discard(oldest)
+        return True
+
+    async def _discard(self, session: JupyterKernelSession):
+        if self._sessions.get(session.key) is session:
+            self._sessions.pop(session.key, None)
+            self._locks.pop(session.key, None)
+        await session.close()
+
+        # Close a dropped server once its last kernel is gone
+        server = session.server
+        if server not in self._servers.values() and not self._is_server_used(server):
+            await server.close()
+
+    def _is_server_used(self, server: JupyterServer) -> bool:
+        return any(session.server is server for session in self._sessions.values())
+
+    def _fill_warm(self, server_key: str, server: JupyterServer):
+        task = self._warm_tasks.get(server_key)
+        if self.warm_kernels <= 0 or (task is not None and not task.done()):
+            return
+
+        async def fill():
+            warm = self._warm.setdefault(server_key, [])
+            try:
+                while len(warm) < self.warm_kernels:
+                    warm.append(await server.start_kernel())
+            except Exception as err:
+                logger.debug("start warm kernel failed, %s", err)
+
+        self._warm_tasks[server_key] = asyncio.create_task(fill())
+
+    async def _close_server(self, server_key: str):
+        task = self._warm_tasks.pop(server_key, None)
+        if task is not None:
+            task.cancel()
+
+        server = self._servers.pop(server_key, None)
+        self._servers_last_used.pop(server_key, None)
+        if server is None:
+            return
+
+        for kernel_id in self._warm.pop(server_key, []):
+            try:
+                await server.shutdown_kernel(kernel_id)
+            except Exception as err:
+                logger.debug("close kernel failed, %s", err)
+
+        # Kernels of other chats still need the session to shut down, the
+        # last one to go closes it
+        if not self._is_server_used(server):
+            await server.close()
+
+    async def evict_idle(self):
+        now = time.monotonic()
+        for session in list(self._sessions.values()):
+            if (
+                not session.lock.locked()
+                and now - session.last_used > self.idle_timeout
+            ):
+                await self._discard(session)
+
+        # Servers no chat has used for a while give back their warm kernels
+        for server_key, server in list(self._servers.items()):
+            if (
+                not self._is_server_used(server)
+                and now - self._servers_last_used.get(server_key, now)
+                > self.idle_timeout
+            ):
+                await self._close_server(server_key)
+
+    def _start_eviction(self):
+        if self._eviction_task is None or self._eviction_task.done():
+            self._eviction_task = asyncio.create_task(self._evict_periodically())
+
+    async def _evict_periodically(self):
+        interval = max(1, min(self.idle_timeout, 60))
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.evict_idle()
+            except Exception as e:
+                logger.debug(f"Error evicting idle jupyter kernels: {e}")
+
+    async def close(self):
+        if self._eviction_task is not None:
+            self._eviction_task.cancel()
+            self._eviction_task = None
+
+        sessions = list(self._sessions.values())
+        dropped_servers = {
+            session.server
+            for session in sessions
+            if session.server not in self._servers.values()
+        }
+        self._sessions.clear()
+        self._locks.clear()
+        await asyncio.gather(
+            *[session.close() for session in sessions], return_exceptions=True
+        )
+
+        for server_key in list(self._servers):
+            await self._close_server(server_key)
+        for server in dropped_servers:
+            await server.close()
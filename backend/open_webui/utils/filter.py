@@ -2,6 +2,7 @@ import inspect
 import logging
 
 from open_webui.utils.plugin import (
+    call_plugin_function,
     load_function_module_by_id,
     get_function_module_from_cache,
 )
@@ -20,115 +21,199 @@ def get_function_module(request, function_id, load_from_db=True):
     return function_module
 
 
+# Active filters in priority order, with the flags needed to select them for
+# a request. Rebuilt whenever the function table changes.
+FILTER_PLAN = {"version": None, "filters": []}
+
+
+def get_filter_plan(request) -> list[dict]:
+    version = Functions.get_functions_version()
+    if version is None or version != FILTER_PLAN["version"]:
+        filters = []
+        for function in Functions.get_functions(active_only=True, include_valves=True):
+            if function.type != "filter":
+                continue
+
+            function_module = get_function_module(request, function.id)
+            filters.append(
+                {
+                    "id": function.id,
+                    "is_global": function.is_global,
+                    "toggle": bool(getattr(function_module, "toggle", None)),
+                    "priority": (function.valves or {}).get("priority", 0),
+                }
+            )
+
+        filters.sort(key=lambda filter: filter["priority"])
+        FILTER_PLAN["filters"] = filters
+        FILTER_PLAN["version"] = version
+
+    return FILTER_PLAN["filters"]
+
+
 def get_sorted_filter_ids(request, model: dict, enabled_filter_ids: list = None):
-    def get_priority(function_id):
-        function = Functions.get_function_by_id(function_id)
-        if function is not None:
-            valves = Functions.get_function_valves_by_id(function_id)
-            return valves.get("priority", 0) if valves else 0
-        return 0
-
-    filter_ids = [function.id for function in Functions.get_global_filter_functions()]
+    model_filter_ids = set()
     if "info" in model and "meta" in model["info"]:
-        filter_ids.extend(model["info"]["meta"].get("filterIds", []))
-        filter_ids = list(set(filter_ids))
-    active_filter_ids = [
-        function.id
-        for function in Functions.get_functions_by_type("filter", active_only=True)
+        model_filter_ids = set(model["info"]["meta"].get("filterIds", []))
+
+    return [
+        filter["id"]
+        for filter in get_filter_plan(request)
+        if (filter["is_global"] or filter["id"] in model_filter_ids)
+        and (not filter["toggle"] or filter["id"] in (enabled_filter_ids or []))
     ]
 
-    def get_active_status(filter_id):
-        function_module = get_function_module(request, filter_id)
 
-        if getattr(function_module, "toggle", None):
-            return filter_id in (enabled_filter_ids or [])
+# Bumped whenever valves of a function change, so compiled filter pipelines
+# reload them instead of querying the database on every call
+FUNCTION_VALVES_VERSIONS: dict[str, int] = {}
 
-        return True
 
-    active_filter_ids = [
-        filter_id for filter_id in active_filter_ids if get_active_status(filter_id)
-    ]
+def invalidate_function_valves(function_id: str):
+    FUNCTION_VALVES_VERSIONS[function_id] = (
+        FUNCTION_VALVES_VERSIONS.get(function_id, 0) + 1
+    )
+    # Valves carry the filter priority
+    FILTER_PLAN["version"] = None
 
-    filter_ids = [fid for fid in filter_ids if fid in active_filter_ids]
-    filter_ids.sort(key=get_priority)
 
-    return filter_ids
+class FilterPipeline:
+    """
+    Filter functions of one type, with their modules, handler signatures and
+    valves resolved once. Meant to be reused for the "stream" filters of a
+    response, which run on every chunk.
+    """
+
+    def __init__(self, request, filter_functions, filter_type):
+        self.request = request
+        self.filter_functions = filter_functions
+        self.filter_type = filter_type
+        self.filters = None
+
+    def compile(self):
+        self.filters = []
+        for function in self.filter_functions:
+            if not function:
+                continue
+
+            function_module = get_function_module(
+                self.request, function.id, load_from_db=(self.filter_type != "stream")
+            )
+            handler = getattr(function_module, self.filter_type, None)
+            if not handler:
+                continue
+
+            self.filters.append(
+                {
+                    "id": function.id,
+                    "module": function_module,
+                    "handler": handler,
+                    "parameters": set(inspect.signature(handler).parameters),
+                    "valves": None,
+                    "user_valves": {},
+                    "version": None,
+                }
+            )
+
+    def load_valves(self, filter, user_id):
+        version = FUNCTION_VALVES_VERSIONS.get(filter["id"], 0)
+        if filter["version"] != version:
+            filter["version"] = version
+            filter["valves"] = None
+            filter["user_valves"] = {}
+
+        function_module = filter["module"]
+        if (
+            filter["valves"] is None
+            and hasattr(function_module, "valves")
+            and hasattr(function_module, "Valves")
+        ):
+            valves = Functions.get_function_valves_by_id(filter["id"])
+            filter["valves"] = function_module.Valves(**(valves if valves else {}))
+
+        if (
+            "__user__" in filter["parameters"]
+            and hasattr(function_module, "UserValves")
+            and user_id not in filter["user_valves"]
+        ):
+            try:
+                filter["user_valves"][user_id] = function_module.UserValves(
+                    **Functions.get_user_valves_by_id_and_user_id(filter["id"], user_id)
+                )
+            except Exception as e:
+                log.exception(f"Failed to get user values: {e}")
+                filter["user_valves"][user_id] = None
+
+    async def process(self, form_data, extra_params):
+        if self.filters is None:
+            self.compile()
+
+        skip_files = None
+
+        for filter in self.filters:
+            filter_id = filter["id"]
+            function_module = filter["module"]
+            handler = filter["handler"]
+
+            # Check if the function has a file_handler variable
+            if self.filter_type == "inlet" and hasattr(function_module, "file_handler"):
+                skip_files = function_module.file_handler
+
+            user_id = (extra_params.get("__user__") or {}).get("id")
+            self.load_valves(filter, user_id)
+
+            # Apply valves to the function
+            if filter["valves"] is not None:
+                function_module.valves = filter["valves"]
+
+            try:
+                # Prepare parameters
+                params = {"body": form_data}
+                if self.filter_type == "stream":
+                    params = {"event": form_data}
+
+                params = params | {
+                    k: v
+                    for k, v in {
+                        **extra_params,
+                        "__id__": filter_id,
+                    }.items()
+                    if k in filter["parameters"]
+                }
+
+                # Handle user parameters
+                if filter["user_valves"].get(user_id) is not None:
+                    params["__user__"]["valves"] = filter["user_valves"][user_id]
+
+                # Execute handler. Stream handlers run per chunk and are
+                # expected to be cheap: run them inline rather than paying an
+                # executor round trip per chunk and running a module's handler
+                # from several threads at once
+                form_data = await call_plugin_function(
+                    "function",
+                    filter_id,
+                    handler,
+                    inline=(self.filter_type == "stream"),
+                    **params,
+                )
+
+            except Exception as e:
+                log.debug(f"Error in {self.filter_type} handler {filter_id}: {e}")
+                raise e
+
+        # Handle file cleanup for inlet
+        if skip_files:
+            if "files" in form_data.get("metadata", {}):
+                del form_data["metadata"]["files"]
+            if "files" in form_data:
+                del form_data["files"]
+
+        return form_data, {}
 
 
 async def process_filter_functions(
     request, filter_functions, filter_type, form_data, extra_params
 ):
-    skip_files = None
-
-    for function in filter_functions:
-        filter = function
-        filter_id = function.id
-        if not filter:
-            continue
-
-        function_module = get_function_module(
-            request, filter_id, load_from_db=(filter_type != "stream")
-        )
-        # Prepare handler function
-        handler = getattr(function_module, filter_type, None)
-        if not handler:
-            continue
-
-        # Check if the function has a file_handler variable
-        if filter_type == "inlet" and hasattr(function_module, "file_handler"):
-            skip_files = function_module.file_handler
-
-        # Apply valves to the function
-        if hasattr(function_module, "valves") and hasattr(function_module, "Valves"):
-            valves = Functions.get_function_valves_by_id(filter_id)
-            function_module.valves = function_module.Valves(
-                **(valves if valves else {})
-            )
-
-        try:
-            # Prepare parameters
-            sig = inspect.signature(handler)
-
-            params = {"body": form_data}
-            if filter_type == "stream":
-                params = {"event": form_data}
-
-            params = params | {
-                k: v
-                for k, v in {
-                    **extra_params,
-                    "__id__": filter_id,
-                }.items()
-                if k in sig.parameters
-            }
-
-            # Handle user parameters
-            if "__user__" in sig.parameters:
-                if hasattr(function_module, "UserValves"):
-                    try:
-                        params["__user__"]["valves"] = function_module.UserValves(
-                            **Functions.get_user_valves_by_id_and_user_id(
-                                filter_id, params["__user__"]["id"]
-                            )
-                        )
-                    except Exception as e:
-                        log.exception(f"Failed to get user values: {e}")
-
-            # Execute handler
-            if inspect.iscoroutinefunction(handler):
-                form_data = await handler(**params)
-            else:
-                form_data = handler(**params)
-
-        except Exception as e:
-            log.debug(f"Error in {filter_type} handler {filter_id}: {e}")
-            raise e
-
-    # Handle file cleanup for inlet
-    if skip_files:
-        if "files" in form_data.get("metadata", {}):
-            del form_data["metadata"]["files"]
-        if "files" in form_data:
-            del form_data["files"]
-
-    return form_data, {}
+    return await FilterPipeline(request, filter_functions, filter_type).process(
+        form_data, extra_params
+    )
@@ -1,5 +1,5 @@
 import asyncio
-from typing import Optional
+from typing import Any, Awaitable, Callable, Optional
 from contextlib import AsyncExitStack
 
 import anyio
@@ -15,7 +15,12 @@ class MCPClient:
         self.session: Optional[ClientSession] = None
         self.exit_stack = None
 
-    async def connect(self, url: str, headers: Optional[dict] = None):
+    async def connect(
+        self,
+        url: str,
+        headers: Optional[dict] = None,
+        message_handler: Optional[Callable[[Any], Awaitable[None]]] = None,
+    ):
         async with AsyncExitStack() as exit_stack:
             try:
                 self._streams_context = streamablehttp_client(url, headers=headers)
@@ -24,7 +29,7 @@ class MCPClient:
                 read_stream, write_stream, _ = transport
 
                 self._session_context = ClientSession(
-                    read_stream, write_stream
+                    read_stream, write_stream, message_handler=message_handler
                 )  # pylint: disable=W0201
 
                 self.session = await exit_stack.enter_async_context(
@@ -104,7 +109,10 @@ class MCPClient:
 
     async def disconnect(self):
         # Clean up and close the session
-        await self.exit_stack.aclose()
+        if self.exit_stack:
+            exit_stack, self.exit_stack = self.exit_stack, None
+            await exit_stack.aclose()
+        self.session = None
 
     async def __aenter__(self):
         await self.exit_stack.__aenter__()
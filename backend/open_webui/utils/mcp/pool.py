@@ -0,0 +1,234 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Optional
+
+from mcp import types
+
+from open_webui.utils.mcp.client import MCPClient
+
+log = logging.getLogger(__name__)
+
+
+class MCPPooledSession:
+    """
+    An MCP client session owned by the pool.
+
+    The connection is opened and closed by a dedicated task, as the
+    underlying anyio task groups must be exited from the task that entered
+    them. Requests from any task can share the session concurrently.
+    """
+
+    def __init__(self, key: str, url: str, headers: Optional[dict]):
+        self.key = key
+        self.url = url
+        self.headers = headers
+
+        self.client = MCPClient()
+        self.tool_specs: Optional[list[dict]] = None
+
+        self.in_use = 0
+        self.last_used = time.monotonic()
+        self.last_checked = time.monotonic()
+
+        self._ready: Optional[asyncio.Future] = None
+        self._closing = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def connected(self) -> bool:
+        return (
+            self._task is not None
+            and not self._task.done()
+            and self._ready is not None
+            and self._ready.done()
+            and self._ready.exception() is None
+        )
+
+    async def _message_handler(self, message):
+        if isinstance(message, types.ServerNotification) and isinstance(
+            message.root, types.ToolListChangedNotification
+        ):
+            log.debug(f"MCP tool list changed for {self.url}")
+            self.tool_specs = None
+
+    async def _run(self):
+        try:
+            await self.client.connect(
+                url=self.url,
+                headers=self.headers,
+                message_handler=self._message_handler,
+            )
+            self._ready.set_result(None)
+            await self._closing.wait()
+        except Exception as e:
+            if not self._ready.done():
+                self._ready.set_exception(e)
+            else:
+                log.debug(f"MCP session for {self.url} ended: {e}")
+        finally:
+            try:
+                await self.client.disconnect()
+            except Exception as e:
+                log.debug(f"Error closing MCP session for {self.url}: {e}")
+
+    async def open(self):
+        self._ready = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._run())
+        await asyncio.shield(self._ready)
+
+    async def close(self):
+        self._closing.set()
+        if self._task is not None:
+            try:
+                await self._task
+            except Exception:
+                pass
+
+    async def get_tool_specs(self) -> list[dict]:
+        # Cached until the server announces that its tool list changed
+        tool_specs = self.tool_specs
+        if tool_specs is None:
+            tool_specs = await self.client.list_tool_specs()
+            self.tool_specs = tool_specs
+        return tool_specs
+
+
+class MCPClientPool:
+    """
+    App-lifetime pool of MCP client sessions, keyed by server URL, request
+    headers and user, so chat requests reuse sessions instead of connecting
+    and initializing on every turn. Users never share a session, as servers
+    may keep per-session state even when the credentials are shared.
+
+    Sessions idle for more than `idle_timeout` seconds are closed, sessions
+    idle for more than `health_check_interval` seconds are pinged before
+    they are handed out, and failed connections are retried with
+    exponential backoff.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float = 300,
+        health_check_interval: float = 30,
+        backoff_base: float = 1,
+        backoff_max: float = 60,
+    ):
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._sessions: dict[str, MCPPooledSession] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._failures: dict[str, tuple[int, float]] = {}
+        self._eviction_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def get_key(
+        url: str, headers: Optional[dict] = None, user_id: Optional[str] = None
+    ) -> str:
+        return hashlib.sha256(
+            json.dumps([url, headers or {}, user_id], sort_keys=True).encode()
+        ).hexdigest()
+
+    async def _is_healthy(self, session: MCPPooledSession) -> bool:
+        if not session.connected:
+            return False
+
+        if time.monotonic() - session.last_checked < self.health_check_interval:
+            return True
+
+        try:
+            await asyncio.wait_for(session.client.session.send_ping(), timeout=5)
+            session.last_checked = time.monotonic()
+            return True
+        except Exception as e:
+            log.debug(f"MCP health check failed for {session.url}: {e}")
+            return False
+
+    async def acquire(
+        self,
+        url: str,
+        headers: Optional[dict] = None,
+        user_id: Optional[str] = None,
+    ) -> MCPPooledSession:
+        """
+        Return a connected session for the server, to be handed back with
+        `release` once the request is done.
+        """
+        self._start_eviction()
+
+        key = self.get_key(url, headers, user_id)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+
+        async with lock:
+            session = self._sessions.get(key)
+            if session is not None and not await self._is_healthy(session):
+                self._sessions.pop(key, None)
+                asyncio.create_task(session.close())
+                session = None
+
+            if session is None:
+                failures, retry_at = self._failures.get(key, (0, 0))
+                if time.monotonic() < retry_at:
+                    raise ConnectionError(
+                        f"MCP server {url} is unavailable, retrying in "
+                        f"{retry_at - time.monotonic():.0f}s"
+                    )
+
+                session = MCPPooledSession(key, url, headers)
+                try:
+                    await session.open()
+                except Exception:
+                    delay = min(self.backoff_max, self.backoff_base * 2**failures)
+                    self._failures[key] = (failures + 1, time.monotonic() + delay)
+                    await session.close()
+                    raise
+
+                self._failures.pop(key, None)
+                self._sessions[key] = session
+
+            session.in_use += 1
+            session.last_used = time.monotonic()
+            return session
+
+    def release(self, session: MCPPooledSession):
+        session.in_use = max(0, session.in_use - 1)
+        session.last_used = time.monotonic()
+
+    async def evict_idle(self):
+        now = time.monotonic()
+        for key, session in list(self._sessions.items()):
+            if session.in_use == 0 and (
+                now - session.last_used > self.idle_timeout or not session.connected
+            ):
+                self._sessions.pop(key, None)
+                await session.close()
+
+    def _start_eviction(self):
+        if self._eviction_task is None or self._eviction_task.done():
+            self._eviction_task = asyncio.create_task(self._evict_periodically())
+
+    async def _evict_periodically(self):
+        interval = max(1, min(self.idle_timeout, self.health_check_interval))
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.evict_idle()
+            except Exception as e:
+                log.debug(f"Error evicting idle MCP sessions: {e}")
+
+    async def close(self):
+        if self._eviction_task is not None:
+            self._eviction_task.cancel()
+            self._eviction_task = None
+
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        self._locks.clear()
+        await asyncio.gather(
+            *[session.close() for session in sessions], return_exceptions=True
+        )
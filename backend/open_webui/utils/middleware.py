@@ -13,7 +13,6 @@ import json
 import html
 import inspect
 import re
-import ast
 
 from uuid import uuid4
 from concurrent.futures import ThreadPoolExecutor
@@ -39,6 +38,7 @@ from open_webui.routers.tasks import (
     generate_follow_ups,
     generate_image_prompt,
     generate_chat_tags,
+    generate_background_tasks,
 )
 from open_webui.routers.retrieval import (
     process_web_search,
@@ -75,6 +75,10 @@ from open_webui.retrieval.utils import get_sources_from_items
 
 from open_webui.utils.chat import generate_chat_completion
 from open_webui.utils.task import (
+    TaskResultCache,
+    get_background_task_results,
+    get_task_input_hash,
+    get_task_response_json,
     get_task_model_id,
     rag_template,
     tools_function_calling_generation_template,
@@ -94,18 +98,20 @@ from open_webui.utils.misc import (
     get_content_from_message,
 )
 from open_webui.utils.tools import (
+    ToolCallAssembler,
+    execute_tool_calls,
     get_tools,
     get_updated_tool_function,
     has_tool_server_access,
+    parse_tool_call_arguments,
 )
 from open_webui.utils.plugin import load_function_module_by_id
 from open_webui.utils.filter import (
     get_sorted_filter_ids,
     process_filter_functions,
+    FilterPipeline,
 )
-from open_webui.utils.code_interpreter import execute_code_jupyter
 from open_webui.utils.payload import apply_system_prompt_to_body
-from open_webui.utils.mcp.client import MCPClient
 
 
 from open_webui.config import (
@@ -120,9 +126,12 @@ from open_webui.env import (
     ENABLE_CHAT_RESPONSE_BASE64_IMAGE_URL_CONVERSION,
     CHAT_RESPONSE_STREAM_DELTA_CHUNK_SIZE,
     CHAT_RESPONSE_MAX_TOOL_CALL_RETRIES,
+    CHAT_RESPONSE_TOOL_CALL_CONCURRENCY,
+    CHAT_RESPONSE_TOOL_CALL_TIMEOUT,
     BYPASS_MODEL_ACCESS_CONTROL,
     ENABLE_REALTIME_CHAT_SAVE,
     ENABLE_QUERIES_CACHE,
+    ENABLE_BACKGROUND_TASKS_BATCHING,
     RAG_SYSTEM_CONTEXT,
 )
 from open_webui.constants import TASKS
@@ -1626,6 +1635,10 @@ async def process_chat_payload(request, form_data, user, metadata, model):
         # Remove duplicate files based on their content
         files = list({json.dumps(f, sort_keys=True): f for f in files}.values())
 
+    # Pooled MCP sessions are tracked in the caller's metadata as soon as they
+    # are acquired, so they are released even if building the payload fails
+    mcp_clients = metadata.setdefault("mcp_clients", {})
+
     metadata = {
         **metadata,
         "tool_ids": tool_ids,
@@ -1643,7 +1656,6 @@ async def process_chat_payload(request, form_data, user, metadata, model):
 
     tools_dict = {}
 
-    mcp_clients = {}
     mcp_tools_dict = {}
 
     if tool_ids:
@@ -1715,10 +1727,14 @@ async def process_chat_payload(request, form_data, user, metadata, model):
                         for key, value in connection_headers.items():
                             headers[key] = value
 
-                    mcp_clients[server_id] = MCPClient()
-                    await mcp_clients[server_id].connect(
-                        url=mcp_server_connection.get("url", ""),
-                        headers=headers if headers else None,
+                    # Sessions are pooled across requests and released once
+                    # the response is done
+                    mcp_clients[server_id] = (
+                        await request.app.state.mcp_client_pool.acquire(
+                            url=mcp_server_connection.get("url", ""),
+                            headers=headers if headers else None,
+                            user_id=user.id,
+                        )
                     )
 
                     function_name_filter_list = mcp_server_connection.get(
@@ -1728,7 +1744,7 @@ async def process_chat_payload(request, form_data, user, metadata, model):
                     if isinstance(function_name_filter_list, str):
                         function_name_filter_list = function_name_filter_list.split(",")
 
-                    tool_specs = await mcp_clients[server_id].list_tool_specs()
+                    tool_specs = await mcp_clients[server_id].get_tool_specs()
                     for tool_spec in tool_specs:
 
                         def make_tool_function(client, function_name):
@@ -1748,7 +1764,7 @@ async def process_chat_payload(request, form_data, user, metadata, model):
                                 continue
 
                         tool_function = make_tool_function(
-                            mcp_clients[server_id], tool_spec["name"]
+                            mcp_clients[server_id].client, tool_spec["name"]
                         )
 
                         mcp_tools_dict[f"{server_id}_{tool_spec['name']}"] = {
@@ -1758,7 +1774,7 @@ async def process_chat_payload(request, form_data, user, metadata, model):
                             },
                             "callable": tool_function,
                             "type": "mcp",
-                            "client": mcp_clients[server_id],
+                            "client": mcp_clients[server_id].client,
                             "direct": False,
                         }
                 except Exception as e:
@@ -1802,9 +1818,6 @@ async def process_chat_payload(request, form_data, user, metadata, model):
                     "server": tool_server,
                 }
 
-    if mcp_clients:
-        metadata["mcp_clients"] = mcp_clients
-
     # Inject builtin tools for native function calling based on enabled features and model capability
     # Check if builtin_tools capability is enabled for this model (defaults to True if not specified)
     builtin_tools_enabled = (
@@ -1904,49 +1917,82 @@ async def process_chat_payload(request, form_data, user, metadata, model):
     return form_data, metadata, events
 
 
+# Config attribute holding the custom prompt template of each background task
+BACKGROUND_TASK_TEMPLATES = {
+    "title": "TITLE_GENERATION_PROMPT_TEMPLATE",
+    "tags": "TAGS_GENERATION_PROMPT_TEMPLATE",
+    "follow_ups": "FOLLOW_UP_GENERATION_PROMPT_TEMPLATE",
+}
+
+BACKGROUND_TASK_RESULTS = TaskResultCache()
+
+
+def get_task_message(message: dict) -> dict:
+    """Copy of a chat message reduced to the plain text used by task prompts."""
+    content = message.get("content", "")
+    if isinstance(content, list):
+        for item in content:
+            if item.get("type") == "text":
+                content = item["text"]
+                break
+
+    if isinstance(content, str):
+        # Cheap substring checks spare the regex for most messages
+        if "<details" in content.lower() or "![" in content:
+            content = re.sub(
+                r"<details\b[^>]*>.*?<\/details>|!\[.*?\]\(.*?\)",
+                "",
+                content,
+                flags=re.S | re.I,
+            )
+        content = content.strip()
+
+    return {
+        **message,
+        "role": message.get("role", "assistant"),  # Safe fallback for missing role
+        "content": content,
+    }
+
+
 async def process_chat_response(
-    request, response, form_data, user, metadata, model, events, tasks
+    request,
+    response,
+    form_data,
+    user,
+    metadata,
+    model,
+    events,
+    tasks,
+    task_messages=None,
 ):
-    async def background_tasks_handler():
+    async def background_tasks_handler(content: Optional[str] = None):
         message = None
         messages = []
 
         if "chat_id" in metadata and not metadata["chat_id"].startswith("local:"):
-            messages_map = Chats.get_messages_map_by_chat_id(metadata["chat_id"])
-            message = messages_map.get(metadata["message_id"]) if messages_map else None
-
-            message_list = get_message_list(messages_map, metadata["message_id"])
+            if task_messages is not None and content is not None:
+                # Reuse the conversation already held in memory instead of
+                # reloading and walking the full chat history from the database
+                message = {
+                    "id": metadata["message_id"],
+                    "role": "assistant",
+                    "content": content,
+                    "model": model.get("id", form_data.get("model")),
+                }
+                message_list = [
+                    item for item in task_messages if item.get("role") != "system"
+                ] + [message]
+            else:
+                messages_map = Chats.get_messages_map_by_chat_id(metadata["chat_id"])
+                message = (
+                    messages_map.get(metadata["message_id"]) if messages_map else None
+                )
+                message_list = get_message_list(messages_map, metadata["message_id"])
 
             # Remove details tags and files from the messages.
             # as get_message_list creates a new list, it does not affect
             # the original messages outside of this handler
-
-            messages = []
-            for message in message_list:
-                content = message.get("content", "")
-                if isinstance(content, list):
-                    for item in content:
-                        if item.get("type") == "text":
-                            content = item["text"]
-                            break
-
-                if isinstance(content, str):
-                    content = re.sub(
-                        r"<details\b[^>]*>.*?<\/details>|!\[.*?\]\(.*?\)",
-                        "",
-                        content,
-                        flags=re.S | re.I,
-                    ).strip()
-
-                messages.append(
-                    {
-                        **message,
-                        "role": message.get(
-                            "role", "assistant"
-                        ),  # Safe fallback for missing role
-                        "content": content,
-                    }
-                )
+            messages = [get_task_message(item) for item in message_list]
         else:
             # Local temp chat, get the model and message from the form_data
             message = get_last_user_message_item(form_data.get("messages", []))
@@ -1954,179 +2000,176 @@ async def process_chat_response(
             if message:
                 message["model"] = form_data.get("model")
 
-        if message and "model" in message:
-            if tasks and messages:
-                if (
-                    TASKS.FOLLOW_UP_GENERATION in tasks
-                    and tasks[TASKS.FOLLOW_UP_GENERATION]
-                ):
-                    res = await generate_follow_ups(
-                        request,
-                        {
-                            "model": message["model"],
-                            "messages": messages,
-                            "message_id": metadata["message_id"],
-                            "chat_id": metadata["chat_id"],
-                        },
-                        user,
-                    )
-
-                    if res and isinstance(res, dict):
-                        if len(res.get("choices", [])) == 1:
-                            response_message = res.get("choices", [])[0].get(
-                                "message", {}
-                            )
-
-                            follow_ups_string = response_message.get(
-                                "content"
-                            ) or response_message.get("reasoning_content", "")
-                        else:
-                            follow_ups_string = ""
-
-                        follow_ups_string = follow_ups_string[
-                            follow_ups_string.find("{") : follow_ups_string.rfind("}")
-                            + 1
-                        ]
+        if not (message and "model" in message and tasks and messages):
+            return
+
+        chat_id = metadata.get("chat_id", "")
+        # Only update titles and tags for non-temp chats
+        is_temporary_chat = chat_id.startswith("local:")
+
+        task_keys = []
+        if tasks.get(TASKS.FOLLOW_UP_GENERATION):
+            task_keys.append("follow_ups")
+        if not is_temporary_chat:
+            if tasks.get(TASKS.TITLE_GENERATION):
+                task_keys.append("title")
+            if tasks.get(TASKS.TAGS_GENERATION):
+                task_keys.append("tags")
+
+        # Skip regeneration when the same conversation was already processed
+        input_hash = get_task_input_hash(message["model"], messages)
+        cached_results = {}
+        for key in task_keys:
+            result = BACKGROUND_TASK_RESULTS.get(chat_id, key, input_hash)
+            if result is not None:
+                cached_results[key] = result
+
+        # key -> parsed JSON object, or None if the response could not be parsed
+        results = {}
+        pending_keys = [key for key in task_keys if key not in cached_results]
+
+        task_form_data = {
+            "model": message["model"],
+            "messages": messages,
+            "chat_id": chat_id,
+        }
 
-                        try:
-                            follow_ups = json.loads(follow_ups_string).get(
-                                "follow_ups", []
-                            )
-                            await event_emitter(
-                                {
-                                    "type": "chat:message:follow_ups",
-                                    "data": {
-                                        "follow_ups": follow_ups,
-                                    },
-                                }
-                            )
+        async def run_task(key):
+            generator = {
+                "follow_ups": generate_follow_ups,
+                "title": generate_title,
+                "tags": generate_chat_tags,
+            }[key]
+            form = {**task_form_data}
+            if key == "follow_ups":
+                form["message_id"] = metadata["message_id"]
 
-                            if not metadata.get("chat_id", "").startswith("local:"):
-                                Chats.upsert_message_to_chat_by_id_and_message_id(
-                                    metadata["chat_id"],
-                                    metadata["message_id"],
-                                    {
-                                        "followUps": follow_ups,
-                                    },
-                                )
+            try:
+                res = await generator(request, form, user)
+            except Exception as e:
+                log.debug(f"Error generating {key}: {e}")
+                return
 
-                        except Exception as e:
-                            pass
-
-                if not metadata.get("chat_id", "").startswith(
-                    "local:"
-                ):  # Only update titles and tags for non-temp chats
-                    if TASKS.TITLE_GENERATION in tasks:
-                        user_message = get_last_user_message(messages)
-                        if user_message and len(user_message) > 100:
-                            user_message = user_message[:100] + "..."
-
-                        title = None
-                        if tasks[TASKS.TITLE_GENERATION]:
-                            res = await generate_title(
-                                request,
-                                {
-                                    "model": message["model"],
-                                    "messages": messages,
-                                    "chat_id": metadata["chat_id"],
-                                },
-                                user,
-                            )
+            if res and isinstance(res, dict):
+                results[key] = get_task_response_json(res)
 
-                            if res and isinstance(res, dict):
-                                if len(res.get("choices", [])) == 1:
-                                    response_message = res.get("choices", [])[0].get(
-                                        "message", {}
-                                    )
+        async def run_batched_tasks(keys):
+            try:
+                res = await generate_background_tasks(
+                    request,
+                    {
+                        **task_form_data,
+                        "message_id": metadata["message_id"],
+                        "tasks": keys,
+                    },
+                    user,
+                )
+            except Exception as e:
+                log.debug(f"Error generating background tasks: {e}")
+                res = None
+
+            # Fall back to separate calls for anything the combined call missed
+            batched_results, missing_keys = get_background_task_results(res, keys)
+            results.update(batched_results)
+            await asyncio.gather(*[run_task(key) for key in missing_keys])
+
+        # Tasks using the default prompt templates share one task model call,
+        # tasks with custom templates run separately and concurrently
+        batched_keys = []
+        if ENABLE_BACKGROUND_TASKS_BATCHING:
+            batched_keys = [
+                key
+                for key in pending_keys
+                if getattr(request.app.state.config, BACKGROUND_TASK_TEMPLATES[key])
+                == ""
+            ]
+            if len(batched_keys) < 2:
+                batched_keys = []
 
-                                    title_string = (
-                                        response_message.get("content")
-                                        or response_message.get(
-                                            "reasoning_content",
-                                        )
-                                        or message.get("content", user_message)
-                                    )
-                                else:
-                                    title_string = ""
+        await asyncio.gather(
+            *([run_batched_tasks(batched_keys)] if batched_keys else []),
+            *[run_task(key) for key in pending_keys if key not in batched_keys],
+        )
 
-                                title_string = title_string[
-                                    title_string.find("{") : title_string.rfind("}") + 1
-                                ]
+        if "follow_ups" in cached_results or results.get("follow_ups") is not None:
+            follow_ups = cached_results.get("follow_ups")
+            if follow_ups is None:
+                follow_ups = results["follow_ups"].get("follow_ups", [])
+                BACKGROUND_TASK_RESULTS.set(
+                    chat_id, "follow_ups", input_hash, follow_ups
+                )
 
-                                try:
-                                    title = json.loads(title_string).get(
-                                        "title", user_message
-                                    )
-                                except Exception as e:
-                                    title = ""
+            await event_emitter(
+                {
+                    "type": "chat:message:follow_ups",
+                    "data": {
+                        "follow_ups": follow_ups,
+                    },
+                }
+            )
 
-                                if not title:
-                                    title = messages[0].get("content", user_message)
+            if not is_temporary_chat:
+                Chats.upsert_message_to_chat_by_id_and_message_id(
+                    chat_id,
+                    metadata["message_id"],
+                    {
+                        "followUps": follow_ups,
+                    },
+                )
 
-                                Chats.update_chat_title_by_id(
-                                    metadata["chat_id"], title
-                                )
+        if is_temporary_chat:
+            return
 
-                                await event_emitter(
-                                    {
-                                        "type": "chat:title",
-                                        "data": title,
-                                    }
-                                )
+        if TASKS.TITLE_GENERATION in tasks and "title" not in cached_results:
+            user_message = get_last_user_message(messages)
+            if user_message and len(user_message) > 100:
+                user_message = user_message[:100] + "..."
 
-                        if title == None and len(messages) == 2:
-                            title = messages[0].get("content", user_message)
+            title = None
+            if "title" in results:
+                title = (
+                    results["title"].get("title", user_message)
+                    if results["title"]
+                    else ""
+                )
 
-                            Chats.update_chat_title_by_id(metadata["chat_id"], title)
+                if not title:
+                    title = messages[0].get("content", user_message)
+                else:
+                    BACKGROUND_TASK_RESULTS.set(chat_id, "title", input_hash, title)
 
-                            await event_emitter(
-                                {
-                                    "type": "chat:title",
-                                    "data": message.get("content", user_message),
-                                }
-                            )
+                Chats.update_chat_title_by_id(chat_id, title)
 
-                    if TASKS.TAGS_GENERATION in tasks and tasks[TASKS.TAGS_GENERATION]:
-                        res = await generate_chat_tags(
-                            request,
-                            {
-                                "model": message["model"],
-                                "messages": messages,
-                                "chat_id": metadata["chat_id"],
-                            },
-                            user,
-                        )
+                await event_emitter(
+                    {
+                        "type": "chat:title",
+                        "data": title,
+                    }
+                )
 
-                        if res and isinstance(res, dict):
-                            if len(res.get("choices", [])) == 1:
-                                response_message = res.get("choices", [])[0].get(
-                                    "message", {}
-                                )
+            if title == None and len(messages) == 2:
+                title = messages[0].get("content", user_message)
 
-                                tags_string = response_message.get(
-                                    "content"
-                                ) or response_message.get("reasoning_content", "")
-                            else:
-                                tags_string = ""
+                Chats.update_chat_title_by_id(chat_id, title)
 
-                            tags_string = tags_string[
-                                tags_string.find("{") : tags_string.rfind("}") + 1
-                            ]
+                await event_emitter(
+                    {
+                        "type": "chat:title",
+                        "data": message.get("content", user_message),
+                    }
+                )
 
-                            try:
-                                tags = json.loads(tags_string).get("tags", [])
-                                Chats.update_chat_tags_by_id(
-                                    metadata["chat_id"], tags, user
-                                )
+        if results.get("tags") is not None:
+            tags = results["tags"].get("tags", [])
+            Chats.update_chat_tags_by_id(chat_id, tags, user)
+            BACKGROUND_TASK_RESULTS.set(chat_id, "tags", input_hash, tags)
 
-                                await event_emitter(
-                                    {
-                                        "type": "chat:tags",
-                                        "data": tags,
-                                    }
-                                )
-                            except Exception as e:
-                                pass
+            await event_emitter(
+                {
+                    "type": "chat:tags",
+                    "data": tags,
+                }
+            )
 
     event_emitter = None
     event_caller = None
@@ -2247,7 +2290,7 @@ async def process_chat_response(
                                         },
                                     )
 
-                            await background_tasks_handler()
+                            await background_tasks_handler(content)
 
                     if events and isinstance(events, list):
                         extra_response = {}
@@ -2325,6 +2368,9 @@ async def process_chat_response(
         )
     ]
 
+    # Stream filters run on every chunk, resolve them once per response
+    stream_filters = FilterPipeline(request, filter_functions, "stream")
+
     # Streaming response
     if event_emitter and event_caller:
         task_id = str(uuid4())  # Create a unique task ID.
@@ -2765,7 +2811,7 @@ async def process_chat_response(
                     nonlocal content
                     nonlocal content_blocks
 
-                    response_tool_calls = []
+                    tool_call_assembler = ToolCallAssembler()
 
                     delta_count = 0
                     delta_chunk_size = max(
@@ -2813,12 +2859,8 @@ async def process_chat_response(
                         try:
                             data = json.loads(data)
 
-                            data, _ = await process_filter_functions(
-                                request=request,
-                                filter_functions=filter_functions,
-                                filter_type="stream",
-                                form_data=data,
-                                extra_params={"__body__": form_data, **extra_params},
+                            data, _ = await stream_filters.process(
+                                data, {"__body__": form_data, **extra_params}
                             )
 
                             if data:
@@ -2909,72 +2951,19 @@ async def process_chat_response(
 
                                     delta_tool_calls = delta.get("tool_calls", None)
                                     if delta_tool_calls:
-                                        for delta_tool_call in delta_tool_calls:
-                                            tool_call_index = delta_tool_call.get(
-                                                "index"
-                                            )
-
-                                            if tool_call_index is not None:
-                                                # Check if the tool call already exists
-                                                current_response_tool_call = None
-                                                for (
-                                                    response_tool_call
-                                                ) in response_tool_calls:
-                                                    if (
-                                                        response_tool_call.get("index")
-                                                        == tool_call_index
-                                                    ):
-                                                        current_response_tool_call = (
-                                                            response_tool_call
-                                                        )
-                                                        break
-
-                                                if current_response_tool_call is None:
-                                                    # Add the new tool call
-                                                    delta_tool_call.setdefault(
-                                                        "function", {}
-                                                    )
-                                                    delta_tool_call[
-                                                        "function"
-                                                    ].setdefault("name", "")
-                                                    delta_tool_call[
-                                                        "function"
-                                                    ].setdefault("arguments", "")
-                                                    response_tool_calls.append(
-                                                        delta_tool_call
-                                                    )
-                                                else:
-                                                    # Update the existing tool call
-                                                    delta_name = delta_tool_call.get(
-                                                        "function", {}
-                                                    ).get("name")
-                                                    delta_arguments = (
-                                                        delta_tool_call.get(
-                                                            "function", {}
-                                                        ).get("arguments")
-                                                    )
-
-                                                    if delta_name:
-                                                        current_response_tool_call[
-                                                            "function"
-                                                        ]["name"] += delta_name
+                                        tool_call_assembler.add(delta_tool_calls)
 
-                                                    if delta_arguments:
-                                                        current_response_tool_call[
-                                                            "function"
-                                                        ][
-                                                            "arguments"
-                                                        ] += delta_arguments
-
-                                        # Emit pending tool calls in real-time
-                                        if response_tool_calls:
+                                        # Emit pending tool calls in real-time,
+                                        # throttled as each preview copies the
+                                        # arguments so far
+                                        if tool_call_assembler.is_preview_due():
                                             # Flush any pending text first
                                             await flush_pending_delta_data()
 
                                             pending_content_blocks = content_blocks + [
                                                 {
                                                     "type": "tool_calls",
-                                                    "content": response_tool_calls,
+                                                    "content": tool_call_assembler.get_pending_tool_calls(),
                                                     "pending": True,
                                                 }
                                             ]
@@ -3193,8 +3182,8 @@ async def process_chat_response(
                                     - reasoning_block["started_at"]
                                 )
 
-                    if response_tool_calls:
-                        tool_calls.append(response_tool_calls)
+                    if tool_call_assembler:
+                        tool_calls.append(tool_call_assembler.tool_calls)
 
                     if response.background:
                         await response.background()
@@ -3231,28 +3220,15 @@ async def process_chat_response(
 
                     tools = metadata.get("tools", {})
 
-                    results = []
-
-                    for tool_call in response_tool_calls:
+                    async def execute_tool_call(tool_call):
                         tool_call_id = tool_call.get("id", "")
                         tool_function_name = tool_call.get("function", {}).get(
                             "name", ""
                         )
                         tool_args = tool_call.get("function", {}).get("arguments", "{}")
 
-                        tool_function_params = {}
-                        try:
-                            # json.loads cannot be used because some models do not produce valid JSON
-                            tool_function_params = ast.literal_eval(tool_args)
-                        except Exception as e:
-                            log.debug(e)
-                            # Fallback to JSON parsing
-                            try:
-                                tool_function_params = json.loads(tool_args)
-                            except Exception as e:
-                                log.error(
-                                    f"Error parsing tool call arguments: {tool_args}"
-                                )
+                        # Some models do not produce valid JSON, which is repaired where possible
+                        tool_function_params = parse_tool_call_arguments(tool_args)
 
                         # Mutate the original tool call response params as they are passed back to the passed
                         # back to the LLM via the content blocks. If they are in a json block and are invalid json,
@@ -3292,7 +3268,7 @@ async def process_chat_response(
                                 }
 
                                 if direct_tool:
-                                    tool_result = await event_caller(
+                                    tool_coroutine = event_caller(
                                         {
                                             "type": "execute:tool",
                                             "data": {
@@ -3318,10 +3294,15 @@ async def process_chat_response(
                                         },
                                     )
 
-                                    tool_result = await tool_function(
+                                    tool_coroutine = tool_function(
                                         **tool_function_params
                                     )
 
+                                tool_result = await asyncio.wait_for(
+                                    tool_coroutine, CHAT_RESPONSE_TOOL_CALL_TIMEOUT
+                                )
+                            except asyncio.TimeoutError:
+                                tool_result = f"Tool {tool_function_name} timed out after {CHAT_RESPONSE_TOOL_CALL_TIMEOUT} seconds"
                             except Exception as e:
                                 tool_result = str(e)
 
@@ -3338,6 +3319,7 @@ async def process_chat_response(
                         )
 
                         # Extract citation sources from tool results
+                        citation_sources = []
                         if (
                             tool_function_name
                             in [
@@ -3354,11 +3336,10 @@ async def process_chat_response(
                                     tool_result=tool_result,
                                     tool_id=tool.get("tool_id", "") if tool else "",
                                 )
-                                tool_call_sources.extend(citation_sources)
                             except Exception as e:
                                 log.exception(f"Error extracting citation source: {e}")
 
-                        results.append(
+                        return (
                             {
                                 "tool_call_id": tool_call_id,
                                 "content": tool_result or "",
@@ -3372,9 +3353,25 @@ async def process_chat_response(
                                     if tool_result_embeds
                                     else {}
                                 ),
-                            }
+                            },
+                            citation_sources,
                         )
 
+                    def is_serial_tool_call(tool_call):
+                        tool = tools.get(tool_call.get("function", {}).get("name", ""))
+                        return bool(tool and tool.get("serial", False))
+
+                    # Independent tool calls run concurrently, results keep call order
+                    results = []
+                    for result, citation_sources in await execute_tool_calls(
+                        response_tool_calls,
+                        execute_tool_call,
+                        is_serial_tool_call,
+                        concurrency=CHAT_RESPONSE_TOOL_CALL_CONCURRENCY,
+                    ):
+                        results.append(result)
+                        tool_call_sources.extend(citation_sources)
+
                     content_blocks[-1]["results"] = results
                     content_blocks.append(
                         {
@@ -3503,7 +3500,7 @@ async def process_chat_response(
                                     request.app.state.config.CODE_INTERPRETER_ENGINE
                                     == "jupyter"
                                 ):
-                                    output = await execute_code_jupyter(
+                                    output = await request.app.state.jupyter_kernel_pool.execute(
                                         request.app.state.config.CODE_INTERPRETER_JUPYTER_URL,
                                         code,
                                         (
@@ -3519,6 +3516,8 @@ async def process_chat_response(
                                             else None
                                         ),
                                         request.app.state.config.CODE_INTERPRETER_JUPYTER_TIMEOUT,
+                                        session_id=metadata.get("chat_id"),
+                                        user_id=user.id,
                                     )
                                 else:
                                     output = {
@@ -3656,7 +3655,7 @@ async def process_chat_response(
                     }
                 )
 
-                await background_tasks_handler()
+                await background_tasks_handler(serialize_content_blocks(content_blocks))
             except asyncio.CancelledError:
                 log.warning("Task was cancelled!")
                 await event_emitter({"type": "chat:tasks:cancel"})
@@ -3683,25 +3682,13 @@ async def process_chat_response(
                 return f"data: {item}\n\n"
 
             for event in events:
-                event, _ = await process_filter_functions(
-                    request=request,
-                    filter_functions=filter_functions,
-                    filter_type="stream",
-                    form_data=event,
-                    extra_params=extra_params,
-                )
+                event, _ = await stream_filters.process(event, extra_params)
 
                 if event:
                     yield wrap_item(json.dumps(event))
 
             async for data in original_generator:
-                data, _ = await process_filter_functions(
-                    request=request,
-                    filter_functions=filter_functions,
-                    filter_type="stream",
-                    form_data=data,
-                    extra_params=extra_params,
-                )
+                data, _ = await stream_filters.process(data, extra_params)
 
                 if data:
                     yield data
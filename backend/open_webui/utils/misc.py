@@ -6,7 +6,8 @@ import uuid
 import logging
 from datetime import timedelta
 from pathlib import Path
-from typing import Callable, Optional, Sequence, Union
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Sequence, Union
+import codecs
 import json
 import aiohttp
 import mimeparse
@@ -401,6 +402,108 @@ def sanitize_data_for_db(obj):
     return obj
 
 
+async def iter_json_array_items(
+    read: Callable[[int], Awaitable[bytes]],
+    chunk_size: int = 64 * 1024,
+    max_item_size: int = 64 * 1024 * 1024,
+) -> AsyncIterator[tuple[Any, int]]:
+    """
+    Incrementally parse a top-level JSON array, yielding (item, bytes_read)
+    for each element. Only the element being decoded is held in memory, so
+    arbitrarily large exports can be processed with bounded memory.
+
+    :param read: Async reader returning up to n bytes, b"" at EOF (e.g. UploadFile.read).
+    :param max_item_size: Largest element accepted, in characters. A longer
+        (or malformed) element raises instead of being buffered until EOF.
+    """
+    decoder = json.JSONDecoder()
+    utf8_decoder = codecs.getincrementaldecoder("utf-8")()
+
+    buffer = ""
+    bytes_read = 0
+    eof = False
+    started = False
+    # Set after "[" and ",", cleared after each element
+    expect_value = True
+    # Whether "]" may close the array here, i.e. not right after a ","
+    can_close = True
+
+    async def fill(size: int) -> bool:
+        nonlocal buffer, bytes_read, eof
+        if eof:
+            return False
+        data = await read(size)
+        if not data:
+            eof = True
+            buffer += utf8_decoder.decode(b"", final=True)
+            return False
+        bytes_read += len(data)
+        buffer += utf8_decoder.decode(data)
+        return True
+
+    while True:
+        buffer = buffer.lstrip()
+        if not buffer:
+            if not await fill(chunk_size):
+                if started:
+                    raise ValueError("Unexpected end of JSON array")
+                return
+            continue
+
+        if not started:
+            if buffer.startswith("\ufeff"):
+                buffer = buffer[1:]
+                continue
+            if buffer[0] != "[":
+                raise ValueError("Expected a JSON array")
+            buffer = buffer[1:]
+            started = True
+            continue
+
+        if buffer[0] == "]":
+            if not can_close:
+                raise ValueError("Trailing comma in JSON array")
+            return
+
+        if not expect_value:
+            if buffer[0] != ",":
+                raise ValueError(
+                    f"Expected ',' or ']' in JSON array, got {buffer[0]!r}"
+                )
+            buffer = buffer[1:]
+            expect_value = True
+            can_close = False
+            continue
+
+        if buffer[0] == ",":
+            raise ValueError("Missing value in JSON array")
+
+        try:
+            item, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            if len(buffer) > max_item_size:
+                raise ValueError(
+                    f"JSON array element exceeds {max_item_size} characters"
+                )
+            # Element not complete yet; grow geometrically to keep parsing linear
+            if not await fill(min(max(chunk_size, len(buffer)), max_item_size)):
+                raise
+            continue
+
+        if not isinstance(item, (dict, list, str)) and (
+            buffer[end : end + 1] in "+-.0123456789eE"
+        ):
+            # A number cut at the chunk boundary (e.g. "12|34" or "1.|5") may
+            # be incomplete
+            if await fill(chunk_size):
+                continue
+
+        buffer = buffer[end:]
+        expect_value = False
+        can_close = True
+        yield item, bytes_read
+
+
 def extract_folders_after_data_docs(path):
     # Convert the path to a Path object if it's not already
     path = Path(path)
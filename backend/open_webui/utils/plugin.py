@@ -1,18 +1,41 @@
 import os
 import re
+import json
+import asyncio
+import contextvars
+import inspect
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from importlib import util
+from uuid import uuid4
 import types
 import tempfile
 import logging
 
-from open_webui.env import PIP_OPTIONS, PIP_PACKAGE_INDEX_OPTIONS, OFFLINE_MODE
+from opentelemetry import metrics
+
+from open_webui.env import (
+    PIP_OPTIONS,
+    PIP_PACKAGE_INDEX_OPTIONS,
+    OFFLINE_MODE,
+    REDIS_KEY_PREFIX,
+    PLUGIN_EXECUTION_MODE,
+    PLUGIN_EXECUTION_THREADS,
+    PLUGIN_EXECUTION_TIMEOUT,
+)
 from open_webui.models.functions import Functions
 from open_webui.models.tools import Tools
 
 log = logging.getLogger(__name__)
 
+REDIS_PLUGIN_CHANNEL = f"{REDIS_KEY_PREFIX}:plugins:invalidate"
+
+# Identifies this process, so it can skip its own invalidation messages
+PLUGIN_WORKER_ID = str(uuid4())
+
 
 def extract_frontmatter(content):
     """
@@ -166,73 +189,87 @@ def load_function_module_by_id(function_id: str, content: str | None = None):
 
 
 def get_tool_module_from_cache(request, tool_id, load_from_db=True):
+    if not hasattr(request.app.state, "TOOLS"):
+        request.app.state.TOOLS = {}
+
+    if not hasattr(request.app.state, "TOOL_VERSIONS"):
+        request.app.state.TOOL_VERSIONS = {}
+
     if load_from_db:
-        # Always load from the database by default
+        # Always check the database by default, only comparing the version
+        # (updated_at) so the content is only fetched when it changed
+        version = Tools.get_tool_updated_at_by_id(tool_id)
+        if (
+            version is not None
+            and tool_id in request.app.state.TOOLS
+            and request.app.state.TOOL_VERSIONS.get(tool_id) == version
+        ):
+            return request.app.state.TOOLS[tool_id], None
+
         tool = Tools.get_tool_by_id(tool_id)
         if not tool:
             raise Exception(f"Tool not found: {tool_id}")
         content = tool.content
+        version = tool.updated_at
 
         new_content = replace_imports(content)
         if new_content != content:
             content = new_content
             # Update the tool content in the database
-            Tools.update_tool_by_id(tool_id, {"content": content})
-
-        if (
-            hasattr(request.app.state, "TOOL_CONTENTS")
-            and tool_id in request.app.state.TOOL_CONTENTS
-        ) and (
-            hasattr(request.app.state, "TOOLS") and tool_id in request.app.state.TOOLS
-        ):
-            if request.app.state.TOOL_CONTENTS[tool_id] == content:
-                return request.app.state.TOOLS[tool_id], None
+            tool = Tools.update_tool_by_id(tool_id, {"content": content})
+            if tool:
+                version = tool.updated_at
 
         tool_module, frontmatter = load_tool_module_by_id(tool_id, content)
     else:
-        if hasattr(request.app.state, "TOOLS") and tool_id in request.app.state.TOOLS:
+        if tool_id in request.app.state.TOOLS:
             return request.app.state.TOOLS[tool_id], None
 
+        version = None
         tool_module, frontmatter = load_tool_module_by_id(tool_id)
 
-    if not hasattr(request.app.state, "TOOLS"):
-        request.app.state.TOOLS = {}
-
-    if not hasattr(request.app.state, "TOOL_CONTENTS"):
-        request.app.state.TOOL_CONTENTS = {}
-
     request.app.state.TOOLS[tool_id] = tool_module
-    request.app.state.TOOL_CONTENTS[tool_id] = content
+    request.app.state.TOOL_VERSIONS[tool_id] = version
 
     return tool_module, frontmatter
 
 
 def get_function_module_from_cache(request, function_id, load_from_db=True):
+    if not hasattr(request.app.state, "FUNCTIONS"):
+        request.app.state.FUNCTIONS = {}
+
+    if not hasattr(request.app.state, "FUNCTION_VERSIONS"):
+        request.app.state.FUNCTION_VERSIONS = {}
+
     if load_from_db:
-        # Always load from the database by default
+        # Always check the database by default
         # This is useful for hooks like "inlet" or "outlet" where the content might change
-        # and we want to ensure the latest content is used.
+        # and we want to ensure the latest content is used. Only the version
+        # (updated_at) is queried, the content is only fetched when it changed.
+
+        version = Functions.get_function_updated_at_by_id(function_id)
+        if (
+            version is not None
+            and function_id in request.app.state.FUNCTIONS
+            and request.app.state.FUNCTION_VERSIONS.get(function_id) == version
+        ):
+            return request.app.state.FUNCTIONS[function_id], None, None
 
         function = Functions.get_function_by_id(function_id)
         if not function:
             raise Exception(f"Function not found: {function_id}")
         content = function.content
+        version = function.updated_at
 
         new_content = replace_imports(content)
         if new_content != content:
             content = new_content
             # Update the function content in the database
-            Functions.update_function_by_id(function_id, {"content": content})
-
-        if (
-            hasattr(request.app.state, "FUNCTION_CONTENTS")
-            and function_id in request.app.state.FUNCTION_CONTENTS
-        ) and (
-            hasattr(request.app.state, "FUNCTIONS")
-            and function_id in request.app.state.FUNCTIONS
-        ):
-            if request.app.state.FUNCTION_CONTENTS[function_id] == content:
-                return request.app.state.FUNCTIONS[function_id], None, None
+            function = Functions.update_function_by_id(
+                function_id, {"content": content}
+            )
+            if function:
+                version = function.updated_at
 
         function_module, function_type, frontmatter = load_function_module_by_id(
             function_id, content
@@ -241,28 +278,144 @@ def get_function_module_from_cache(request, function_id, load_from_db=True):
         # Load from cache (e.g. "stream" hook)
         # This is useful for performance reasons
 
-        if (
-            hasattr(request.app.state, "FUNCTIONS")
-            and function_id in request.app.state.FUNCTIONS
-        ):
+        if function_id in request.app.state.FUNCTIONS:
             return request.app.state.FUNCTIONS[function_id], None, None
 
+        version = None
         function_module, function_type, frontmatter = load_function_module_by_id(
             function_id
         )
 
-    if not hasattr(request.app.state, "FUNCTIONS"):
-        request.app.state.FUNCTIONS = {}
-
-    if not hasattr(request.app.state, "FUNCTION_CONTENTS"):
-        request.app.state.FUNCTION_CONTENTS = {}
-
     request.app.state.FUNCTIONS[function_id] = function_module
-    request.app.state.FUNCTION_CONTENTS[function_id] = content
+    request.app.state.FUNCTION_VERSIONS[function_id] = version
 
     return function_module, function_type, frontmatter
 
 
+def invalidate_plugin_module(app, type: str, id: str):
+    """
+    Drop the cached module of a function or tool, so it is loaded again from
+    the database on next use.
+    """
+    if type == "function":
+        modules = getattr(app.state, "FUNCTIONS", {})
+        versions = getattr(app.state, "FUNCTION_VERSIONS", {})
+    else:
+        modules = getattr(app.state, "TOOLS", {})
+        versions = getattr(app.state, "TOOL_VERSIONS", {})
+
+    modules.pop(id, None)
+    versions.pop(id, None)
+
+
+async def publish_plugin_invalidation(request, type: str, id: str):
+    """
+    Tell the other workers that a function or tool changed, or with type
+    "function_valves" that only the valves of a function changed.
+    """
+    redis = getattr(request.app.state, "redis", None)
+    if redis is None:
+        return
+
+    try:
+        await redis.publish(
+            REDIS_PLUGIN_CHANNEL,
+            json.dumps({"type": type, "id": id, "worker_id": PLUGIN_WORKER_ID}),
+        )
+    except Exception as e:
+        log.warning(f"Failed to publish invalidation of {type} {id}: {e}")
+
+
+async def redis_plugin_invalidation_listener(app):
+    pubsub = app.state.redis.pubsub()
+    await pubsub.subscribe(REDIS_PLUGIN_CHANNEL)
+
+    async for message in pubsub.listen():
+        if message["type"] != "message":
+            continue
+        try:
+            data = json.loads(message["data"])
+            if data.get("worker_id") == PLUGIN_WORKER_ID:
+                continue
+
+            if data.get("type") != "function_valves":
+                invalidate_plugin_module(app, data.get("type"), data.get("id"))
+            if data.get("type") in ("function", "function_valves"):
+                # Imported here as the filter utils depend on this module
+                from open_webui.utils.filter import invalidate_function_valves
+
+                # Reset the filter plan, whose version can't tell apart
+                # changes made within the same second
+                invalidate_function_valves(data.get("id"))
+        except Exception as e:
+            log.exception(f"Error handling plugin invalidation: {e}")
+
+
+# Separate from the default thread pool, so slow plugins can't starve
+# the sync routes and database calls that run there
+PLUGIN_EXECUTOR = ThreadPoolExecutor(
+    max_workers=PLUGIN_EXECUTION_THREADS, thread_name_prefix="plugin"
+)
+
+PLUGIN_EXECUTION_DURATION = metrics.get_meter(__name__).create_histogram(
+    name="webui.plugins.duration",
+    description="Execution time of function and tool handlers",
+    unit="ms",
+)
+
+
+async def call_plugin_function(
+    plugin_type: str,
+    plugin_id: str,
+    function,
+    *args,
+    timeout: float | None = PLUGIN_EXECUTION_TIMEOUT,
+    inline: bool = False,
+    **kwargs,
+):
+    """
+    Call a handler of a function or tool. Synchronous handlers run in the
+    plugin thread pool (unless PLUGIN_EXECUTION_MODE is "inline" or `inline`
+    is set), so blocking or CPU-heavy plugin code doesn't stall the event loop.
+
+    Raises asyncio.TimeoutError after `timeout` seconds, except for inline
+    synchronous handlers. A timed out synchronous handler can't be
+    interrupted and finishes in the background.
+    """
+    start = time.perf_counter()
+    status = "error"
+    try:
+        if inspect.iscoroutinefunction(function):
+            result = await asyncio.wait_for(function(*args, **kwargs), timeout)
+        elif PLUGIN_EXECUTION_MODE == "thread" and not inline:
+            context = contextvars.copy_context()
+            result = await asyncio.wait_for(
+                asyncio.get_running_loop().run_in_executor(
+                    PLUGIN_EXECUTOR,
+                    partial(context.run, function, *args, **kwargs),
+                ),
+                timeout,
+            )
+        else:
+            result = function(*args, **kwargs)
+
+        status = "ok"
+        return result
+    except asyncio.TimeoutError:
+        status = "timeout"
+        log.warning(f"{plugin_type} {plugin_id} timed out after {timeout}s")
+        raise
+    finally:
+        PLUGIN_EXECUTION_DURATION.record(
+            (time.perf_counter() - start) * 1000,
+            {
+                "plugin.type": plugin_type,
+                "plugin.id": str(plugin_id),
+                "plugin.status": status,
+            },
+        )
+
+
 def install_frontmatter_requirements(requirements: str):
     if OFFLINE_MODE:
         log.info("Offline mode enabled, skipping installation of requirements.")
@@ -1,14 +1,24 @@
+import hashlib
+import json
 import logging
 import math
 import re
+from collections import OrderedDict
 from datetime import datetime
 from typing import Optional, Any
 import uuid
 
 
-from open_webui.utils.misc import get_last_user_message, get_messages_content
+from open_webui.utils.misc import (
+    get_content_from_message,
+    get_last_user_message,
+    get_messages_content,
+)
 
-from open_webui.config import DEFAULT_RAG_TEMPLATE
+from open_webui.config import (
+    DEFAULT_RAG_TEMPLATE,
+    DEFAULT_BACKGROUND_TASKS_GENERATION_INSTRUCTIONS,
+)
 
 
 log = logging.getLogger(__name__)
@@ -260,6 +270,30 @@ def tags_generation_template(
     return template
 
 
+def background_tasks_generation_template(
+    template: str,
+    messages: list[dict],
+    task_keys: list[str],
+    user: Optional[Any] = None,
+) -> str:
+    instructions = [
+        DEFAULT_BACKGROUND_TASKS_GENERATION_INSTRUCTIONS[key] for key in task_keys
+    ]
+    template = template.replace(
+        "{{TASKS}}", "\n".join(instruction for instruction, _ in instructions)
+    )
+    template = template.replace(
+        "{{OUTPUT}}", "{ " + ", ".join(output for _, output in instructions) + " }"
+    )
+
+    prompt = get_last_user_message(messages)
+    template = replace_prompt_variable(template, prompt)
+    template = replace_messages_variable(template, messages)
+
+    template = prompt_template(template, user)
+    return template
+
+
 def image_prompt_generation_template(
     template: str, messages: list[dict], user: Optional[Any] = None
 ) -> str:
@@ -346,3 +380,84 @@ def moa_response_generation_template(
 def tools_function_calling_generation_template(template: str, tools_specs: str) -> str:
     template = template.replace("{{TOOLS}}", tools_specs)
     return template
+
+
+def get_task_input_hash(model_id: str, messages: list[dict]) -> str:
+    """Stable digest of the inputs of a background task."""
+    return hashlib.sha256(
+        json.dumps(
+            [model_id]
+            + [
+                [message.get("role"), get_content_from_message(message) or ""]
+                for message in messages
+            ],
+            ensure_ascii=False,
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+class TaskResultCache:
+    """
+    Bounded, per-process LRU of the last result of each background task per chat,
+    used to skip regenerating titles, tags and follow-ups for unchanged inputs.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._items: OrderedDict[tuple[str, str], tuple[str, Any]] = OrderedDict()
+
+    def get(self, chat_id: str, task: str, input_hash: str) -> Optional[Any]:
+        item = self._items.get((chat_id, task))
+        if item is None or item[0] != input_hash:
+            return None
+
+        self._items.move_to_end((chat_id, task))
+        return item[1]
+
+    def set(self, chat_id: str, task: str, input_hash: str, result: Any):
+        self._items[(chat_id, task)] = (input_hash, result)
+        self._items.move_to_end((chat_id, task))
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+
+def get_task_response_json(res) -> Optional[dict]:
+    """Parse the JSON object returned by a task model completion."""
+    if not (res and isinstance(res, dict)):
+        return None
+
+    if len(res.get("choices", [])) == 1:
+        response_message = res.get("choices", [])[0].get("message", {})
+        content = response_message.get("content") or response_message.get(
+            "reasoning_content", ""
+        )
+    else:
+        content = ""
+
+    try:
+        data = json.loads(content[content.find("{") : content.rfind("}") + 1])
+        return data if isinstance(data, dict) else None
+    except Exception:
+        return None
+
+
+# Expected type of each key of a combined background task response
+BACKGROUND_TASK_RESULT_TYPES = {"title": str, "tags": list, "follow_ups": list}
+
+
+def get_background_task_results(
+    res, task_keys: list[str]
+) -> tuple[dict[str, dict], list[str]]:
+    """
+    Split a combined background task completion into the responses of the
+    single title, tags and follow-up tasks (e.g. {"title": {"title": ...}}),
+    and the keys that are missing or malformed and need a call of their own.
+    """
+    data = get_task_response_json(res) or {}
+
+    results = {}
+    for key in task_keys:
+        if isinstance(data.get(key), BACKGROUND_TASK_RESULT_TYPES[key]):
+            results[key] = {key: data[key]}
+
+    return results, [key for key in task_keys if key not in results]
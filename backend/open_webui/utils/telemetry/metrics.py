@@ -8,6 +8,7 @@ Metrics collected:
 
 * http.server.requests (counter)
 * http.server.duration (histogram, milliseconds)
+* webui.plugins.duration (histogram, milliseconds, per function / tool)
 
 Attributes used: http.method, http.route, http.status_code
 
@@ -92,6 +93,10 @@ def _build_meter_provider(resource: Resource) -> MeterProvider:
             instrument_name="http.server.requests",
             attribute_keys=["http.method", "http.route", "http.status_code"],
         ),
+        View(
+            instrument_name="webui.plugins.duration",
+            attribute_keys=["plugin.type", "plugin.id", "plugin.status"],
+        ),
         View(
             instrument_name="webui.users.total",
         ),
@@ -1,9 +1,11 @@
+import ast
 import inspect
 import logging
 import re
 import inspect
 import aiohttp
 import asyncio
+import hashlib
 import yaml
 import json
 
@@ -24,6 +26,7 @@ from typing import (
     Type,
 )
 from functools import update_wrapper, partial
+from urllib.parse import urlparse
 
 
 from fastapi import Request
@@ -38,7 +41,7 @@ from open_webui.utils.misc import is_string_allowed
 from open_webui.models.tools import Tools
 from open_webui.models.users import UserModel
 from open_webui.models.groups import Groups
-from open_webui.utils.plugin import load_tool_module_by_id
+from open_webui.utils.plugin import call_plugin_function, load_tool_module_by_id
 from open_webui.utils.access_control import has_access
 from open_webui.config import BYPASS_ADMIN_ACCESS_CONTROL
 from open_webui.env import (
@@ -75,6 +78,7 @@ from open_webui.tools.builtin import (
 )
 
 import copy
+from collections import OrderedDict
 
 log = logging.getLogger(__name__)
 
@@ -82,6 +86,9 @@ log = logging.getLogger(__name__)
 def get_async_tool_function_and_apply_extra_params(
     function: Callable, extra_params: dict
 ) -> Callable[..., Awaitable]:
+    # Tools loaded from the database run through the plugin executor
+    tool_id = extra_params.get("__id__")
+
     sig = inspect.signature(function)
     extra_params = {k: v for k, v in extra_params.items() if k in sig.parameters}
     partial_func = partial(function, **extra_params)
@@ -100,7 +107,14 @@ def get_async_tool_function_and_apply_extra_params(
         parameters=parameters, return_annotation=sig.return_annotation
     )
 
-    if inspect.iscoroutinefunction(function):
+    if tool_id is not None:
+
+        async def new_function(*args, **kwargs):
+            return await call_plugin_function(
+                "tool", tool_id, partial_func, *args, **kwargs
+            )
+
+    elif inspect.iscoroutinefunction(function):
         # wrap the functools.partial as python-genai has trouble with it
         # https://github.com/googleapis/python-genai/issues/907
         async def new_function(*args, **kwargs):
@@ -116,19 +130,291 @@ def get_async_tool_function_and_apply_extra_params(
 
     new_function.__function__ = function  # type: ignore
     new_function.__extra_params__ = extra_params  # type: ignore
+    # Kept apart since `__id__` is filtered out for tools that don't take it
+    new_function.__tool_id__ = tool_id  # type: ignore
 
     return new_function
 
 
+def is_serial_tool(module: object, function_name: str) -> bool:
+    """
+    Whether a tool function must not run concurrently with other tool calls.
+    Tools opt in with a `serial` attribute set to True, or to the names of
+    the functions that need it.
+    """
+    serial = getattr(module, "serial", False)
+    if isinstance(serial, (list, tuple, set)):
+        return function_name in serial
+    return serial is True
+
+
+async def execute_tool_calls(
+    tool_calls: list[dict],
+    execute: Callable[[dict], Awaitable[Any]],
+    is_serial: Callable[[dict], bool],
+    concurrency: int = 1,
+) -> list[Any]:
+    """
+    Execute tool calls with at most `concurrency` running at once and return
+    their results in call order. A serial call runs alone, after all earlier
+    calls finished and before any later one starts.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(tool_call):
+        async with semaphore:
+            return await execute(tool_call)
+
+    results = []
+    batch = []
+    for tool_call in tool_calls:
+        if is_serial(tool_call):
+            results.extend(await asyncio.gather(*[run(call) for call in batch]))
+            batch = []
+            results.append(await execute(tool_call))
+        else:
+            batch.append(tool_call)
+
+    results.extend(await asyncio.gather(*[run(call) for call in batch]))
+    return results
+
+
+JSON_STRING_SPECIAL_CHARS = re.compile(r'["\\]')
+JSON_STRUCTURAL_CHARS = re.compile(r'["{}\[\]]')
+
+
+class PartialJSONScanner:
+    """
+    Tracks the strings, arrays and objects left open by JSON fed in
+    fragments, so it can be completed without rescanning what came before.
+    """
+
+    def __init__(self):
+        self.stack = []
+        self.in_string = False
+        self.escape = False
+        self.is_key = False
+        self.last = ""
+
+    def feed(self, fragment: str):
+        stack = self.stack
+        in_string, escape, is_key, last = (
+            self.in_string,
+            self.escape,
+            self.is_key,
+            self.last,
+        )
+
+        # Jump between quotes and brackets rather than stepping through
+        # every character of the (mostly string) arguments
+        pos, end = 0, len(fragment)
+        while pos < end:
+            if in_string:
+                if escape:
+                    escape = False
+                    pos += 1
+                    continue
+                match = JSON_STRING_SPECIAL_CHARS.search(fragment, pos)
+                if match is None:
+                    break
+                pos = match.end()
+                if match.group() == "\\":
+                    escape = True
+                else:
+                    in_string = False
+            else:
+                match = JSON_STRUCTURAL_CHARS.search(fragment, pos)
+                between = fragment[pos : match.start() if match else end].rstrip()
+                if between:
+                    last = between[-1]
+                if match is None:
+                    break
+
+                char = match.group()
+                pos = match.end()
+                if char == '"':
+                    in_string = True
+                    is_key = bool(stack) and stack[-1] == "}" and last in "{,"
+                elif char in "{[":
+                    stack.append("}" if char == "{" else "]")
+                elif stack:
+                    stack.pop()
+                last = char
+
+        self.in_string, self.escape, self.is_key, self.last = (
+            in_string,
+            escape,
+            is_key,
+            last,
+        )
+
+    def close(self, text: str) -> str:
+        """
+        Complete `text`, everything fed so far, by closing any open string,
+        array or object, e.g. '{"query": "wea' becomes '{"query": "wea"}'.
+        """
+        if self.in_string:
+            if self.escape:
+                text = text[:-1]
+            text += '"'
+
+        text = text.rstrip()
+        if text.endswith(","):
+            text = text[:-1]
+        elif text.endswith(":"):
+            text += " null"
+        elif text.endswith('"') and self.is_key and self.last == '"':
+            # A key without its value yet
+            text += ": null"
+        return text + "".join(reversed(self.stack))
+
+
+def parse_tool_call_arguments(arguments: Optional[str]) -> Any:
+    """
+    Parse the arguments of a tool call, repairing the malformed JSON some
+    models produce: code fences, trailing commas and Python literals.
+    Truncated arguments are not completed, so a tool never runs on output
+    cut off e.g. by max_tokens.
+    """
+    if not isinstance(arguments, str):
+        return arguments if arguments is not None else {}
+
+    text = arguments.strip()
+    if not text:
+        return {}
+
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+
+    try:
+        return ast.literal_eval(text)
+    except Exception:
+        pass
+
+    repaired = re.sub(r"^```(?:json)?\s*|\s*```$", "", text)
+    repaired = re.sub(r",\s*([}\]])", r"\1", repaired)
+    try:
+        return json.loads(repaired)
+    except ValueError:
+        log.error(f"Error parsing tool call arguments: {arguments}")
+        return {}
+
+
+class ToolCallAssembler:
+    """
+    Assembles tool calls from streamed `tool_calls` deltas. Argument
+    fragments are buffered per call and joined when the tool calls are read.
+
+    Building the pending preview copies all arguments so far, so it is only
+    due when a call starts or the arguments grew by `preview_growth` of
+    their size (at least `preview_min_chars`), which keeps streaming long
+    arguments linear overall.
+    """
+
+    def __init__(self, preview_min_chars: int = 64, preview_growth: float = 0.125):
+        self.preview_min_chars = preview_min_chars
+        self.preview_growth = preview_growth
+
+        self._tool_calls: dict[int, dict] = {}
+        self._arguments: dict[int, list[str]] = {}
+        self._scanners: dict[int, PartialJSONScanner] = {}
+        self._pending: set[int] = set()
+
+        self._size = 0
+        self._preview_size = 0
+        self._preview_due = False
+
+    def __bool__(self) -> bool:
+        return bool(self._tool_calls)
+
+    def add(self, delta_tool_calls: list[dict]):
+        for delta_tool_call in delta_tool_calls:
+            index = delta_tool_call.get("index")
+            if index is None:
+                continue
+
+            function = delta_tool_call.get("function") or {}
+            tool_call = self._tool_calls.get(index)
+            if tool_call is None:
+                # The first delta of a call carries its id and type
+                delta_tool_call["function"] = function
+                function["name"] = function.get("name") or ""
+                function["arguments"] = function.get("arguments") or ""
+                self._tool_calls[index] = delta_tool_call
+                self._arguments[index] = [function["arguments"]]
+                self._scanners[index] = PartialJSONScanner()
+                self._scanners[index].feed(function["arguments"])
+                self._size += len(function["arguments"])
+                self._preview_due = True
+                continue
+
+            if function.get("name"):
+                tool_call["function"]["name"] += function["name"]
+                self._preview_due = True
+            if function.get("arguments"):
+                self._arguments[index].append(function["arguments"])
+                self._scanners[index].feed(function["arguments"])
+                self._pending.add(index)
+                self._size += len(function["arguments"])
+
+    def is_preview_due(self) -> bool:
+        """Whether the pending tool calls changed enough to show them again."""
+        return self._preview_due or self._size - self._preview_size >= max(
+            self.preview_min_chars, self._preview_size * self.preview_growth
+        )
+
+    def get_arguments(self, index: int) -> str:
+        fragments = self._arguments[index]
+        if index in self._pending:
+            fragments[:] = ["".join(fragments)]
+            self._tool_calls[index]["function"]["arguments"] = fragments[0]
+            self._pending.discard(index)
+        return fragments[0]
+
+    @property
+    def tool_calls(self) -> list[dict]:
+        for index in self._tool_calls:
+            self.get_arguments(index)
+        return list(self._tool_calls.values())
+
+    def get_pending_tool_calls(self) -> list[dict]:
+        """
+        Copies of the tool calls with their arguments so far closed off as
+        JSON, for showing calls while their arguments are still streaming.
+        """
+        self._preview_size = self._size
+        self._preview_due = False
+
+        tool_calls = []
+        for index, tool_call in self._tool_calls.items():
+            arguments = self.get_arguments(index)
+            if arguments.strip():
+                arguments = self._scanners[index].close(arguments)
+            tool_calls.append(
+                {
+                    **tool_call,
+                    "function": {**tool_call["function"], "arguments": arguments},
+                }
+            )
+        return tool_calls
+
+
 def get_updated_tool_function(function: Callable, extra_params: dict):
     # Get the original function and merge updated params
     __function__ = getattr(function, "__function__", None)
     __extra_params__ = getattr(function, "__extra_params__", None)
+    __tool_id__ = getattr(function, "__tool_id__", None)
 
     if __function__ is not None and __extra_params__ is not None:
         return get_async_tool_function_and_apply_extra_params(
             __function__,
-            {**__extra_params__, **extra_params},
+            {
+                **__extra_params__,
+                **({"__id__": __tool_id__} if __tool_id__ is not None else {}),
+                **extra_params,
+            },
         )
 
     return function
@@ -148,6 +434,47 @@ def has_tool_server_access(
     return has_access(user.id, "read", access_control, user_group_ids)
 
 
+# Normalized specs of local tools, reused while the tool version (updated_at)
+# and its loaded module stay the same
+TOOL_SPECS_CACHE: dict[str, tuple[int, object, list[dict]]] = {}
+
+
+def get_normalized_tool_specs(tool, module) -> list[dict]:
+    """
+    Specs of a local tool as sent to the model, with type fix-ups, reserved
+    parameters removed and descriptions taken from the docstrings.
+    """
+    cached = TOOL_SPECS_CACHE.get(tool.id)
+    if cached and cached[0] == tool.updated_at and cached[1] is module:
+        return cached[2]
+
+    specs = copy.deepcopy(tool.specs)
+    for spec in specs:
+        # TODO: Fix hack for OpenAI API
+        # Some times breaks OpenAI but others don't. Leaving the comment
+        for val in spec.get("parameters", {}).get("properties", {}).values():
+            if val.get("type") == "str":
+                val["type"] = "string"
+
+        # Remove internal reserved parameters (e.g. __id__, __user__)
+        spec["parameters"]["properties"] = {
+            key: val
+            for key, val in spec["parameters"]["properties"].items()
+            if not key.startswith("__")
+        }
+
+        # TODO: Support Pydantic models as parameters
+        doc = getattr(getattr(module, spec["name"], None), "__doc__", None)
+        if doc and doc.strip() != "":
+            s = re.split(":(param|return)", doc, 1)
+            spec["description"] = s[0]
+        else:
+            spec["description"] = spec["name"]
+
+    TOOL_SPECS_CACHE[tool.id] = (tool.updated_at, module, specs)
+    return specs
+
+
 async def get_tools(
     request: Request, tool_ids: list[str], user: UserModel, extra_params: dict
 ) -> dict[str, dict]:
@@ -157,8 +484,17 @@ async def get_tools(
     # Get user's group memberships for access control checks
     user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id)}
 
+    # Local tools and the user's valves for them, loaded in one query each
+    tools = {tool.id: tool for tool in Tools.get_tool_specs_by_ids(tool_ids)}
+    user_valves = (
+        Tools.get_user_valves_by_ids_and_user_id(list(tools), user.id) if tools else {}
+    )
+
+    # OpenAPI tool servers by id, loaded on first use
+    tool_servers = None
+
     for tool_id in tool_ids:
-        tool = Tools.get_tool_by_id(tool_id)
+        tool = tools.get(tool_id)
         if tool:
             # Check access control for local tools
             if (
@@ -180,27 +516,13 @@ async def get_tools(
 
             # Set valves for the tool
             if hasattr(module, "valves") and hasattr(module, "Valves"):
-                valves = Tools.get_tool_valves_by_id(tool_id) or {}
-                module.valves = module.Valves(**valves)
+                module.valves = module.Valves(**(tool.valves or {}))
             if hasattr(module, "UserValves"):
                 __user__["valves"] = module.UserValves(  # type: ignore
-                    **Tools.get_user_valves_by_id_and_user_id(tool_id, user.id)
+                    **user_valves.get(tool_id, {})
                 )
 
-            for spec in tool.specs:
-                # TODO: Fix hack for OpenAI API
-                # Some times breaks OpenAI but others don't. Leaving the comment
-                for val in spec.get("parameters", {}).get("properties", {}).values():
-                    if val.get("type") == "str":
-                        val["type"] = "string"
-
-                # Remove internal reserved parameters (e.g. __id__, __user__)
-                spec["parameters"]["properties"] = {
-                    key: val
-                    for key, val in spec["parameters"]["properties"].items()
-                    if not key.startswith("__")
-                }
-
+            for spec in get_normalized_tool_specs(tool, module):
                 # convert to function that takes only model params and inserts custom params
                 function_name = spec["name"]
                 tool_function = getattr(module, function_name)
@@ -213,17 +535,11 @@ async def get_tools(
                     },
                 )
 
-                # TODO: Support Pydantic models as parameters
-                if callable.__doc__ and callable.__doc__.strip() != "":
-                    s = re.split(":(param|return)", callable.__doc__, 1)
-                    spec["description"] = s[0]
-                else:
-                    spec["description"] = function_name
-
                 tool_dict = {
                     "tool_id": tool_id,
                     "callable": callable,
                     "spec": spec,
+                    "serial": is_serial_tool(module, function_name),
                     # Misc info
                     "metadata": {
                         "file_handler": hasattr(module, "file_handler")
@@ -258,13 +574,13 @@ async def get_tools(
                     function_names = server_id_splits[1].split(",")
 
                 if type == "openapi":
+                    if tool_servers is None:
+                        tool_servers = {
+                            server["id"]: server
+                            for server in await get_tool_servers(request)
+                        }
 
-                    tool_server_data = None
-                    for server in await get_tool_servers(request):
-                        if server["id"] == server_id:
-                            tool_server_data = server
-                            break
-
+                    tool_server_data = tool_servers.get(server_id)
                     if tool_server_data is None:
                         log.warning(f"Tool server data not found for {server_id}")
                         continue
@@ -675,6 +991,10 @@ def convert_openapi_to_tool_payload(openapi_spec):
 
                 # Extract path and query parameters
                 for param in operation.get("parameters", []):
+                    if "$ref" in param:
+                        param = resolve_schema(
+                            param, openapi_spec.get("components", {})
+                        )
                     param_name = param["name"]
                     param_schema = param.get("schema", {})
                     description = param_schema.get("description", "")
@@ -730,15 +1050,150 @@ def convert_openapi_to_tool_payload(openapi_spec):
     return tool_payload
 
 
+def get_tool_server_operations(openapi_spec: dict) -> dict[str, dict]:
+    """
+    Index the operations of an OpenAPI specification by operationId, with the
+    HTTP method, path and location of each parameter, so tool calls don't
+    have to scan the whole spec.
+    """
+    operations = {}
+    components = openapi_spec.get("components", {})
+
+    for path, methods in openapi_spec.get("paths", {}).items():
+        if not isinstance(methods, dict):
+            continue
+
+        for method, operation in methods.items():
+            if not isinstance(operation, dict) or not operation.get("operationId"):
+                continue
+
+            # The first operation wins, as with the previous linear lookup
+            operation_id = operation["operationId"]
+            if operation_id in operations:
+                continue
+
+            parameters = {}
+            for param in operation.get("parameters", []):
+                if "$ref" in param:
+                    param = resolve_schema(param, components)
+                if param.get("name") and param.get("in"):
+                    parameters[param["name"]] = param["in"]
+
+            operations[operation_id] = {
+                "method": method.lower(),
+                "path": path,
+                "parameters": parameters,
+                "body": bool((operation.get("requestBody") or {}).get("content")),
+            }
+
+    return operations
+
+
+class ToolServerRegistry:
+    """
+    Shared HTTP state of the OpenAPI tool servers: a pooled client session
+    per server for tool calls, and fetched specs kept for revalidation with
+    ETag / Last-Modified.
+
+    Specs are kept per URL, not per auth headers, so per-user tokens don't
+    multiply them. A server serving different specs per user sends different
+    validators for them, so a 304 still means the caller's spec is current.
+    At most `max_specs` specs are kept, least recently used first out.
+    """
+
+    def __init__(self, max_specs: int = 128):
+        self.max_specs = max_specs
+        self._sessions: dict[str, aiohttp.ClientSession] = {}
+        self._specs: OrderedDict[str, tuple[dict, Any]] = OrderedDict()
+
+    def get_session(self, url: str) -> aiohttp.ClientSession:
+        parsed = urlparse(url)
+        key = f"{parsed.scheme}://{parsed.netloc}"
+
+        session = self._sessions.get(key)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                trust_env=True,
+                timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
+                # Shared across users, so response cookies must not persist
+                cookie_jar=aiohttp.DummyCookieJar(),
+            )
+            self._sessions[key] = session
+        return session
+
+    async def fetch_spec(self, url: str, headers: dict) -> Any:
+        validators, cached = self._specs.get(url, ({}, None))
+        if cached is not None:
+            self._specs.move_to_end(url)
+            headers = {**headers, **validators}
+
+        async with self.get_session(url).get(
+            url,
+            headers=headers,
+            ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
+            timeout=aiohttp.ClientTimeout(
+                total=AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA
+            ),
+        ) as response:
+            if response.status == 304 and cached is not None:
+                # Callers may modify the spec, hand out a copy
+                return copy.deepcopy(cached)
+
+            if response.status != 200:
+                error_body = await response.json()
+                raise Exception(error_body)
+
+            text_content = await response.text()
+
+            # Check if URL ends with .yaml or .yml to determine format
+            if url.lower().endswith((".yaml", ".yml")):
+                res = yaml.safe_load(text_content)
+            else:
+                try:
+                    res = json.loads(text_content)
+                except json.JSONDecodeError:
+                    res = yaml.safe_load(text_content)
+
+            validators = {}
+            if response.headers.get("ETag"):
+                validators["If-None-Match"] = response.headers["ETag"]
+            if response.headers.get("Last-Modified"):
+                validators["If-Modified-Since"] = response.headers["Last-Modified"]
+
+            if validators:
+                self._specs[url] = (validators, copy.deepcopy(res))
+                self._specs.move_to_end(url)
+                while len(self._specs) > self.max_specs:
+                    self._specs.popitem(last=False)
+            else:
+                self._specs.pop(url, None)
+
+            return res
+
+    async def close(self):
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        for session in sessions:
+            if not session.closed:
+                await session.close()
+
+
+TOOL_SERVER_REGISTRY = ToolServerRegistry()
+
+
 async def set_tool_servers(request: Request):
     request.app.state.TOOL_SERVERS = await get_tool_servers_data(
         request.app.state.config.TOOL_SERVER_CONNECTIONS
     )
 
     if request.app.state.redis is not None:
-        await request.app.state.redis.set(
-            "tool_servers", json.dumps(request.app.state.TOOL_SERVERS)
-        )
+        data = json.dumps(request.app.state.TOOL_SERVERS)
+        version = hashlib.sha256(data.encode()).hexdigest()
+
+        # Written after the data, so readers never pair a version with older data
+        await request.app.state.redis.set("tool_servers", data)
+        await request.app.state.redis.set("tool_servers:version", version)
+        request.app.state.TOOL_SERVERS_VERSION = version
 
     return request.app.state.TOOL_SERVERS
 
@@ -747,8 +1202,18 @@ async def get_tool_servers(request: Request):
     tool_servers = []
     if request.app.state.redis is not None:
         try:
-            tool_servers = json.loads(await request.app.state.redis.get("tool_servers"))
-            request.app.state.TOOL_SERVERS = tool_servers
+            # Only reload and parse the specs when another worker changed them
+            version = await request.app.state.redis.get("tool_servers:version")
+            if version is not None and version == getattr(
+                request.app.state, "TOOL_SERVERS_VERSION", None
+            ):
+                tool_servers = request.app.state.TOOL_SERVERS
+            else:
+                tool_servers = json.loads(
+                    await request.app.state.redis.get("tool_servers")
+                )
+                request.app.state.TOOL_SERVERS = tool_servers
+                request.app.state.TOOL_SERVERS_VERSION = version
         except Exception as e:
             log.error(f"Error fetching tool_servers from Redis: {e}")
 
@@ -769,32 +1234,7 @@ async def get_tool_server_data(url: str, headers: Optional[dict]) -> Dict[str, A
 
     error = None
     try:
-        timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA)
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-            async with session.get(
-                url, headers=_headers, ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL
-            ) as response:
-                if response.status != 200:
-                    error_body = await response.json()
-                    raise Exception(error_body)
-
-                text_content = None
-
-                # Check if URL ends with .yaml or .yml to determine format
-                if url.lower().endswith((".yaml", ".yml")):
-                    text_content = await response.text()
-                    res = yaml.safe_load(text_content)
-                else:
-                    text_content = await response.text()
-
-                try:
-                    res = json.loads(text_content)
-                except json.JSONDecodeError:
-                    try:
-                        res = yaml.safe_load(text_content)
-                    except Exception as e:
-                        raise e
-
+        res = await TOOL_SERVER_REGISTRY.fetch_spec(url, _headers)
     except Exception as err:
         log.exception(f"Could not fetch tool server spec from {url}")
         if isinstance(err, dict) and "detail" in err:
@@ -878,6 +1318,7 @@ async def get_tool_servers_data(servers: List[Dict[str, Any]]) -> List[Dict[str,
             "openapi": response,
             "info": response.get("info", {}),
             "specs": convert_openapi_to_tool_payload(response),
+            "operations": get_tool_server_operations(response),
         }
 
         openapi_data = response.get("openapi", {})
@@ -898,6 +1339,7 @@ async def get_tool_servers_data(servers: List[Dict[str, Any]]) -> List[Dict[str,
                 "openapi": openapi_data,
                 "info": response.get("info"),
                 "specs": response.get("specs"),
+                "operations": response.get("operations"),
             }
         )
 
@@ -914,48 +1356,28 @@ async def execute_tool_server(
 ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
     error = None
     try:
-        openapi = server_data.get("openapi", {})
-        paths = openapi.get("paths", {})
-
-        matching_route = None
-        for route_path, methods in paths.items():
-            for http_method, operation in methods.items():
-                if isinstance(operation, dict) and operation.get("operationId") == name:
-                    matching_route = (route_path, methods)
-                    break
-            if matching_route:
-                break
+        operations = server_data.get("operations")
+        if operations is None:
+            operations = get_tool_server_operations(server_data.get("openapi", {}))
 
-        if not matching_route:
+        operation = operations.get(name)
+        if not operation:
             raise Exception(f"No matching route found for operationId: {name}")
 
-        route_path, methods = matching_route
-
-        method_entry = None
-        for http_method, operation in methods.items():
-            if operation.get("operationId") == name:
-                method_entry = (http_method.lower(), operation)
-                break
-
-        if not method_entry:
-            raise Exception(f"No matching method found for operationId: {name}")
-
-        http_method, operation = method_entry
+        http_method = operation["method"]
 
         path_params = {}
         query_params = {}
         body_params = {}
 
-        for param in operation.get("parameters", []):
-            param_name = param["name"]
-            param_in = param["in"]
+        for param_name, param_in in operation["parameters"].items():
             if param_name in params:
                 if param_in == "path":
                     path_params[param_name] = params[param_name]
                 elif param_in == "query":
                     query_params[param_name] = params[param_name]
 
-        final_url = f"{url}{route_path}"
+        final_url = f"{url}{operation['path']}"
         for key, value in path_params.items():
             final_url = final_url.replace(f"{{{key}}}", str(value))
 
@@ -963,54 +1385,34 @@ async def execute_tool_server(
             query_string = "&".join(f"{k}={v}" for k, v in query_params.items())
             final_url = f"{final_url}?{query_string}"
 
-        if operation.get("requestBody", {}).get("content"):
+        if operation["body"]:
             if params:
                 body_params = params
 
-        async with aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        ) as session:
-            request_method = getattr(session, http_method.lower())
-
-            if http_method in ["post", "put", "patch", "delete"]:
-                async with request_method(
-                    final_url,
-                    json=body_params,
-                    headers=headers,
-                    cookies=cookies,
-                    ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
-                    allow_redirects=False,
-                ) as response:
-                    if response.status >= 400:
-                        text = await response.text()
-                        raise Exception(f"HTTP error {response.status}: {text}")
-
-                    try:
-                        response_data = await response.json()
-                    except Exception:
-                        response_data = await response.text()
-
-                    response_headers = response.headers
-                    return (response_data, response_headers)
-            else:
-                async with request_method(
-                    final_url,
-                    headers=headers,
-                    cookies=cookies,
-                    ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
-                    allow_redirects=False,
-                ) as response:
-                    if response.status >= 400:
-                        text = await response.text()
-                        raise Exception(f"HTTP error {response.status}: {text}")
-
-                    try:
-                        response_data = await response.json()
-                    except Exception:
-                        response_data = await response.text()
-
-                    response_headers = response.headers
-                    return (response_data, response_headers)
+        request_kwargs = {}
+        if http_method in ["post", "put", "patch", "delete"]:
+            request_kwargs["json"] = body_params
+
+        async with TOOL_SERVER_REGISTRY.get_session(final_url).request(
+            http_method,
+            final_url,
+            headers=headers,
+            cookies=cookies,
+            ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
+            allow_redirects=False,
+            **request_kwargs,
+        ) as response:
+            if response.status >= 400:
+                text = await response.text()
+                raise Exception(f"HTTP error {response.status}: {text}")
+
+            try:
+                response_data = await response.json()
+            except Exception:
+                response_data = await response.text()
+
+            response_headers = response.headers
+            return (response_data, response_headers)
 
     except Exception as err:
         error = str(err)
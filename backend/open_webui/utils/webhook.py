@@ -1,53 +1,71 @@
+import asyncio
 import json
 import logging
+import random
+import time
+from typing import Optional
+from urllib.parse import urlparse
+
 import aiohttp
 
 from open_webui.config import WEBUI_FAVICON_URL
-from open_webui.env import AIOHTTP_CLIENT_TIMEOUT, VERSION
+from open_webui.env import (
+    AIOHTTP_CLIENT_TIMEOUT,
+    VERSION,
+    WEBHOOK_DISPATCH_CONCURRENCY,
+    WEBHOOK_DISPATCH_MAX_RETRIES,
+    WEBHOOK_DISPATCH_QUEUE_SIZE,
+    WEBHOOK_DISPATCH_RATE_LIMIT_PER_HOST,
+    WEBHOOK_DISPATCH_SHUTDOWN_TIMEOUT,
+)
 
 log = logging.getLogger(__name__)
 
 
+def get_webhook_payload(name: str, url: str, message: str, event_data: dict) -> dict:
+    payload = {}
+
+    # Slack and Google Chat Webhooks
+    if "https://hooks.slack.com" in url or "https://chat.googleapis.com" in url:
+        payload["text"] = message
+    # Discord Webhooks
+    elif "https://discord.com/api/webhooks" in url:
+        payload["content"] = (
+            message if len(message) < 2000 else f"{message[: 2000 - 20]}... (truncated)"
+        )
+    # Microsoft Teams Webhooks
+    elif "webhook.office.com" in url:
+        action = event_data.get("action", "undefined")
+        facts = [
+            {"name": name, "value": value}
+            for name, value in json.loads(event_data.get("user", {})).items()
+        ]
+        payload = {
+            "@type": "MessageCard",
+            "@context": "http://schema.org/extensions",
+            "themeColor": "0076D7",
+            "summary": message,
+            "sections": [
+                {
+                    "activityTitle": message,
+                    "activitySubtitle": f"{name} ({VERSION}) - {action}",
+                    "activityImage": WEBUI_FAVICON_URL,
+                    "facts": facts,
+                    "markdown": True,
+                }
+            ],
+        }
+    # Default Payload
+    else:
+        payload = {**event_data}
+
+    return payload
+
+
 async def post_webhook(name: str, url: str, message: str, event_data: dict) -> bool:
     try:
         log.debug(f"post_webhook: {url}, {message}, {event_data}")
-        payload = {}
-
-        # Slack and Google Chat Webhooks
-        if "https://hooks.slack.com" in url or "https://chat.googleapis.com" in url:
-            payload["text"] = message
-        # Discord Webhooks
-        elif "https://discord.com/api/webhooks" in url:
-            payload["content"] = (
-                message
-                if len(message) < 2000
-                else f"{message[: 2000 - 20]}... (truncated)"
-            )
-        # Microsoft Teams Webhooks
-        elif "webhook.office.com" in url:
-            action = event_data.get("action", "undefined")
-            facts = [
-                {"name": name, "value": value}
-                for name, value in json.loads(event_data.get("user", {})).items()
-            ]
-            payload = {
-                "@type": "MessageCard",
-                "@context": "http://schema.org/extensions",
-                "themeColor": "0076D7",
-                "summary": message,
-                "sections": [
-                    {
-                        "activityTitle": message,
-                        "activitySubtitle": f"{name} ({VERSION}) - {action}",
-                        "activityImage": WEBUI_FAVICON_URL,
-                        "facts": facts,
-                        "markdown": True,
-                    }
-                ],
-            }
-        # Default Payload
-        else:
-            payload = {**event_data}
+        payload = get_webhook_payload(name, url, message, event_data)
 
         log.debug(f"payload: {payload}")
         async with aiohttp.ClientSession(
@@ -62,3 +80,145 @@ async def post_webhook(name: str, url: str, message: str, event_data: dict) -> b
     except Exception as e:
         log.exception(e)
         return False
+
+
+class WebhookDispatcher:
+    """
+    Background delivery of webhook notifications.
+
+    Deliveries are queued (at most `queue_size`, further ones are dropped)
+    and sent by `concurrency` workers on a shared session, spaced to at most
+    `rate_limit_per_host` requests per second per destination host, and
+    retried with exponential backoff on connection errors, 429 and 5xx
+    responses. On shutdown, queued deliveries get `shutdown_timeout` seconds
+    to finish.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 10,
+        rate_limit_per_host: float = 10,
+        max_retries: int = 3,
+        queue_size: int = 10000,
+        shutdown_timeout: float = 10,
+    ):
+        self.concurrency = max(1, concurrency)
+        self.rate_limit_per_host = rate_limit_per_host
+        self.max_retries = max(0, max_retries)
+        self.queue_size = max(1, queue_size)
+        self.shutdown_timeout = shutdown_timeout
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._next_slot: dict[str, float] = {}
+        self._workers: list[asyncio.Task] = []
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                trust_env=True,
+                timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
+            )
+        return self._session
+
+    async def _wait_for_host(self, url: str):
+        if not self.rate_limit_per_host or self.rate_limit_per_host <= 0:
+            return
+
+        # Reserve the next free slot for the host, then sleep until it starts
+        host = urlparse(url).netloc
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + 1 / self.rate_limit_per_host
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def deliver(self, url: str, payload: dict) -> bool:
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                await self._wait_for_host(url)
+                async with self._get_session().post(url, json=payload) as r:
+                    if r.status < 400:
+                        return True
+
+                    if r.status != 429 and r.status < 500:
+                        log.warning(f"Webhook {url} rejected with {r.status}")
+                        return False
+
+                    log.debug(f"Webhook {url} failed with {r.status}")
+                    if r.headers.get("Retry-After", "").isdigit():
+                        retry_after = int(r.headers["Retry-After"])
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                log.debug(f"Webhook {url} failed: {e}")
+
+            if attempt < self.max_retries:
+                await asyncio.sleep(
+                    retry_after
+                    if retry_after is not None
+                    else 2**attempt + random.uniform(0, 1)
+                )
+
+        log.warning(f"Webhook {url} failed after {self.max_retries + 1} attempts")
+        return False
+
+    async def _worker(self):
+        while True:
+            url, payload = await self._queue.get()
+            try:
+                await self.deliver(url, payload)
+            except Exception as e:
+                log.debug(f"Error delivering webhook {url}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _start_workers(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [worker for worker in self._workers if not worker.done()]
+        while len(self._workers) < self.concurrency:
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    def dispatch(self, name: str, deliveries: list[tuple[str, str, dict]]):
+        """
+        Queue (url, message, event_data) deliveries and return immediately.
+        """
+        self._start_workers()
+        for url, message, event_data in deliveries:
+            try:
+                payload = get_webhook_payload(name, url, message, event_data)
+            except Exception as e:
+                log.warning(f"Invalid webhook payload for {url}: {e}")
+                continue
+
+            try:
+                self._queue.put_nowait((url, payload))
+            except asyncio.QueueFull:
+                log.warning(f"Webhook queue is full, dropping delivery to {url}")
+
+    async def close(self):
+        if self._queue is not None and self._workers:
+            try:
+                await asyncio.wait_for(self._queue.join(), self.shutdown_timeout)
+            except asyncio.TimeoutError:
+                log.warning(
+                    f"Dropping {self._queue.qsize()} pending webhook deliveries"
+                )
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+
+WEBHOOK_DISPATCHER = WebhookDispatcher(
+    concurrency=WEBHOOK_DISPATCH_CONCURRENCY,
+    rate_limit_per_host=WEBHOOK_DISPATCH_RATE_LIMIT_PER_HOST,
+    max_retries=WEBHOOK_DISPATCH_MAX_RETRIES,
+    queue_size=WEBHOOK_DISPATCH_QUEUE_SIZE,
+    shutdown_timeout=WEBHOOK_DISPATCH_SHUTDOWN_TIMEOUT,
+)
@@ -152,6 +152,56 @@ export const getChatList = async (
 	}));
 };
 
+// One page of the chat list along with the cursor of the next page, if any.
+// Pages after the first should be loaded with the cursor, which seeks past the
+// last chat instead of skipping over all previous pages.
+export const getChatListPage = async (
+	token: string = '',
+	page: number = 1,
+	cursor: string | null = null
+) => {
+	let error = null;
+	let nextCursor = null;
+	const searchParams = new URLSearchParams();
+
+	if (cursor !== null) {
+		searchParams.append('cursor', cursor);
+	} else {
+		searchParams.append('page', `${page}`);
+	}
+
+	const res = await fetch(`${WEBUI_API_BASE_URL}/chats/?${searchParams.toString()}`, {
+		method: 'GET',
+		headers: {
+			Accept: 'application/json',
+			'Content-Type': 'application/json',
+			...(token && { authorization: `Bearer ${token}` })
+		}
+	})
+		.then(async (res) => {
+			if (!res.ok) throw await res.json();
+			nextCursor = res.headers.get('X-Next-Cursor');
+			return res.json();
+		})
+		.catch((err) => {
+			error = err;
+			console.error(err);
+			return null;
+		});
+
+	if (error) {
+		throw error;
+	}
+
+	return {
+		chats: (res ?? []).map((chat) => ({
+			...chat,
+			time_range: getTimeRange(chat.updated_at)
+		})),
+		nextCursor
+	};
+};
+
 export const getChatListByUserId = async (
 	token: string = '',
 	userId: string,
@@ -90,7 +90,9 @@ export class SocketIOCollaborationProvider {
 			document_id: this.documentId,
 			user_id: this.user?.id,
 			user_name: this.user?.name,
-			user_color: userColor
+			user_color: userColor,
+			// Only receive what the local document is missing
+			state_vector: Y.encodeStateVector(this.doc)
 		});
 
 		// Set user awareness info
@@ -150,12 +152,19 @@ export class SocketIOCollaborationProvider {
 							} else {
 								// If the editor already has content, we don't need to send an empty state
 								if (this.doc.getXmlFragment('prosemirror').length > 0) {
-									this.socket.emit('ydoc:document:update', {
-										document_id: this.documentId,
-										user_id: this.user?.id,
-										socket_id: this.socket.id,
-										update: Y.encodeStateAsUpdate(this.doc)
-									});
+									// Only send what the server is missing
+									const update = Y.encodeStateAsUpdate(
+										this.doc,
+										data.state_vector ? new Uint8Array(data.state_vector) : undefined
+									);
+									if (!(update.length === 2 && update[0] === 0 && update[1] === 0)) {
+										this.socket.emit('ydoc:document:update', {
+											document_id: this.documentId,
+											user_id: this.user?.id,
+											socket_id: this.socket.id,
+											update: update
+										});
+									}
 								} else {
 									console.warn('Yjs document is empty, not sending state.');
 								}
@@ -170,7 +179,8 @@ export class SocketIOCollaborationProvider {
 
 					this.synced = false;
 					this.socket.emit('ydoc:document:state', {
-						document_id: this.documentId
+						document_id: this.documentId,
+						state_vector: Y.encodeStateVector(this.doc)
 					});
 				}
 			}
@@ -200,7 +210,7 @@ export class SocketIOCollaborationProvider {
 					document_id: this.documentId,
 					user_id: this.user?.id,
 					socket_id: this.socket.id,
-					update: Array.from(update),
+					update: update,
 					data: {
 						content: this.editorContentGetter?.() ?? {
 							md: '',
@@ -225,7 +235,7 @@ export class SocketIOCollaborationProvider {
 					this.socket.emit('ydoc:awareness:update', {
 						document_id: this.documentId,
 						user_id: this.socket.id,
-						update: Array.from(awarenessUpdate)
+						update: awarenessUpdate
 					});
 				}
 			}